@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Offline signing of many transactions."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence
+
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee, TxState
+from cosmpy.crypto.keypairs import PrivateKey
+from cosmpy.crypto.secp256k1 import CoincurveBackend, get_backend
+from cosmpy.protos.cosmos.tx.v1beta1.tx_pb2 import SignDoc
+
+
+DEFAULT_CHUNK_SIZE = 256
+
+# signing key of the worker processes, set once by the pool initializer
+_worker_key: Optional[PrivateKey] = None
+
+
+def _init_worker(private_key_bytes: bytes):
+    global _worker_key  # pylint: disable=global-statement
+    _worker_key = PrivateKey(private_key_bytes)
+
+
+def _sign_chunk(sign_docs: List[bytes]) -> List[bytes]:
+    assert _worker_key is not None
+    return [_worker_key.sign(sign_doc, deterministic=True) for sign_doc in sign_docs]
+
+
+class BatchSigner:
+    """Sign many transactions of a single account across processes.
+
+    Signatures are deterministic (RFC6979) and canonical, hence identical to the ones
+    of `Transaction.sign` with `deterministic=True`. Signing uses the fastest available
+    secp256k1 backend, see `cosmpy.crypto.secp256k1`.
+
+    The private key is sent once to each worker process. Batches smaller than a chunk,
+    or a single worker, are signed in the calling process.
+    """
+
+    def __init__(
+        self,
+        private_key: PrivateKey,
+        chain_id: str,
+        account_number: int,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Init the batch signer.
+
+        :param private_key: private key of the account
+        :param chain_id: chain id
+        :param account_number: account number
+        :param max_workers: number of worker processes, defaults to the number of CPUs
+        :param chunk_size: number of transactions signed per worker task
+        """
+        self._private_key = private_key
+        self._chain_id = chain_id
+        self._account_number = account_number
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def fast_backend(self) -> bool:
+        """Check whether the native secp256k1 backend is used.
+
+        :return: True if coincurve is installed
+        """
+        return get_backend().name == CoincurveBackend.name
+
+    def __enter__(self) -> "BatchSigner":
+        """Enter the context.
+
+        :return: the batch signer
+        """
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context and stop the worker processes.
+
+        :param args: exception info
+        """
+        self.close()
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def sign_transactions(self, txs: Sequence[Transaction]) -> List[bytes]:
+        """Sign sealed transactions.
+
+        The signature is added to each transaction, which is then completed.
+
+        :param txs: sealed transactions with this account as single signer
+        :raises RuntimeError: if a transaction is not sealed
+        :return: serialized signed transactions, ready for broadcast
+        """
+        if any(tx.state != TxState.Sealed for tx in txs):
+            raise RuntimeError(
+                "Transaction is not sealed. It must be sealed before signing is possible."
+            )
+
+        bodies = [(tx.body_bytes, tx.auth_info_bytes) for tx in txs]
+        signatures = self._sign_docs([self._sign_doc(*body) for body in bodies])
+
+        for tx, signature in zip(txs, signatures):
+            tx.add_signatures([signature]).complete()
+
+        return [tx.tx_bytes for tx in txs]
+
+    def sign_messages(
+        self,
+        msg_lists: Sequence[Sequence[Any]],
+        start_sequence: int,
+        fee: TxFee,
+        memo: Optional[str] = None,
+        timeout_height: Optional[int] = None,
+    ) -> List[bytes]:
+        """Build and sign one transaction per message list with consecutive sequences.
+
+        :param msg_lists: messages of each transaction
+        :param start_sequence: sequence of the first transaction
+        :param fee: fee of each transaction, with its gas limit set
+        :param memo: memo of each transaction, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: serialized signed transactions, ready for broadcast
+        """
+        public_key = self._private_key.public_key
+        txs = []
+        for offset, msgs in enumerate(msg_lists):
+            tx = Transaction()
+            for msg in msgs:
+                tx.add_message(msg)
+            tx.seal(
+                SigningCfg.direct(public_key, start_sequence + offset),
+                fee=fee,
+                memo=memo,
+                timeout_height=timeout_height,
+            )
+            txs.append(tx)
+        return self.sign_transactions(txs)
+
+    def _sign_doc(self, body_bytes: bytes, auth_info_bytes: bytes) -> bytes:
+        return SignDoc(
+            body_bytes=body_bytes,
+            auth_info_bytes=auth_info_bytes,
+            chain_id=self._chain_id,
+            account_number=self._account_number,
+        ).SerializeToString()
+
+    def _sign_docs(self, sign_docs: List[bytes]) -> List[bytes]:
+        if self._max_workers == 1 or len(sign_docs) <= self._chunk_size:
+            return [
+                self._private_key.sign(sign_doc, deterministic=True)
+                for sign_doc in sign_docs
+            ]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=_init_worker,
+                initargs=(self._private_key.private_key_bytes,),
+            )
+        chunks = []
+        for start in range(0, len(sign_docs), self._chunk_size):
+            end = start + self._chunk_size
+            chunks.append(sign_docs[start:end])
+        signatures: List[bytes] = []
+        for chunk_signatures in self._executor.map(_sign_chunk, chunks):
+            signatures.extend(chunk_signatures)
+        return signatures
@@ -21,32 +21,45 @@
 import json
 import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from hashlib import sha256
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import certifi
 import grpc
-from dateutil.parser import isoparse
 from packaging.version import Version
 
 from cosmpy.aerial import cast_to_int
-from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.client.bank import BalanceSnapshot, create_bank_send_msg
+from cosmpy.aerial.client.blocks import (
+    BlockCheckpointStore,
+    DEFAULT_BLOCK_CONCURRENCY,
+    iter_blocks,
+    query_block_with_txs,
+)
+from cosmpy.aerial.client.cache import QueryCache, SimulationCache
 from cosmpy.aerial.client.distribution import create_withdraw_delegator_reward
+from cosmpy.aerial.client.pool import (
+    DEFAULT_HEALTH_CHECK_INTERVAL_SECS,
+    EndpointPool,
+    RoutingStrategy,
+)
 from cosmpy.aerial.client.staking import (
-    StakingPosition,
     StakingSummary,
-    UnbondingPositions,
     Validator,
     ValidatorStatus,
+    build_staking_summary,
     create_delegate_msg,
     create_redelegate_msg,
     create_undelegate_msg,
 )
+from cosmpy.aerial.client.stubs import SERVICE_NAMES, close_stubs, create_stubs
+from cosmpy.aerial.client.subscriber import TxEventSubscriber
 from cosmpy.aerial.client.utils import (
     TxFee,
     ensure_timedelta,
     get_paginated,
+    iter_paginated,
     prepare_and_broadcast_basic_transaction,
 )
 from cosmpy.aerial.coins import Coin
@@ -54,78 +67,47 @@ from cosmpy.aerial.config import NetworkConfig
 from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
 from cosmpy.aerial.gas import GasStrategy, SimulationGasStrategy
 from cosmpy.aerial.tx import Transaction, TxState
-from cosmpy.aerial.tx_helpers import MessageLog, SubmittedTx, TxResponse, safe_decode
+from cosmpy.aerial.tx_helpers import LazyTxResponse, SubmittedTx, TxResponse
 from cosmpy.aerial.types import Account, Block, NodeInfo
-from cosmpy.aerial.urls import Protocol, parse_url
 from cosmpy.aerial.wallet import Wallet
-from cosmpy.auth.rest_client import AuthRestClient
-from cosmpy.bank.rest_client import BankRestClient
-from cosmpy.common.rest_client import RestClient
-from cosmpy.consensus.rest_client import ConsensusRestClient
-from cosmpy.cosmwasm.rest_client import CosmWasmRestClient
 from cosmpy.crypto.address import Address
-from cosmpy.distribution.rest_client import DistributionRestClient
-from cosmpy.params.rest_client import ParamsRestClient
 from cosmpy.protos.cosmos.auth.v1beta1.auth_pb2 import BaseAccount
 from cosmpy.protos.cosmos.auth.v1beta1.query_pb2 import QueryAccountRequest
-from cosmpy.protos.cosmos.auth.v1beta1.query_pb2_grpc import QueryStub as AuthGrpcClient
 from cosmpy.protos.cosmos.bank.v1beta1.query_pb2 import (
     QueryAllBalancesRequest,
     QueryBalanceRequest,
 )
-from cosmpy.protos.cosmos.bank.v1beta1.query_pb2_grpc import QueryStub as BankGrpcClient
 from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import (
     GetBlockByHeightRequest,
     GetLatestBlockRequest,
     GetNodeInfoRequest,
 )
-from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2_grpc import (
-    ServiceStub as TendermintQueryGrpcClient,
-)
-from cosmpy.protos.cosmos.consensus.v1.query_pb2_grpc import (
-    QueryStub as QueryConsensusGrpcClient,
-)
 from cosmpy.protos.cosmos.crypto.ed25519.keys_pb2 import (  # noqa # pylint: disable=unused-import
     PubKey,
 )
 from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2 import (
-    QueryDelegationRewardsRequest,
-)
-from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2_grpc import (
-    QueryStub as DistributionGrpcClient,
+    QueryDelegationTotalRewardsRequest,
 )
 from cosmpy.protos.cosmos.params.v1beta1.query_pb2 import QueryParamsRequest
-from cosmpy.protos.cosmos.params.v1beta1.query_pb2_grpc import (
-    QueryStub as QueryParamsGrpcClient,
-)
 from cosmpy.protos.cosmos.staking.v1beta1.query_pb2 import (
     QueryDelegatorDelegationsRequest,
     QueryDelegatorUnbondingDelegationsRequest,
     QueryValidatorsRequest,
 )
-from cosmpy.protos.cosmos.staking.v1beta1.query_pb2_grpc import (
-    QueryStub as StakingGrpcClient,
-)
 from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import (
     BroadcastMode,
     BroadcastTxRequest,
     GetTxRequest,
     SimulateRequest,
 )
-from cosmpy.protos.cosmos.tx.v1beta1.service_pb2_grpc import ServiceStub as TxGrpcClient
-from cosmpy.protos.cosmwasm.wasm.v1.query_pb2_grpc import (
-    QueryStub as CosmWasmGrpcClient,
-)
-from cosmpy.staking.rest_client import StakingRestClient
-from cosmpy.tendermint.rest_client import (
-    CosmosBaseTendermintRestClient as TendermintRestClient,
-)
-from cosmpy.tx.rest_client import TxRestClient
 
 
 DEFAULT_QUERY_TIMEOUT_SECS = 15
 DEFAULT_QUERY_INTERVAL_SECS = 2
 COSMOS_SDK_DEC_COIN_PRECISION = 10**18
+BLOCK_HEIGHT_METADATA_KEY = "x-cosmos-block-height"
+DEFAULT_BULK_QUERY_WORKERS = 32
+DEFAULT_BROADCAST_IN_FLIGHT = 8
 
 
 class LedgerClient:
@@ -136,53 +118,96 @@ class LedgerClient:
         cfg: NetworkConfig,
         query_interval_secs: int = DEFAULT_QUERY_INTERVAL_SECS,
         query_timeout_secs: int = DEFAULT_QUERY_TIMEOUT_SECS,
+        tx_subscriber: Optional[TxEventSubscriber] = None,
+        routing: RoutingStrategy = RoutingStrategy.ROUND_ROBIN,
+        health_check_interval_secs: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECS,
+        query_cache: Optional[QueryCache] = None,
+        simulation_cache: Optional[SimulationCache] = None,
     ):
         """Init ledger client.
 
         :param cfg: Network configurations
         :param query_interval_secs: int. optional interval int seconds
         :param query_timeout_secs: int. optional interval int seconds
+        :param tx_subscriber: optional websocket subscriber used to wait for transactions
+        :param routing: routing of the requests, when the network has several urls
+        :param health_check_interval_secs: interval of the endpoint health checks, when
+            the network has several urls
+        :param query_cache: optional cache of the rarely changing queries
+        :param simulation_cache: optional cache of the gas estimates of similar transactions
         """
         self._query_interval_secs = query_interval_secs
         self._query_timeout_secs = query_timeout_secs
+        self.tx_subscriber = tx_subscriber
+        self.query_cache = query_cache
+        self.simulation_cache = simulation_cache
         cfg.validate()
         self._network_config = cfg
         self._gas_strategy: GasStrategy = SimulationGasStrategy(self)
 
-        parsed_url = parse_url(cfg.url)
-
-        if parsed_url.protocol == Protocol.GRPC:
-            if parsed_url.secure:
-                with open(certifi.where(), "rb") as f:
-                    trusted_certs = f.read()
-                credentials = grpc.ssl_channel_credentials(
-                    root_certificates=trusted_certs
-                )
-                grpc_client = grpc.secure_channel(parsed_url.host_and_port, credentials)
-            else:
-                grpc_client = grpc.insecure_channel(parsed_url.host_and_port)
-
-            self.wasm = CosmWasmGrpcClient(grpc_client)
-            self.auth = AuthGrpcClient(grpc_client)
-            self.txs = TxGrpcClient(grpc_client)
-            self.bank = BankGrpcClient(grpc_client)
-            self.staking = StakingGrpcClient(grpc_client)
-            self.distribution = DistributionGrpcClient(grpc_client)
-            self.params = QueryParamsGrpcClient(grpc_client)
-            self.consensus = QueryConsensusGrpcClient(grpc_client)
-            self.tendermint = TendermintQueryGrpcClient(grpc_client)
+        self._endpoint_pool: Optional[EndpointPool] = None
+        self._stubs: Optional[Dict[str, Any]] = None
+        if len(cfg.urls) > 1:
+            self._endpoint_pool = EndpointPool(
+                cfg.urls,
+                self._create_stubs,
+                routing=routing,
+                health_check_interval_secs=health_check_interval_secs,
+            )
+            stubs: Dict[str, Any] = {
+                name: self._endpoint_pool.stub(name) for name in SERVICE_NAMES
+            }
         else:
-            rest_client = RestClient(parsed_url.rest_url)
-
-            self.wasm = CosmWasmRestClient(rest_client)  # type: ignore
-            self.auth = AuthRestClient(rest_client)  # type: ignore
-            self.txs = TxRestClient(rest_client)  # type: ignore
-            self.bank = BankRestClient(rest_client)  # type: ignore
-            self.staking = StakingRestClient(rest_client)  # type: ignore
-            self.distribution = DistributionRestClient(rest_client)  # type: ignore
-            self.params = ParamsRestClient(rest_client)  # type: ignore
-            self.consensus = ConsensusRestClient(rest_client)  # type: ignore
-            self.tendermint = TendermintRestClient(rest_client)  # type: ignore
+            stubs = self._stubs = self._create_stubs(cfg.url)
+
+        self.wasm = stubs["wasm"]
+        self.auth = stubs["auth"]
+        self.txs = stubs["txs"]
+        self.bank = stubs["bank"]
+        self.staking = stubs["staking"]
+        self.distribution = stubs["distribution"]
+        self.params = stubs["params"]
+        self.consensus = stubs["consensus"]
+        self.tendermint = stubs["tendermint"]
+
+    @staticmethod
+    def _create_stubs(url: str) -> Dict[str, Any]:
+        # pool a connection for each of the threads of the bulk queries
+        return create_stubs(url, rest_pool_maxsize=DEFAULT_BULK_QUERY_WORKERS)
+
+    def close(self):
+        """Stop the endpoint health checks and close the connections to the nodes."""
+        if self._endpoint_pool is not None:
+            self._endpoint_pool.close()
+        if self._stubs is not None:
+            close_stubs(self._stubs)
+
+    def __enter__(self) -> "LedgerClient":
+        """Enter the context.
+
+        :return: the client itself
+        """
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context and close the client.
+
+        :param args: exception details
+        """
+        self.close()
+
+    def _cached(self, method: str, key: Any, fetch: Callable[[], Any]) -> Any:
+        if self.query_cache is None:
+            return fetch()
+        return self.query_cache.get_or_fetch(method, key, fetch)
+
+    @property
+    def endpoint_pool(self) -> Optional[EndpointPool]:
+        """Get the endpoint pool, when the network has several urls.
+
+        :return: endpoint pool or None
+        """
+        return self._endpoint_pool
 
     @property
     def network_config(self) -> NetworkConfig:
@@ -220,17 +245,9 @@ class LedgerClient:
         """
         request = QueryAccountRequest(address=str(address))
         response = self.auth.Account(request)
-
-        account = BaseAccount()
         if not response.account.Is(BaseAccount.DESCRIPTOR):
             raise RuntimeError("Unexpected account type returned from query")
-        response.account.Unpack(account)
-
-        return Account(
-            address=address,
-            number=account.account_number,
-            sequence=account.sequence,
-        )
+        return self._parse_account_response(address, response)
 
     def query_params(self, subspace: str, key: str) -> Any:
         """Query Prams.
@@ -239,9 +256,13 @@ class LedgerClient:
         :param key: key
         :return: Query params
         """
-        req = QueryParamsRequest(subspace=subspace, key=key)
-        resp = self.params.Params(req)
-        return json.loads(resp.param.value)
+
+        def _fetch():
+            req = QueryParamsRequest(subspace=subspace, key=key)
+            resp = self.params.Params(req)
+            return json.loads(resp.param.value)
+
+        return self._cached("query_params", (subspace, key), _fetch)
 
     def query_node_info(self) -> NodeInfo:
         """
@@ -249,19 +270,12 @@ class LedgerClient:
 
         :return: NodeInfo.
         """
-        request = GetNodeInfoRequest()
-        response = self.tendermint.GetNodeInfo(request)
-
-        cosmos_sdk_version = Version(
-            response.application_version.cosmos_sdk_version.lstrip("v")
-        )
-        app_name = response.application_version.name
-        app_version = Version(response.application_version.version.lstrip("v"))
-
-        return NodeInfo(
-            cosmos_sdk_version=cosmos_sdk_version,
-            app_name=app_name,
-            app_version=app_version,
+        return self._cached(
+            "query_node_info",
+            None,
+            lambda: self._parse_node_info_response(
+                self.tendermint.GetNodeInfo(GetNodeInfoRequest())
+            ),
         )
 
     def query_consensus_params(self) -> Any:
@@ -269,9 +283,11 @@ class LedgerClient:
 
         :return: Query consensus params
         """
-        req = QueryParamsRequest()
-        resp = self.consensus.Params(req)
-        return resp
+        return self._cached(
+            "query_consensus_params",
+            None,
+            lambda: self.consensus.Params(QueryParamsRequest()),
+        )
 
     def query_bank_balance(self, address: Address, denom: Optional[str] = None) -> int:
         """Query bank balance.
@@ -303,6 +319,53 @@ class LedgerClient:
 
         return [Coin(amount=coin.amount, denom=coin.denom) for coin in resp.balances]
 
+    def query_balances_bulk(
+        self,
+        addresses: Iterable[Address],
+        denoms: Optional[List[str]] = None,
+        height: Optional[int] = None,
+        max_in_flight: int = DEFAULT_BULK_QUERY_WORKERS,
+    ) -> BalanceSnapshot:
+        """Query the balances of many addresses at a single block height.
+
+        The queries run concurrently and are all pinned to the same block height, so
+        the snapshot is consistent. REST connections are pooled for up to
+        `DEFAULT_BULK_QUERY_WORKERS` queries in flight.
+
+        :param addresses: addresses
+        :param denoms: denoms to query, defaults to None (all the denoms)
+        :param height: block height, defaults to the latest height
+        :param max_in_flight: max number of queries in flight
+        :return: balance snapshot
+        """
+        height = height or self.query_height()
+        metadata = [(BLOCK_HEIGHT_METADATA_KEY, str(height))]
+        keys = [str(address) for address in addresses]
+
+        def _query(address: str) -> Dict[str, int]:
+            if denoms is None:
+                pages = get_paginated(
+                    QueryAllBalancesRequest(address=address),
+                    lambda req: self.bank.AllBalances(req, metadata=metadata),
+                )
+                return {
+                    coin.denom: int(coin.amount)
+                    for resp in pages
+                    for coin in resp.balances
+                }
+
+            balances = {}
+            for denom in denoms:
+                req = QueryBalanceRequest(address=address, denom=denom)
+                resp = self.bank.Balance(req, metadata=metadata)
+                balances[denom] = int(resp.balance.amount or 0)
+            return balances
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            results = list(executor.map(_query, keys))
+
+        return BalanceSnapshot(height=height, balances=dict(zip(keys, results)))
+
     def send_tokens(
         self,
         destination: Address,
@@ -347,89 +410,58 @@ class LedgerClient:
         :param status: validator status, defaults to None
         :return: List of validators
         """
-        filtered_status = status or ValidatorStatus.BONDED
-
-        req = QueryValidatorsRequest()
-        if filtered_status != ValidatorStatus.UNSPECIFIED:
-            req.status = filtered_status.value
-
-        resp = self.staking.Validators(req)
-
-        validators: List[Validator] = []
-        for validator in resp.validators:
-            validators.append(
-                Validator(
-                    address=Address(validator.operator_address),
-                    tokens=cast_to_int(validator.tokens, False),
-                    moniker=str(validator.description.moniker),
-                    status=ValidatorStatus.from_proto(validator.status),
-                )
+        # the cache holds a tuple, so that callers cannot modify the cached result
+        return list(
+            self._cached(
+                "query_validators",
+                status,
+                lambda: tuple(
+                    validator
+                    for resp in iter_paginated(
+                        self._build_validators_request(status),
+                        self.staking.Validators,
+                        prefetch=True,
+                    )
+                    for validator in self._parse_validators_response(resp)
+                ),
             )
-        return validators
+        )
 
     def query_staking_summary(self, address: Address) -> StakingSummary:
         """Query staking summary.
 
+        The delegations, the rewards of all delegations and the unbonding delegations
+        are fetched concurrently, so the number of round trips does not depend on the
+        number of validators the address delegates to.
+
         :param address: address
         :return: staking summary
         """
-        current_positions: List[StakingPosition] = []
-
-        req = QueryDelegatorDelegationsRequest(delegator_addr=str(address))
-
-        for resp in get_paginated(
-            req, self.staking.DelegatorDelegations, per_page_limit=1
-        ):
-            for item in resp.delegation_responses:
-                req = QueryDelegationRewardsRequest(
-                    delegator_address=str(address),
-                    validator_address=str(item.delegation.validator_address),
-                )
-                rewards_resp = self.distribution.DelegationRewards(req)
-
-                stake_reward_dec = Decimal(0)
-                stake_reward = 0
-                for reward in rewards_resp.rewards:
-                    if reward.denom == self.network_config.staking_denomination:
-                        stake_reward_dec = Decimal(reward.amount)
-                        stake_reward = cast_to_int(reward.amount, False)
-                        break
-
-                current_positions.append(
-                    StakingPosition(
-                        validator=Address(item.delegation.validator_address),
-                        amount=cast_to_int(item.balance.amount, False),
-                        reward=stake_reward,
-                        reward_dec=stake_reward_dec,
-                    )
-                )
-
-        unbonding_summary: Dict[str, int] = {}
-        req = QueryDelegatorUnbondingDelegationsRequest(delegator_addr=str(address))
-
-        for resp in get_paginated(req, self.staking.DelegatorUnbondingDelegations):
-            for item in resp.unbonding_responses:
-                validator = str(item.validator_address)
-                total_unbonding = unbonding_summary.get(validator, 0)
-
-                for entry in item.entries:
-                    total_unbonding += cast_to_int(entry.balance, False)
-
-                unbonding_summary[validator] = total_unbonding
+        delegations_req = QueryDelegatorDelegationsRequest(delegator_addr=str(address))
+        rewards_req = QueryDelegationTotalRewardsRequest(delegator_address=str(address))
+        unbonding_req = QueryDelegatorUnbondingDelegationsRequest(
+            delegator_addr=str(address)
+        )
 
-        # build the final list of unbonding positions
-        unbonding_positions: List[UnbondingPositions] = []
-        for validator, total_unbonding in unbonding_summary.items():
-            unbonding_positions.append(
-                UnbondingPositions(
-                    validator=Address(validator),
-                    amount=total_unbonding,
-                )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            delegations = executor.submit(
+                get_paginated, delegations_req, self.staking.DelegatorDelegations
+            )
+            rewards = executor.submit(
+                self.distribution.DelegationTotalRewards, rewards_req
+            )
+            unbondings = executor.submit(
+                get_paginated,
+                unbonding_req,
+                self.staking.DelegatorUnbondingDelegations,
             )
 
-        return StakingSummary(
-            current_positions=current_positions, unbonding_positions=unbonding_positions
-        )
+            return build_staking_summary(
+                delegations.result(),
+                rewards.result(),
+                unbondings.result(),
+                self.network_config.staking_denomination,
+            )
 
     def delegate_tokens(
         self,
@@ -583,7 +615,24 @@ class LedgerClient:
         :param tx: transaction
         :return: Estimated gas for transaction
         """
-        return self._gas_strategy.estimate_gas(tx)
+        if self.simulation_cache is None:
+            return self._gas_strategy.estimate_gas(tx)
+
+        gas_limit = self.simulation_cache.get(tx)
+        if gas_limit is None:
+            gas_limit = self._gas_strategy.estimate_gas(tx)
+            self.simulation_cache.put(tx, gas_limit)
+        return gas_limit
+
+    def observe_tx_response(self, tx: Transaction, response: TxResponse):
+        """Give the response of a broadcast transaction to the gas strategy and caches.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+        self._gas_strategy.observe(tx, response)
+        if self.simulation_cache is not None:
+            self.simulation_cache.observe(tx, response)
 
     # NOTE(pb): We should come up with a mechanism how this method (or a new one) can return also `Coin`, resp. `Coins`.
     def estimate_fee_from_gas(self, gas_limit: int) -> str:
@@ -634,6 +683,7 @@ class LedgerClient:
         )
 
         start = datetime.now()
+        committed = False
         while True:
             try:
                 return self.query_tx(tx_hash)
@@ -644,6 +694,16 @@ class LedgerClient:
             if delta >= timeout:
                 raise QueryTimeoutError()
 
+            # wait for the commit event if subscribed, otherwise (or once the
+            # transaction is known to be committed but not indexed yet) poll. The
+            # wait never exceeds the poll period, so a missed event only delays it
+            subscriber = self.tx_subscriber
+            if not committed and subscriber is not None and subscriber.connected:
+                committed = subscriber.wait_for_tx(
+                    tx_hash, min(poll_period, timeout - delta).total_seconds()
+                )
+                continue
+
             time.sleep(poll_period.total_seconds())
 
     def query_tx(self, tx_hash: str) -> TxResponse:
@@ -671,42 +731,58 @@ class LedgerClient:
         return self._parse_tx_response(resp.tx_response)
 
     @staticmethod
-    def _parse_tx_response(tx_response: Any) -> TxResponse:
-        # parse the transaction logs
-        logs = []
-        for log_data in tx_response.logs:
-            events = {}
-            for event in log_data.events:
-                events[event.type] = {a.key: a.value for a in event.attributes}
-            logs.append(
-                MessageLog(
-                    index=int(log_data.msg_index), log=log_data.msg_index, events=events
+    def _parse_account_response(address: Address, response: Any) -> Account:
+        account = BaseAccount()
+        response.account.Unpack(account)
+
+        return Account(
+            address=address,
+            number=account.account_number,
+            sequence=account.sequence,
+        )
+
+    @staticmethod
+    def _parse_node_info_response(response: Any) -> NodeInfo:
+        cosmos_sdk_version = Version(
+            response.application_version.cosmos_sdk_version.lstrip("v")
+        )
+        app_name = response.application_version.name
+        app_version = Version(response.application_version.version.lstrip("v"))
+
+        return NodeInfo(
+            cosmos_sdk_version=cosmos_sdk_version,
+            app_name=app_name,
+            app_version=app_version,
+        )
+
+    @staticmethod
+    def _build_validators_request(
+        status: Optional[ValidatorStatus],
+    ) -> QueryValidatorsRequest:
+        filtered_status = status or ValidatorStatus.BONDED
+
+        req = QueryValidatorsRequest()
+        if filtered_status != ValidatorStatus.UNSPECIFIED:
+            req.status = filtered_status.value
+        return req
+
+    @staticmethod
+    def _parse_validators_response(resp: Any) -> List[Validator]:
+        validators: List[Validator] = []
+        for validator in resp.validators:
+            validators.append(
+                Validator(
+                    address=Address(validator.operator_address),
+                    tokens=cast_to_int(validator.tokens, False),
+                    moniker=str(validator.description.moniker),
+                    status=ValidatorStatus.from_proto(validator.status),
                 )
             )
+        return validators
 
-        # parse the transaction events
-        events = {}
-        for event in tx_response.events:
-            event_data = events.get(event.type, {})
-            for attribute in event.attributes:
-                event_data[safe_decode(attribute.key)] = safe_decode(attribute.value)
-            events[event.type] = event_data
-
-        timestamp = None
-        if tx_response.timestamp:
-            timestamp = isoparse(tx_response.timestamp)
-
-        return TxResponse(
-            hash=str(tx_response.txhash),
-            height=int(tx_response.height),
-            code=int(tx_response.code),
-            gas_wanted=int(tx_response.gas_wanted),
-            gas_used=int(tx_response.gas_used),
-            raw_log=str(tx_response.raw_log),
-            logs=logs,
-            events=events,
-            timestamp=timestamp,
-        )
+    @staticmethod
+    def _parse_tx_response(tx_response: Any) -> TxResponse:
+        return LazyTxResponse(tx_response)
 
     def simulate_tx(self, tx: Transaction) -> int:
         """simulate transaction.
@@ -718,31 +794,75 @@ class LedgerClient:
         if tx.state != TxState.Final:
             raise RuntimeError("Unable to simulate non final transaction")
 
-        req = SimulateRequest(tx=tx.tx)
+        req = SimulateRequest(tx_bytes=tx.tx_bytes)
         resp = self.txs.Simulate(req)
 
         return int(resp.gas_info.gas_used)
 
-    def broadcast_tx(self, tx: Transaction) -> SubmittedTx:
+    def broadcast_tx(
+        self,
+        tx: Transaction,
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+    ) -> SubmittedTx:
         """Broadcast transaction.
 
         :param tx: transaction
+        :param mode: broadcast mode, see `broadcast_tx_bytes`
         :return: Submitted transaction
         """
-        # create the broadcast request
-        broadcast_req = BroadcastTxRequest(
-            tx_bytes=tx.tx.SerializeToString(), mode=BroadcastMode.BROADCAST_MODE_SYNC
-        )
+        submitted = self.broadcast_tx_bytes(tx.tx_bytes, mode)
+        return SubmittedTx(self, submitted.tx_hash, tx)
 
-        # broadcast the transaction
-        resp = self.txs.BroadcastTx(broadcast_req)
-        tx_digest = resp.tx_response.txhash
+    def broadcast_tx_bytes(
+        self,
+        raw: bytes,
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+    ) -> SubmittedTx:
+        """Broadcast a serialized transaction, for example one signed offline.
+
+        In sync mode, the node answers once the transaction passed CheckTx. In async
+        mode, it answers as soon as it received the transaction, and the hash is
+        computed locally: a transaction rejected by CheckTx is then never confirmed.
+
+        :param raw: serialized transaction
+        :param mode: broadcast mode, defaults to sync
+        :return: Submitted transaction
+        """
+        resp = self.txs.BroadcastTx(BroadcastTxRequest(tx_bytes=raw, mode=mode))
+        if mode == BroadcastMode.BROADCAST_MODE_ASYNC:
+            return SubmittedTx(self, sha256(raw).hexdigest().upper())
 
         # check that the response is successful
-        initial_tx_response = self._parse_tx_response(resp.tx_response)
-        initial_tx_response.ensure_successful()
+        self._parse_tx_response(resp.tx_response).ensure_successful()
+        return SubmittedTx(self, resp.tx_response.txhash)
+
+    def broadcast_many(
+        self,
+        txs: Iterable[Union[Transaction, bytes]],
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+        max_in_flight: int = DEFAULT_BROADCAST_IN_FLIGHT,
+    ) -> List[SubmittedTx]:
+        """Broadcast many transactions, keeping several broadcasts in flight.
+
+        Concurrent broadcasts may reach the node in any order, which CheckTx rejects
+        for consecutive sequences of the same account: broadcast those with a single
+        broadcast in flight. If broadcasts fail, the error of the first failed
+        transaction is raised once all of them are done.
+
+        :param txs: transactions, or serialized transactions
+        :param mode: broadcast mode, see `broadcast_tx_bytes`
+        :param max_in_flight: max number of broadcasts in flight
+        :return: Submitted transactions, in the order of the transactions
+        """
+
+        def _broadcast(tx: Union[Transaction, bytes]) -> SubmittedTx:
+            if isinstance(tx, Transaction):
+                return self.broadcast_tx(tx, mode)
+            return self.broadcast_tx_bytes(tx, mode)
 
-        return SubmittedTx(self, tx_digest)
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            futures = [executor.submit(_broadcast, tx) for tx in txs]
+        return [future.result() for future in futures]
 
     def query_latest_block(self) -> Block:
         """Query the latest block.
@@ -751,7 +871,12 @@ class LedgerClient:
         """
         req = GetLatestBlockRequest()
         resp = self.tendermint.GetLatestBlock(req)
-        return Block.from_proto(resp.block)
+        block = Block.from_proto(resp.block)
+        if self.query_cache is not None:
+            self.query_cache.observe_height(block.height)
+        if self.simulation_cache is not None:
+            self.simulation_cache.observe_height(block.height)
+        return block
 
     def query_block(self, height: int) -> Block:
         """Query the block.
@@ -763,6 +888,34 @@ class LedgerClient:
         resp = self.tendermint.GetBlockByHeight(req)
         return Block.from_proto(resp.block)
 
+    def query_block_with_txs(self, height: int) -> Block:
+        """Query the block, with its decoded transactions and their responses.
+
+        :param height: block height
+        :return: block
+        """
+        return query_block_with_txs(self, height)
+
+    def iter_blocks(
+        self,
+        start: int,
+        end: Optional[int] = None,
+        concurrency: int = DEFAULT_BLOCK_CONCURRENCY,
+        checkpoint: Optional[BlockCheckpointStore] = None,
+    ) -> Iterator[Block]:
+        """Stream blocks in height order, with their transactions and responses.
+
+        See `cosmpy.aerial.client.blocks.iter_blocks`.
+
+        :param start: first height
+        :param end: last height, defaults to following the chain tip
+        :param concurrency: max number of blocks fetched at once
+        :param checkpoint: checkpoint store of the last processed height, defaults
+            to None
+        :return: iterator of blocks
+        """
+        return iter_blocks(self, start, end, concurrency, checkpoint)
+
     def query_height(self) -> int:
         """Query the latest block height.
 
@@ -775,4 +928,6 @@ class LedgerClient:
 
         :return: chain id
         """
-        return self.query_latest_block().chain_id
+        return self._cached(
+            "query_chain_id", None, lambda: self.query_latest_block().chain_id
+        )
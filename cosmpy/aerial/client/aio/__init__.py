@@ -0,0 +1,904 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Asyncio client functionality."""
+
+import asyncio
+import functools
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from hashlib import sha256
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import certifi
+import grpc
+
+from cosmpy.aerial.client import (
+    BLOCK_HEIGHT_METADATA_KEY,
+    DEFAULT_BROADCAST_IN_FLIGHT,
+    DEFAULT_BULK_QUERY_WORKERS,
+    DEFAULT_QUERY_INTERVAL_SECS,
+    DEFAULT_QUERY_TIMEOUT_SECS,
+    LedgerClient,
+)
+from cosmpy.aerial.client.aio.gas import AsyncGasStrategy, AsyncSimulationGasStrategy
+from cosmpy.aerial.client.aio.tx_helpers import AsyncSubmittedTx
+from cosmpy.aerial.client.aio.utils import (
+    get_paginated,
+    iter_paginated,
+    prepare_and_broadcast_basic_transaction,
+)
+from cosmpy.aerial.client.bank import BalanceSnapshot, create_bank_send_msg
+from cosmpy.aerial.client.cache import SimulationCache
+from cosmpy.aerial.client.distribution import create_withdraw_delegator_reward
+from cosmpy.aerial.client.staking import (
+    StakingSummary,
+    Validator,
+    ValidatorStatus,
+    build_staking_summary,
+    create_delegate_msg,
+    create_redelegate_msg,
+    create_undelegate_msg,
+)
+from cosmpy.aerial.client.subscriber import TxEventSubscriber
+from cosmpy.aerial.client.utils import ensure_timedelta
+from cosmpy.aerial.coins import Coin
+from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
+from cosmpy.aerial.gas import GasStrategy
+from cosmpy.aerial.tx import Transaction, TxFee, TxState
+from cosmpy.aerial.tx_helpers import TxResponse
+from cosmpy.aerial.types import Account, Block, NodeInfo
+from cosmpy.aerial.urls import Protocol, parse_url
+from cosmpy.aerial.wallet import Wallet
+from cosmpy.auth.rest_client import AuthRestClient
+from cosmpy.bank.rest_client import BankRestClient
+from cosmpy.common.rest_client import RestClient
+from cosmpy.consensus.rest_client import ConsensusRestClient
+from cosmpy.cosmwasm.rest_client import CosmWasmRestClient
+from cosmpy.crypto.address import Address
+from cosmpy.distribution.rest_client import DistributionRestClient
+from cosmpy.params.rest_client import ParamsRestClient
+from cosmpy.protos.cosmos.auth.v1beta1.auth_pb2 import BaseAccount
+from cosmpy.protos.cosmos.auth.v1beta1.query_pb2 import QueryAccountRequest
+from cosmpy.protos.cosmos.auth.v1beta1.query_pb2_grpc import QueryStub as AuthGrpcClient
+from cosmpy.protos.cosmos.bank.v1beta1.query_pb2 import (
+    QueryAllBalancesRequest,
+    QueryBalanceRequest,
+)
+from cosmpy.protos.cosmos.bank.v1beta1.query_pb2_grpc import QueryStub as BankGrpcClient
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import (
+    GetBlockByHeightRequest,
+    GetLatestBlockRequest,
+    GetNodeInfoRequest,
+)
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2_grpc import (
+    ServiceStub as TendermintQueryGrpcClient,
+)
+from cosmpy.protos.cosmos.consensus.v1.query_pb2_grpc import (
+    QueryStub as QueryConsensusGrpcClient,
+)
+from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2 import (
+    QueryDelegationTotalRewardsRequest,
+)
+from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2_grpc import (
+    QueryStub as DistributionGrpcClient,
+)
+from cosmpy.protos.cosmos.params.v1beta1.query_pb2 import QueryParamsRequest
+from cosmpy.protos.cosmos.params.v1beta1.query_pb2_grpc import (
+    QueryStub as QueryParamsGrpcClient,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2 import (
+    QueryDelegatorDelegationsRequest,
+    QueryDelegatorUnbondingDelegationsRequest,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2_grpc import (
+    QueryStub as StakingGrpcClient,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import (
+    BroadcastMode,
+    BroadcastTxRequest,
+    GetTxRequest,
+    SimulateRequest,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2_grpc import ServiceStub as TxGrpcClient
+from cosmpy.protos.cosmwasm.wasm.v1.query_pb2_grpc import (
+    QueryStub as CosmWasmGrpcClient,
+)
+from cosmpy.staking.rest_client import StakingRestClient
+from cosmpy.tendermint.rest_client import (
+    CosmosBaseTendermintRestClient as TendermintRestClient,
+)
+from cosmpy.tx.rest_client import TxRestClient
+
+
+DEFAULT_MAX_REST_WORKERS = 64
+
+
+class AsyncRestStub:
+    """Expose the methods of a blocking REST client as awaitables.
+
+    The REST clients are built on top of a blocking HTTP session, so every call is
+    dispatched to a shared thread pool. This keeps the event loop free while the
+    request is in flight and lets many REST requests overlap.
+    """
+
+    def __init__(self, rest_client: Any, executor: ThreadPoolExecutor):
+        """Init the async REST stub.
+
+        :param rest_client: blocking REST client (e.g. BankRestClient)
+        :param executor: thread pool used to run the blocking calls
+        """
+        self._rest_client = rest_client
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Callable:
+        """Get an awaitable version of the REST client method.
+
+        :param name: method name
+        :return: coroutine function wrapping the blocking method
+        """
+        method = getattr(self._rest_client, name)
+
+        async def _call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(method, *args, **kwargs)
+            )
+
+        return _call
+
+
+class AsyncLedgerClient:
+    """Asyncio ledger client.
+
+    Mirrors the API of `LedgerClient`, but every network operation is a coroutine. gRPC
+    endpoints are served by `grpc.aio` channels, REST endpoints by the REST clients
+    dispatched to a thread pool.
+    """
+
+    def __init__(
+        self,
+        cfg: NetworkConfig,
+        query_interval_secs: int = DEFAULT_QUERY_INTERVAL_SECS,
+        query_timeout_secs: int = DEFAULT_QUERY_TIMEOUT_SECS,
+        max_rest_workers: int = DEFAULT_MAX_REST_WORKERS,
+        tx_subscriber: Optional[TxEventSubscriber] = None,
+        simulation_cache: Optional[SimulationCache] = None,
+    ):
+        """Init async ledger client.
+
+        :param cfg: Network configurations
+        :param query_interval_secs: int. optional interval int seconds
+        :param query_timeout_secs: int. optional interval int seconds
+        :param max_rest_workers: max number of REST requests in flight
+        :param tx_subscriber: optional websocket subscriber used to wait for transactions
+        :param simulation_cache: optional cache of the gas estimates of similar transactions
+        """
+        self._query_interval_secs = query_interval_secs
+        self._query_timeout_secs = query_timeout_secs
+        self.tx_subscriber = tx_subscriber
+        self.simulation_cache = simulation_cache
+        cfg.validate()
+        self._network_config = cfg
+        self._gas_strategy: Union[
+            GasStrategy, AsyncGasStrategy
+        ] = AsyncSimulationGasStrategy(self)
+        self._grpc_channel: Optional[grpc.aio.Channel] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        parsed_url = parse_url(cfg.url)
+
+        if parsed_url.protocol == Protocol.GRPC:
+            if parsed_url.secure:
+                with open(certifi.where(), "rb") as f:
+                    trusted_certs = f.read()
+                credentials = grpc.ssl_channel_credentials(
+                    root_certificates=trusted_certs
+                )
+                grpc_client = grpc.aio.secure_channel(
+                    parsed_url.host_and_port, credentials
+                )
+            else:
+                grpc_client = grpc.aio.insecure_channel(parsed_url.host_and_port)
+            self._grpc_channel = grpc_client
+
+            self.wasm = CosmWasmGrpcClient(grpc_client)
+            self.auth = AuthGrpcClient(grpc_client)
+            self.txs = TxGrpcClient(grpc_client)
+            self.bank = BankGrpcClient(grpc_client)
+            self.staking = StakingGrpcClient(grpc_client)
+            self.distribution = DistributionGrpcClient(grpc_client)
+            self.params = QueryParamsGrpcClient(grpc_client)
+            self.consensus = QueryConsensusGrpcClient(grpc_client)
+            self.tendermint = TendermintQueryGrpcClient(grpc_client)
+        else:
+            rest_client = RestClient(parsed_url.rest_url, pool_maxsize=max_rest_workers)
+            self._executor = ThreadPoolExecutor(max_workers=max_rest_workers)
+
+            def _stub(rest_client_cls: Callable) -> AsyncRestStub:
+                return AsyncRestStub(rest_client_cls(rest_client), self._executor)  # type: ignore
+
+            self.wasm = _stub(CosmWasmRestClient)  # type: ignore
+            self.auth = _stub(AuthRestClient)  # type: ignore
+            self.txs = _stub(TxRestClient)  # type: ignore
+            self.bank = _stub(BankRestClient)  # type: ignore
+            self.staking = _stub(StakingRestClient)  # type: ignore
+            self.distribution = _stub(DistributionRestClient)  # type: ignore
+            self.params = _stub(ParamsRestClient)  # type: ignore
+            self.consensus = _stub(ConsensusRestClient)  # type: ignore
+            self.tendermint = _stub(TendermintRestClient)  # type: ignore
+
+    async def close(self):
+        """Close the underlying channel and release the REST worker threads."""
+        if self._grpc_channel is not None:
+            await self._grpc_channel.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncLedgerClient":
+        """Enter the async context.
+
+        :return: the client itself
+        """
+        return self
+
+    async def __aexit__(self, *args):
+        """Exit the async context and close the client.
+
+        :param args: exception details
+        """
+        await self.close()
+
+    @property
+    def network_config(self) -> NetworkConfig:
+        """Get the network config.
+
+        :return: network config
+        """
+        return self._network_config
+
+    @property
+    def gas_strategy(self) -> Union[GasStrategy, AsyncGasStrategy]:
+        """Get gas strategy.
+
+        :return: gas strategy
+        """
+        return self._gas_strategy
+
+    @gas_strategy.setter
+    def gas_strategy(self, strategy: Union[GasStrategy, AsyncGasStrategy]):
+        """Set gas strategy.
+
+        :param strategy: strategy
+        :raises RuntimeError: Invalid strategy must implement GasStrategy interface
+        """
+        if not isinstance(strategy, (GasStrategy, AsyncGasStrategy)):
+            raise RuntimeError(
+                "Invalid strategy must implement GasStrategy or AsyncGasStrategy interface"
+            )
+        self._gas_strategy = strategy
+
+    async def query_account(self, address: Address) -> Account:
+        """Query account.
+
+        :param address: address
+        :raises RuntimeError: Unexpected account type returned from query
+        :return: account details
+        """
+        request = QueryAccountRequest(address=str(address))
+        response = await self.auth.Account(request)
+        if not response.account.Is(BaseAccount.DESCRIPTOR):
+            raise RuntimeError("Unexpected account type returned from query")
+        return LedgerClient._parse_account_response(  # pylint: disable=protected-access
+            address, response
+        )
+
+    async def query_params(self, subspace: str, key: str) -> Any:
+        """Query Prams.
+
+        :param subspace: subspace
+        :param key: key
+        :return: Query params
+        """
+        req = QueryParamsRequest(subspace=subspace, key=key)
+        resp = await self.params.Params(req)
+        return json.loads(resp.param.value)
+
+    async def query_node_info(self) -> NodeInfo:
+        """
+        Query basic Tendermint / node information (moniker, chain-id, version, etc.).
+
+        :return: NodeInfo.
+        """
+        request = GetNodeInfoRequest()
+        response = await self.tendermint.GetNodeInfo(request)
+        return (
+            LedgerClient._parse_node_info_response(  # pylint: disable=protected-access
+                response
+            )
+        )
+
+    async def query_consensus_params(self) -> Any:
+        """Query consensus params.
+
+        :return: Query consensus params
+        """
+        req = QueryParamsRequest()
+        resp = await self.consensus.Params(req)
+        return resp
+
+    async def query_bank_balance(
+        self, address: Address, denom: Optional[str] = None
+    ) -> int:
+        """Query bank balance.
+
+        :param address: address
+        :param denom: denom, defaults to None
+        :return: bank balance
+        """
+        denom = denom or self.network_config.fee_denomination
+
+        req = QueryBalanceRequest(
+            address=str(address),
+            denom=denom,
+        )
+
+        resp = await self.bank.Balance(req)
+        assert resp.balance.denom == denom  # sanity check
+
+        return int(resp.balance.amount)
+
+    async def query_bank_all_balances(self, address: Address) -> List[Coin]:
+        """Query bank all balances.
+
+        :param address: address
+        :return: bank all balances
+        """
+        req = QueryAllBalancesRequest(address=str(address))
+        resp = await self.bank.AllBalances(req)
+
+        return [Coin(amount=coin.amount, denom=coin.denom) for coin in resp.balances]
+
+    async def query_balances_bulk(
+        self,
+        addresses: Iterable[Address],
+        denoms: Optional[List[str]] = None,
+        height: Optional[int] = None,
+        max_in_flight: int = DEFAULT_BULK_QUERY_WORKERS,
+    ) -> BalanceSnapshot:
+        """Query the balances of many addresses at a single block height.
+
+        :param addresses: addresses
+        :param denoms: denoms to query, defaults to None (all the denoms)
+        :param height: block height, defaults to the latest height
+        :param max_in_flight: max number of queries in flight
+        :return: balance snapshot
+        """
+        height = height or await self.query_height()
+        metadata = [(BLOCK_HEIGHT_METADATA_KEY, str(height))]
+        keys = [str(address) for address in addresses]
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def _all_balances(req: Any) -> Any:
+            return await self.bank.AllBalances(req, metadata=metadata)
+
+        async def _query(address: str) -> Dict[str, int]:
+            async with semaphore:
+                if denoms is None:
+                    pages = await get_paginated(
+                        QueryAllBalancesRequest(address=address), _all_balances
+                    )
+                    return {
+                        coin.denom: int(coin.amount)
+                        for resp in pages
+                        for coin in resp.balances
+                    }
+
+                balances = {}
+                for denom in denoms:
+                    req = QueryBalanceRequest(address=address, denom=denom)
+                    resp = await self.bank.Balance(req, metadata=metadata)
+                    balances[denom] = int(resp.balance.amount or 0)
+                return balances
+
+        results = await asyncio.gather(*[_query(address) for address in keys])
+        return BalanceSnapshot(height=height, balances=dict(zip(keys, results)))
+
+    async def send_tokens(
+        self,
+        destination: Address,
+        amount: int,
+        denom: str,
+        sender: Wallet,
+        memo: Optional[str] = None,
+        fee: Optional[TxFee] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """Send tokens.
+
+        :param destination: destination address
+        :param amount: amount
+        :param denom: denom
+        :param sender: sender
+        :param memo: memo, defaults to None
+        :param fee: transaction fee, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: prepare and broadcast the transaction and transaction details
+        """
+        tx = Transaction()
+        tx.add_message(
+            create_bank_send_msg(sender.address(), destination, amount, denom)
+        )
+
+        return await prepare_and_broadcast_basic_transaction(
+            self,
+            tx,
+            sender,
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    async def query_validators(
+        self, status: Optional[ValidatorStatus] = None
+    ) -> List[Validator]:
+        """Query validators.
+
+        :param status: validator status, defaults to None
+        :return: List of validators
+        """
+        req = (
+            LedgerClient._build_validators_request(  # pylint: disable=protected-access
+                status
+            )
+        )
+        return [
+            validator
+            async for resp in iter_paginated(
+                req, self.staking.Validators, prefetch=True
+            )
+            for validator in LedgerClient._parse_validators_response(  # pylint: disable=protected-access
+                resp
+            )
+        ]
+
+    async def query_staking_summary(self, address: Address) -> StakingSummary:
+        """Query staking summary.
+
+        :param address: address
+        :return: staking summary
+        """
+        delegations_req = QueryDelegatorDelegationsRequest(delegator_addr=str(address))
+        rewards_req = QueryDelegationTotalRewardsRequest(delegator_address=str(address))
+        unbonding_req = QueryDelegatorUnbondingDelegationsRequest(
+            delegator_addr=str(address)
+        )
+
+        delegations, rewards, unbondings = await asyncio.gather(
+            get_paginated(delegations_req, self.staking.DelegatorDelegations),
+            self.distribution.DelegationTotalRewards(rewards_req),
+            get_paginated(unbonding_req, self.staking.DelegatorUnbondingDelegations),
+        )
+
+        return build_staking_summary(
+            delegations,
+            rewards,
+            unbondings,
+            self.network_config.staking_denomination,
+        )
+
+    async def delegate_tokens(
+        self,
+        validator: Address,
+        amount: int,
+        sender: Wallet,
+        memo: Optional[str] = None,
+        fee: Optional[TxFee] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """Delegate tokens.
+
+        :param validator: validator address
+        :param amount: amount
+        :param sender: sender
+        :param memo: memo, defaults to None
+        :param fee: transaction fee, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: prepare and broadcast the transaction and transaction details
+        """
+        tx = Transaction()
+        tx.add_message(
+            create_delegate_msg(
+                sender.address(),
+                validator,
+                amount,
+                self.network_config.staking_denomination,
+            )
+        )
+
+        return await prepare_and_broadcast_basic_transaction(
+            self,
+            tx,
+            sender,
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    async def redelegate_tokens(
+        self,
+        current_validator: Address,
+        next_validator: Address,
+        amount: int,
+        sender: Wallet,
+        memo: Optional[str] = None,
+        fee: Optional[TxFee] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """Redelegate tokens.
+
+        :param current_validator: current validator address
+        :param next_validator: next validator address
+        :param amount: amount
+        :param sender: sender
+        :param memo: memo, defaults to None
+        :param fee: transaction fee, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: prepare and broadcast the transaction and transaction details
+        """
+        tx = Transaction()
+        tx.add_message(
+            create_redelegate_msg(
+                sender.address(),
+                current_validator,
+                next_validator,
+                amount,
+                self.network_config.staking_denomination,
+            )
+        )
+
+        return await prepare_and_broadcast_basic_transaction(
+            self,
+            tx,
+            sender,
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    async def undelegate_tokens(
+        self,
+        validator: Address,
+        amount: int,
+        sender: Wallet,
+        memo: Optional[str] = None,
+        fee: Optional[TxFee] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """Undelegate tokens.
+
+        :param validator: validator
+        :param amount: amount
+        :param sender: sender
+        :param memo: memo, defaults to None
+        :param fee: transaction fee, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: prepare and broadcast the transaction and transaction details
+        """
+        tx = Transaction()
+        tx.add_message(
+            create_undelegate_msg(
+                sender.address(),
+                validator,
+                amount,
+                self.network_config.staking_denomination,
+            )
+        )
+
+        return await prepare_and_broadcast_basic_transaction(
+            self,
+            tx,
+            sender,
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    async def claim_rewards(
+        self,
+        validator: Address,
+        sender: Wallet,
+        memo: Optional[str] = None,
+        fee: Optional[TxFee] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """claim rewards.
+
+        :param validator: validator
+        :param sender: sender
+        :param memo: memo, defaults to None
+        :param fee: transaction fee, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: prepare and broadcast the transaction and transaction details
+        """
+        tx = Transaction()
+        tx.add_message(create_withdraw_delegator_reward(sender.address(), validator))
+
+        return await prepare_and_broadcast_basic_transaction(
+            self,
+            tx,
+            sender,
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    async def estimate_gas_for_tx(self, tx: Transaction) -> int:
+        """Estimate gas for transaction.
+
+        :param tx: transaction
+        :return: Estimated gas for transaction
+        """
+        if self.simulation_cache is not None:
+            gas_limit = self.simulation_cache.get(tx)
+            if gas_limit is not None:
+                return gas_limit
+
+        if isinstance(self._gas_strategy, AsyncGasStrategy):
+            gas_limit = await self._gas_strategy.estimate_gas(tx)
+        else:
+            gas_limit = self._gas_strategy.estimate_gas(tx)
+        if self.simulation_cache is not None:
+            self.simulation_cache.put(tx, gas_limit)
+        return gas_limit
+
+    def observe_tx_response(self, tx: Transaction, response: TxResponse):
+        """Give the response of a broadcast transaction to the gas strategy and caches.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+        self._gas_strategy.observe(tx, response)
+        if self.simulation_cache is not None:
+            self.simulation_cache.observe(tx, response)
+
+    def estimate_fee_from_gas(self, gas_limit: int) -> str:
+        """Estimate fee from gas.
+
+        :param gas_limit: gas limit
+        :return: Estimated fee for transaction
+        """
+        fee = math.ceil(gas_limit * self.network_config.fee_minimum_gas_price)
+        return f"{fee}{self.network_config.fee_denomination}"
+
+    async def estimate_gas_and_fee_for_tx(self, tx: Transaction) -> Tuple[int, str]:
+        """Estimate gas and fee for transaction.
+
+        :param tx: transaction
+        :return: estimate gas, fee for transaction
+        """
+        gas_estimate = await self.estimate_gas_for_tx(tx)
+        fee = self.estimate_fee_from_gas(gas_estimate)
+        return gas_estimate, fee
+
+    async def wait_for_query_tx(
+        self,
+        tx_hash: str,
+        timeout: Optional[timedelta] = None,
+        poll_period: Optional[timedelta] = None,
+    ) -> TxResponse:
+        """Wait for query transaction.
+
+        :param tx_hash: transaction hash
+        :param timeout: timeout, defaults to None
+        :param poll_period: poll_period, defaults to None
+
+        :raises QueryTimeoutError: timeout
+
+        :return: transaction response
+        """
+        timeout = (
+            ensure_timedelta(timeout)
+            if timeout
+            else timedelta(seconds=self._query_timeout_secs)
+        )
+        poll_period = (
+            ensure_timedelta(poll_period)
+            if poll_period
+            else timedelta(seconds=self._query_interval_secs)
+        )
+
+        start = datetime.now()
+        committed = False
+        while True:
+            try:
+                return await self.query_tx(tx_hash)
+            except NotFoundError:
+                pass
+
+            delta = datetime.now() - start
+            if delta >= timeout:
+                raise QueryTimeoutError()
+
+            # the wait never exceeds the poll period, so a missed event only delays
+            # the next query
+            subscriber = self.tx_subscriber
+            if not committed and subscriber is not None and subscriber.connected:
+                committed = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    subscriber.wait_for_tx,
+                    tx_hash,
+                    min(poll_period, timeout - delta).total_seconds(),
+                )
+                continue
+
+            await asyncio.sleep(poll_period.total_seconds())
+
+    async def query_tx(self, tx_hash: str) -> TxResponse:
+        """query transaction.
+
+        :param tx_hash: transaction hash
+        :raises NotFoundError: Tx details not found
+        :raises grpc.RpcError: RPC connection issue
+        :return: query response
+        """
+        req = GetTxRequest(hash=tx_hash)
+        try:
+            resp = await self.txs.GetTx(req)
+        except grpc.RpcError as e:
+            details = e.details()
+            if "not found" in details:
+                raise NotFoundError() from e
+            raise
+        except RuntimeError as e:
+            details = str(e)
+            if "tx" in details and "not found" in details:
+                raise NotFoundError() from e
+            raise
+
+        return LedgerClient._parse_tx_response(  # pylint: disable=protected-access
+            resp.tx_response
+        )
+
+    async def simulate_tx(self, tx: Transaction) -> int:
+        """simulate transaction.
+
+        :param tx: transaction
+        :raises RuntimeError: Unable to simulate non final transaction
+        :return: gas used in transaction
+        """
+        if tx.state != TxState.Final:
+            raise RuntimeError("Unable to simulate non final transaction")
+
+        req = SimulateRequest(tx_bytes=tx.tx_bytes)
+        resp = await self.txs.Simulate(req)
+
+        return int(resp.gas_info.gas_used)
+
+    async def broadcast_tx(
+        self,
+        tx: Transaction,
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+    ) -> AsyncSubmittedTx:
+        """Broadcast transaction.
+
+        :param tx: transaction
+        :param mode: broadcast mode, see `broadcast_tx_bytes`
+        :return: Submitted transaction
+        """
+        submitted = await self.broadcast_tx_bytes(tx.tx_bytes, mode)
+        return AsyncSubmittedTx(self, submitted.tx_hash, tx)
+
+    async def broadcast_tx_bytes(
+        self,
+        raw: bytes,
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+    ) -> AsyncSubmittedTx:
+        """Broadcast a serialized transaction, for example one signed offline.
+
+        In sync mode, the node answers once the transaction passed CheckTx. In async
+        mode, it answers as soon as it received the transaction, and the hash is
+        computed locally: a transaction rejected by CheckTx is then never confirmed.
+
+        :param raw: serialized transaction
+        :param mode: broadcast mode, defaults to sync
+        :return: Submitted transaction
+        """
+        resp = await self.txs.BroadcastTx(BroadcastTxRequest(tx_bytes=raw, mode=mode))
+        if mode == BroadcastMode.BROADCAST_MODE_ASYNC:
+            return AsyncSubmittedTx(self, sha256(raw).hexdigest().upper())
+
+        # check that the response is successful
+        initial_tx_response = (
+            LedgerClient._parse_tx_response(  # pylint: disable=protected-access
+                resp.tx_response
+            )
+        )
+        initial_tx_response.ensure_successful()
+        return AsyncSubmittedTx(self, resp.tx_response.txhash)
+
+    async def broadcast_many(
+        self,
+        txs: Iterable[Union[Transaction, bytes]],
+        mode: "BroadcastMode.ValueType" = BroadcastMode.BROADCAST_MODE_SYNC,
+        max_in_flight: int = DEFAULT_BROADCAST_IN_FLIGHT,
+    ) -> List[AsyncSubmittedTx]:
+        """Broadcast many transactions, keeping several broadcasts in flight.
+
+        Concurrent broadcasts may reach the node in any order, which CheckTx rejects
+        for consecutive sequences of the same account: broadcast those with a single
+        broadcast in flight. If broadcasts fail, the error of the first failed
+        transaction is raised once all of them are done.
+
+        :param txs: transactions, or serialized transactions
+        :param mode: broadcast mode, see `broadcast_tx_bytes`
+        :param max_in_flight: max number of broadcasts in flight
+        :return: Submitted transactions, in the order of the transactions
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def _broadcast(tx: Union[Transaction, bytes]) -> AsyncSubmittedTx:
+            async with semaphore:
+                if isinstance(tx, Transaction):
+                    return await self.broadcast_tx(tx, mode)
+                return await self.broadcast_tx_bytes(tx, mode)
+
+        tasks = [asyncio.ensure_future(_broadcast(tx)) for tx in txs]
+        if tasks:
+            await asyncio.wait(tasks)
+        return [task.result() for task in tasks]
+
+    async def query_latest_block(self) -> Block:
+        """Query the latest block.
+
+        :return: latest block
+        """
+        req = GetLatestBlockRequest()
+        resp = await self.tendermint.GetLatestBlock(req)
+        block = Block.from_proto(resp.block)
+        if self.simulation_cache is not None:
+            self.simulation_cache.observe_height(block.height)
+        return block
+
+    async def query_block(self, height: int) -> Block:
+        """Query the block.
+
+        :param height: block height
+        :return: block
+        """
+        req = GetBlockByHeightRequest(height=height)
+        resp = await self.tendermint.GetBlockByHeight(req)
+        return Block.from_proto(resp.block)
+
+    async def query_height(self) -> int:
+        """Query the latest block height.
+
+        :return: latest block height
+        """
+        return (await self.query_latest_block()).height
+
+    async def query_chain_id(self) -> str:
+        """Query the chain id.
+
+        :return: chain id
+        """
+        return (await self.query_latest_block()).chain_id
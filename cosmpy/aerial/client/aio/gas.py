@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Asyncio transaction gas strategy."""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from cosmpy.aerial.tx import Transaction
+from cosmpy.aerial.tx_helpers import TxResponse
+
+
+class AsyncGasStrategy(ABC):
+    """Asyncio transaction gas strategy."""
+
+    @abstractmethod
+    async def estimate_gas(self, tx: Transaction) -> int:
+        """Estimate the transaction gas.
+
+        :param tx: Transaction
+        :return: None
+        """
+
+    @abstractmethod
+    async def block_gas_limit(self) -> int:
+        """Get the block gas limit.
+
+        :return: None
+        """
+
+    def observe(self, tx: Transaction, response: TxResponse):  # noqa: B027
+        """Observe the outcome of a transaction, to learn from it.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+
+    async def _clip_gas(self, value: int) -> int:
+        block_limit = await self.block_gas_limit()
+        if block_limit < 0:
+            return value
+
+        return min(value, block_limit)
+
+
+class AsyncSimulationGasStrategy(AsyncGasStrategy):
+    """Asyncio simulation transaction gas strategy.
+
+    :param AsyncGasStrategy: gas strategy
+    """
+
+    DEFAULT_MULTIPLIER = 1.65
+
+    def __init__(
+        self,
+        client: "AsyncLedgerClient",  # type: ignore # noqa: F821
+        multiplier: Optional[float] = None,
+    ):
+        """Init the Simulation transaction gas strategy.
+
+        :param client: Async ledger client
+        :param multiplier: multiplier, defaults to None
+        """
+        self._client = client
+        self._max_gas: Optional[int] = None
+        self._multiplier = multiplier or self.DEFAULT_MULTIPLIER
+
+    async def estimate_gas(self, tx: Transaction) -> int:
+        """Get estimated transaction gas.
+
+        :param tx: transaction
+        :return: Estimated transaction gas
+        """
+        gas_estimate = await self._client.simulate_tx(tx)
+        return await self._clip_gas(int(gas_estimate * self._multiplier))
+
+    async def block_gas_limit(self) -> int:
+        """Get the block gas limit.
+
+        :raises Exception: Failed to query max_gas
+        :return: block gas limit
+        """
+        if self._max_gas is None:
+            try:
+                params = await self._client.query_consensus_params()
+                self._max_gas = int(params.params.block.max_gas)
+            except Exception as e:  # pylint: disable=broad-except
+                try:
+                    block_params = await self._client.query_params(
+                        "baseapp", "BlockParams"
+                    )
+                    self._max_gas = int(block_params["max_gas"])
+                except Exception as f:  # pylint: disable=broad-except
+                    raise f from e
+
+        return self._max_gas or -1
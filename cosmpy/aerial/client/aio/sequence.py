@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Asyncio local account sequence management."""
+
+from typing import Optional
+
+from cosmpy.aerial.client.aio.tx_helpers import AsyncSubmittedTx
+from cosmpy.aerial.client.aio.utils import prepare_and_broadcast_basic_transaction
+from cosmpy.aerial.client.sequence import SequenceManager
+from cosmpy.aerial.exceptions import AccountSequenceMismatchError
+from cosmpy.aerial.tx import Transaction, TxFee
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import Wallet
+
+
+class AsyncSequenceManager(SequenceManager):
+    """Sequence manager of the asyncio ledger client.
+
+    The local state is only updated between awaits, so a manager can be shared by
+    the tasks of an event loop (and between threads).
+    """
+
+    async def sync(  # type: ignore[override] # pylint: disable=invalid-overridden-method
+        self,
+    ) -> Account:
+        """Synchronise the local state with the chain.
+
+        :return: queried account
+        """
+        account = await self._client.query_account(self._address)
+        self.reset(account)
+        return account
+
+    async def reserve(  # type: ignore[override] # pylint: disable=invalid-overridden-method
+        self,
+    ) -> Account:
+        """Reserve the next sequence.
+
+        :return: account with the reserved sequence
+        """
+        account = self._take()
+        while account is None:
+            self._adopt(await self._client.query_account(self._address))
+            account = self._take()
+        return account
+
+    async def prepare_and_broadcast(  # type: ignore[override] # pylint: disable=invalid-overridden-method
+        self,
+        tx: Transaction,
+        sender: Wallet,
+        fee: Optional[TxFee] = None,
+        memo: Optional[str] = None,
+        timeout_height: Optional[int] = None,
+    ) -> AsyncSubmittedTx:
+        """Prepare and broadcast a transaction with the next local sequence.
+
+        A transaction failing with an account sequence mismatch is signed again with
+        the sequence expected by the node and broadcast once more.
+
+        :param tx: The transaction
+        :param sender: The transaction sender
+        :param fee: The tx fee, see `prepare_basic_transaction`
+        :param memo: Transaction memo, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: broadcast transaction
+        """
+        try:
+            return await self._prepare_and_broadcast(
+                tx, sender, fee, memo, timeout_height
+            )
+        except AccountSequenceMismatchError as error:
+            self.resync(error.expected_sequence)
+        return await self._prepare_and_broadcast(tx, sender, fee, memo, timeout_height)
+
+    async def _prepare_and_broadcast(  # type: ignore[override] # pylint: disable=invalid-overridden-method
+        self,
+        tx: Transaction,
+        sender: Wallet,
+        fee: Optional[TxFee],
+        memo: Optional[str],
+        timeout_height: Optional[int],
+    ) -> AsyncSubmittedTx:
+        account = await self.reserve()
+        try:
+            return await prepare_and_broadcast_basic_transaction(
+                self._client, tx, sender, account, fee, memo, timeout_height
+            )
+        except AccountSequenceMismatchError:
+            raise
+        except Exception:
+            self.release(account)
+            raise
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Asyncio transaction helpers."""
+
+from datetime import timedelta
+from typing import Optional, Union
+
+from cosmpy.aerial.tx_helpers import SubmittedTx
+
+
+class AsyncSubmittedTx(SubmittedTx):
+    """Submitted transaction of the asyncio ledger client."""
+
+    async def wait_to_complete(  # type: ignore[override] # pylint: disable=invalid-overridden-method
+        self,
+        timeout: Optional[Union[int, float, timedelta]] = None,
+        poll_period: Optional[Union[int, float, timedelta]] = None,
+    ) -> "AsyncSubmittedTx":
+        """Wait to complete the transaction.
+
+        :param timeout: timeout, defaults to None
+        :param poll_period: poll_period, defaults to None
+
+        :return: Submitted Transaction
+        """
+        self.response = await self._client.wait_for_query_tx(
+            self.tx_hash, timeout=timeout, poll_period=poll_period
+        )
+        assert self._response is not None
+        self._response.ensure_successful()
+
+        return self
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Asyncio helper functions."""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from cosmpy.aerial.client.aio.tx_helpers import AsyncSubmittedTx
+from cosmpy.aerial.client.utils import DEFAULT_PER_PAGE_LIMIT
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import Wallet
+from cosmpy.protos.cosmos.base.query.v1beta1.pagination_pb2 import PageRequest
+
+
+async def iter_paginated(
+    initial_request: Any,
+    request_method: Callable,
+    pages_limit: int = 0,
+    per_page_limit: Optional[int] = DEFAULT_PER_PAGE_LIMIT,
+    prefetch: bool = False,
+    field: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """
+    Iterate over the pages of a request as they are fetched, or over their records.
+
+    :param initial_request: request supports pagination
+    :param request_method: coroutine function to perform request
+    :param pages_limit: max number of pages to return. default - 0 unlimited
+    :param per_page_limit: Optional int: amount of records per one page. default is None, determined by server
+    :param prefetch: fetch the next page while the current one is processed
+    :param field: name of the repeated field of the responses holding the records,
+        to iterate over the records instead of the responses. default - None
+
+    :yields: responses, or records when a field is given
+    """
+    pages = 0
+    pagination: Optional[PageRequest] = PageRequest(limit=per_page_limit)
+    next_page: Optional[asyncio.Task] = None
+    try:
+        while pagination is not None:
+            request = initial_request.__class__()
+            request.CopyFrom(initial_request)
+            request.pagination.CopyFrom(pagination)
+
+            resp = await (next_page or request_method(request))
+            next_page = None
+            pages += 1
+
+            pagination = None
+            if resp.pagination.next_key and (pages < pages_limit or pages_limit == 0):
+                pagination = PageRequest(
+                    limit=per_page_limit, key=resp.pagination.next_key
+                )
+                if prefetch:
+                    request = initial_request.__class__()
+                    request.CopyFrom(initial_request)
+                    request.pagination.CopyFrom(pagination)
+                    next_page = asyncio.ensure_future(request_method(request))
+
+            if field is None:
+                yield resp
+            else:
+                for record in getattr(resp, field):
+                    yield record
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+
+async def get_paginated(
+    initial_request: Any,
+    request_method: Callable,
+    pages_limit: int = 0,
+    per_page_limit: Optional[int] = DEFAULT_PER_PAGE_LIMIT,
+) -> List[Any]:
+    """
+    Get pages for specific request.
+
+    :param initial_request: request supports pagination
+    :param request_method: coroutine function to perform request
+    :param pages_limit: max number of pages to return. default - 0 unlimited
+    :param per_page_limit: Optional int: amount of records per one page. default is None, determined by server
+
+    :return: List of responses
+    """
+    return [
+        resp
+        async for resp in iter_paginated(
+            initial_request, request_method, pages_limit, per_page_limit
+        )
+    ]
+
+
+async def simulate_tx(
+    client: "AsyncLedgerClient",  # type: ignore # noqa: F821
+    tx: Transaction,
+    sender: Wallet,
+    account: Optional[Account] = None,
+    memo: Optional[str] = None,
+    timeout_height: Optional[int] = None,
+) -> Tuple[int, str, Account]:
+    """Estimate transaction fees based on either a provided amount, gas limit, or simulation.
+
+    :param client: Async ledger client
+    :param tx: The transaction
+    :param sender: The transaction sender
+    :param account: The account
+    :param memo: Transaction memo, defaults to None
+    :param timeout_height: timeout height, defaults to None
+
+    :return: Estimated gas_limit and fee amount tuple
+    """
+    # query the account information for the sender
+    if account is None:
+        account = await client.query_account(sender.address())
+
+    # we need to build up a representative transaction so that we can accurately simulate it,
+    # simulation does not need it to be signed
+    tx.seal(
+        SigningCfg.direct(sender.public_key(), account.sequence),
+        fee=TxFee([], 0),
+        memo=memo,
+        timeout_height=timeout_height,
+    )
+    tx.add_simulation_signatures()
+    tx.complete()
+
+    # simulate the gas and fee for the transaction
+    gas_limit, fee = await client.estimate_gas_and_fee_for_tx(tx)
+
+    return gas_limit, fee, account
+
+
+async def prepare_basic_transaction(
+    client: "AsyncLedgerClient",  # type: ignore # noqa: F821
+    tx: Transaction,
+    sender: Wallet,
+    account: Optional[Account] = None,
+    fee: Optional[TxFee] = None,
+    memo: Optional[str] = None,
+    timeout_height: Optional[int] = None,
+) -> Transaction:
+    """Prepare basic transaction.
+
+    :param client: Async ledger client
+    :param tx: The transaction
+    :param sender: The transaction sender
+    :param account: The account
+    :param fee: The tx fee (see `cosmpy.aerial.client.utils.prepare_basic_transaction`)
+    :param memo: Transaction memo, defaults to None
+    :param timeout_height: timeout height, defaults to None
+
+    :return: transaction
+    """
+    if fee is None:
+        fee = TxFee()
+
+    # query the account information for the sender
+    if account is None:
+        account = await client.query_account(sender.address())
+
+    simulated = fee.gas_limit is None
+    if simulated:
+        # Simulate transaction to get gas and amount
+        fee.gas_limit, estimated_amount, _ = await simulate_tx(
+            client, tx, sender, account, memo, timeout_height
+        )
+        # Use estimated amount if not provided
+        fee.amount = fee.amount or estimated_amount  # type: ignore
+
+    if fee.amount is None:
+        fee.amount = client.estimate_fee_from_gas(fee.gas_limit)  # type: ignore
+
+    # Build the final transaction, only the fee of a simulated one changes
+    if simulated:
+        tx.update_fee(fee)
+    else:
+        tx.seal(
+            SigningCfg.direct(sender.public_key(), account.sequence),
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
+
+    tx.sign(sender.signer(), client.network_config.chain_id, account.number)
+    tx.complete()
+
+    return tx
+
+
+async def prepare_and_broadcast_basic_transaction(
+    client: "AsyncLedgerClient",  # type: ignore # noqa: F821
+    tx: Transaction,
+    sender: Wallet,
+    account: Optional[Account] = None,
+    fee: Optional[TxFee] = None,
+    memo: Optional[str] = None,
+    timeout_height: Optional[int] = None,
+) -> AsyncSubmittedTx:
+    """Prepare and broadcast basic transaction.
+
+    :param client: Async ledger client
+    :param tx: The transaction
+    :param sender: The transaction sender
+    :param account: The account
+    :param fee: The tx fee (see `cosmpy.aerial.client.utils.prepare_basic_transaction`)
+    :param memo: Transaction memo, defaults to None
+    :param timeout_height: timeout height, defaults to None
+
+    :return: broadcast transaction
+    """
+    tx = await prepare_basic_transaction(
+        client, tx, sender, account, fee, memo, timeout_height
+    )
+    return await client.broadcast_tx(tx)
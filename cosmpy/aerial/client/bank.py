@@ -19,8 +19,12 @@
 
 """Bank send message."""
 
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple, Union
+
 from cosmpy.crypto.address import Address
-from cosmpy.protos.cosmos.bank.v1beta1.tx_pb2 import MsgSend
+from cosmpy.protos.cosmos.bank.v1beta1.bank_pb2 import Input, Output
+from cosmpy.protos.cosmos.bank.v1beta1.tx_pb2 import MsgMultiSend, MsgSend
 from cosmpy.protos.cosmos.base.v1beta1.coin_pb2 import Coin
 
 
@@ -42,3 +46,47 @@ def create_bank_send_msg(
     )
 
     return msg
+
+
+def create_multi_send_msg(
+    from_address: Address,
+    outputs: Sequence[Tuple[Union[Address, str], int]],
+    denom: str,
+) -> MsgMultiSend:
+    """Create bank multi send message, paying many addresses from a single one.
+
+    :param from_address: from address
+    :param outputs: address and amount of each payment
+    :param denom: denom
+    :return: bank multi send message
+    """
+    total = sum(int(amount) for _, amount in outputs)
+    return MsgMultiSend(
+        inputs=[
+            Input(
+                address=str(from_address),
+                coins=[Coin(amount=str(total), denom=denom)],
+            )
+        ],
+        outputs=[
+            Output(address=str(address), coins=[Coin(amount=str(amount), denom=denom)])
+            for address, amount in outputs
+        ],
+    )
+
+
+@dataclass
+class BalanceSnapshot:
+    """Balances of many addresses at a single block height."""
+
+    height: int
+    balances: Dict[str, Dict[str, int]]
+
+    def balance(self, address: Address, denom: str) -> int:
+        """Get the balance of an address.
+
+        :param address: address
+        :param denom: denom
+        :return: balance, 0 if unknown
+        """
+        return self.balances.get(str(address), {}).get(denom, 0)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Coalescing of messages into multi-message transactions."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from cosmpy.aerial.client.sequence import SequenceManager
+from cosmpy.aerial.client.utils import fit_to_gas_limit, simulate_tx
+from cosmpy.aerial.exceptions import AccountSequenceMismatchError
+from cosmpy.aerial.tx import Transaction, TxFee
+from cosmpy.aerial.tx_helpers import MessageLog, SubmittedTx
+from cosmpy.aerial.wallet import Wallet
+
+
+DEFAULT_MAX_MESSAGES = 50
+DEFAULT_FLUSH_INTERVAL_SECS = 1.0
+DEFAULT_MAX_CONFIRMING = 8
+
+
+@dataclass
+class _QueuedMessage:
+    msg: Any
+    queued_at: float
+    future: "Future[MessageLog]" = field(default_factory=Future)
+
+
+class _RejectedMessage(Exception):
+    """The simulation of the first message of a batch failed on its own."""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _simulable_count(
+    count: int, error: Exception, estimate: Callable[[int], Any]
+) -> Tuple[int, Exception]:
+    # bisect the number of leading messages simulated without error, along with
+    # the error of the shortest failing prefix
+    lower, upper = 0, count
+    while upper - lower > 1:
+        middle = (lower + upper) // 2
+        try:
+            estimate(middle)
+        except AccountSequenceMismatchError:
+            raise
+        except Exception as failure:  # pylint: disable=broad-except
+            upper, error = middle, failure
+        else:
+            lower = middle
+    return lower, error
+
+
+class TxBatcher:
+    """Pack the messages of many callers into multi-message transactions.
+
+    Messages are queued, and a background thread broadcasts them from the sender in
+    transactions of up to `max_messages` messages, as soon as enough are queued or
+    the oldest one has waited `flush_interval_secs`. Transactions whose simulated gas
+    exceeds the gas budget are shortened until they fit. Each message gets a future, resolved
+    with its `MessageLog` once its transaction is confirmed.
+
+    A message failing the simulation of its transaction only fails its own future:
+    the transaction is bisected down to the messages before it, and the messages
+    after it are queued again. Transactions are atomic once broadcast: when a
+    transaction fails, the futures of all its messages fail with the error.
+    """
+
+    def __init__(
+        self,
+        client: "LedgerClient",  # type: ignore # noqa: F821
+        sender: Wallet,
+        max_messages: int = DEFAULT_MAX_MESSAGES,
+        gas_budget: Optional[int] = None,
+        flush_interval_secs: float = DEFAULT_FLUSH_INTERVAL_SECS,
+        memo: Optional[str] = None,
+        sequences: Optional[SequenceManager] = None,
+        max_confirming: int = DEFAULT_MAX_CONFIRMING,
+    ):
+        """Init the transaction batcher and start its background thread.
+
+        :param client: Ledger client
+        :param sender: sender of the transactions
+        :param max_messages: max number of messages per transaction
+        :param gas_budget: max gas per transaction, defaults to the block gas limit
+        :param flush_interval_secs: max time a message waits for more messages
+        :param memo: memo of the transactions, defaults to None
+        :param sequences: sequence manager of the sender, to share its sequences
+            with other broadcasters, defaults to a new one
+        :param max_confirming: max number of transactions awaited at once
+        """
+        self._client = client
+        self._sender = sender
+        self._max_messages = max_messages
+        self._gas_budget = gas_budget
+        self._flush_interval_secs = flush_interval_secs
+        self._memo = memo
+        self._sequences = sequences or SequenceManager(client, sender.address())
+
+        self._queue: Deque[_QueuedMessage] = deque()
+        self._condition = threading.Condition()
+        self._flush_requested = False
+        self._closed = False
+        self._confirmations = ThreadPoolExecutor(max_workers=max_confirming)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "TxBatcher":
+        """Enter the context.
+
+        :return: the batcher
+        """
+        return self
+
+    def __exit__(self, *args):
+        """Flush the queued messages and wait for their confirmation.
+
+        :param args: exception details
+        """
+        self.close()
+
+    def submit(self, msg: Any) -> "Future[MessageLog]":
+        """Queue a message.
+
+        :param msg: message
+        :raises RuntimeError: if the batcher is closed
+        :return: future resolved with the log of the message once confirmed
+        """
+        queued = _QueuedMessage(msg, time.monotonic())
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The batcher is closed")
+            self._queue.append(queued)
+            # the first message starts the flush timer, a full batch flushes
+            if len(self._queue) in (1, self._max_messages):
+                self._condition.notify()
+        return queued.future
+
+    def flush(self):
+        """Broadcast the queued messages without waiting for more."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify()
+
+    def close(self):
+        """Broadcast the queued messages, then wait for their confirmation."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._confirmations.shutdown()
+
+    def _gas_limit(self) -> int:
+        block_limit = self._client.gas_strategy.block_gas_limit()
+        if self._gas_budget is None:
+            return block_limit
+        if block_limit < 0:
+            return self._gas_budget
+        return min(self._gas_budget, block_limit)
+
+    def _next_batch(self) -> List[_QueuedMessage]:
+        with self._condition:
+            while True:
+                if self._queue and (
+                    self._closed
+                    or self._flush_requested
+                    or len(self._queue) >= self._max_messages
+                ):
+                    break
+                if not self._queue:
+                    self._flush_requested = False
+                    if self._closed:
+                        return []
+                    self._condition.wait()
+                    continue
+                wait = self._queue[0].queued_at + self._flush_interval_secs
+                wait -= time.monotonic()
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+
+            count = min(self._max_messages, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _requeue(self, batch: List[_QueuedMessage]):
+        with self._condition:
+            self._queue.extendleft(reversed(batch))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                try:
+                    submitted, count = self._broadcast(batch)
+                except AccountSequenceMismatchError as error:
+                    self._sequences.resync(error.expected_sequence)
+                    submitted, count = self._broadcast(batch)
+            except _RejectedMessage as rejected:
+                # the other messages are broadcast without it
+                batch[0].future.set_exception(rejected.error)
+                self._requeue(batch[1:])
+                continue
+            except Exception as error:  # pylint: disable=broad-except
+                for queued in batch:
+                    queued.future.set_exception(error)
+                continue
+
+            # the messages split off go first in the next transaction
+            self._requeue(batch[count:])
+            self._confirmations.submit(self._confirm, submitted, batch[:count])
+
+    def _broadcast(self, batch: List[_QueuedMessage]) -> Tuple[SubmittedTx, int]:
+        def _estimate(count: int) -> Tuple[int, Tuple[Transaction, str]]:
+            tx = Transaction()
+            for queued in batch[:count]:
+                tx.add_message(queued.msg)
+            gas, amount, _ = simulate_tx(
+                self._client, tx, self._sender, account, self._memo
+            )
+            return gas, (tx, amount)
+
+        def _fit(count: int) -> Tuple[int, int, Tuple[Transaction, str]]:
+            return fit_to_gas_limit(
+                count,
+                self._gas_limit(),
+                self._client.gas_strategy.block_gas_limit(),
+                _estimate,
+            )
+
+        account = self._sequences.reserve()
+        try:
+            try:
+                count, estimate, (tx, amount) = _fit(len(batch))
+            except AccountSequenceMismatchError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                # a failing message fails the simulation of the whole batch, the
+                # messages before it are still broadcast
+                count, error = _simulable_count(len(batch), error, _estimate)
+                if count == 0:
+                    raise _RejectedMessage(error) from error
+                count, estimate, (tx, amount) = _fit(count)
+            tx.update_fee(TxFee(amount=amount, gas_limit=estimate))
+            tx.sign(
+                self._sender.signer(),
+                self._client.network_config.chain_id,
+                account.number,
+            )
+            tx.complete()
+            return self._client.broadcast_tx(tx), count
+        except AccountSequenceMismatchError:
+            raise
+        except Exception:
+            # the reserved sequence has not been consumed
+            self._sequences.release(account)
+            raise
+
+    @staticmethod
+    def _confirm(submitted: SubmittedTx, batch: List[_QueuedMessage]):
+        try:
+            submitted.wait_to_complete()
+        except Exception as error:  # pylint: disable=broad-except
+            for queued in batch:
+                queued.future.set_exception(error)
+            return
+
+        assert submitted.response is not None
+        logs = {log.index: log for log in submitted.response.logs}
+        for index, queued in enumerate(batch):
+            # chains which no longer return logs only give the index
+            queued.future.set_result(logs.get(index, MessageLog(index, "", {})))
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Concurrent streaming of block ranges."""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterator, Optional
+
+from cosmpy.aerial.tx_helpers import LazyTxResponse
+from cosmpy.aerial.types import Block
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import (
+    GetBlockByHeightRequest,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import GetTxsEventRequest
+from cosmpy.protos.cosmos.tx.v1beta1.tx_pb2 import Tx
+
+
+DEFAULT_BLOCK_CONCURRENCY = 8
+# queries of a block whose transaction responses are not all indexed yet
+MAX_BLOCK_INDEX_ATTEMPTS = 5
+
+
+class BlockCheckpointStore(ABC):
+    """Store of the last block height processed by a block stream."""
+
+    @abstractmethod
+    def load(self) -> Optional[int]:
+        """Load the last processed height.
+
+        :return: last processed height, or None if no block was processed
+        """
+
+    @abstractmethod
+    def save(self, height: int):
+        """Save the last processed height.
+
+        :param height: last processed height
+        """
+
+
+class MemoryBlockCheckpointStore(BlockCheckpointStore):
+    """Block checkpoint kept in memory."""
+
+    def __init__(self, height: Optional[int] = None):
+        """Init the checkpoint store.
+
+        :param height: last processed height, defaults to None
+        """
+        self._height = height
+
+    def load(self) -> Optional[int]:
+        """Load the last processed height.
+
+        :return: last processed height, or None if no block was processed
+        """
+        return self._height
+
+    def save(self, height: int):
+        """Save the last processed height.
+
+        :param height: last processed height
+        """
+        self._height = height
+
+
+class FileBlockCheckpointStore(BlockCheckpointStore):
+    """Block checkpoint kept in a file, which is replaced atomically."""
+
+    def __init__(self, path: str):
+        """Init the checkpoint store.
+
+        :param path: path of the checkpoint file
+        """
+        self._path = path
+
+    def load(self) -> Optional[int]:
+        """Load the last processed height.
+
+        :return: last processed height, or None if no block was processed
+        """
+        if not os.path.exists(self._path):
+            return None
+        with open(self._path, "r", encoding="utf-8") as checkpoint_file:
+            return int(checkpoint_file.read().strip())
+
+    def save(self, height: int):
+        """Save the last processed height.
+
+        :param height: last processed height
+        """
+        # write then rename, so a crash never leaves a partial checkpoint
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint_file:
+            checkpoint_file.write(str(height))
+        os.replace(temporary, self._path)
+
+
+def query_block_with_txs(
+    client: "LedgerClient", height: int  # type: ignore # noqa: F821
+) -> Block:
+    """Query a block, with its decoded transactions and their responses.
+
+    The response of a transaction the node does not return, e.g. while its indexer
+    lags, is None.
+
+    :param client: Ledger client
+    :param height: block height
+    :return: block
+    """
+    resp = client.tendermint.GetBlockByHeight(GetBlockByHeightRequest(height=height))
+    block = Block.from_proto(resp.block)
+    block.txs = [Tx.FromString(raw) for raw in resp.block.data.txs]
+
+    # the responses are paged by nodes capping the page size
+    responses: Dict[str, LazyTxResponse] = {}
+    query = f"tx.height={height}"
+    page = 1
+    while len(responses) < len(block.tx_hashes):
+        req = GetTxsEventRequest(
+            events=[query], query=query, page=page, limit=len(block.tx_hashes)
+        )
+        txs_resp = client.txs.GetTxsEvent(req)
+        found = len(responses)
+        for tx_response in txs_resp.tx_responses:
+            responses[tx_response.txhash.upper()] = LazyTxResponse(tx_response)
+        # stop on a page without new responses, which nodes ignoring the page
+        # number return again and again
+        if len(responses) == found:
+            break
+        page += 1
+
+    # in the order of the transactions in the block
+    block.tx_responses = [responses.get(tx_hash) for tx_hash in block.tx_hashes]
+    return block
+
+
+def _query_indexed_block(
+    client: "LedgerClient",  # type: ignore # noqa: F821
+    height: int,
+    poll_interval_secs: float,
+) -> Block:
+    # the latest blocks may be committed before their transactions are indexed
+    for _ in range(MAX_BLOCK_INDEX_ATTEMPTS - 1):
+        block = client.query_block_with_txs(height)
+        if None not in (block.tx_responses or ()):
+            return block
+        time.sleep(poll_interval_secs)
+    return client.query_block_with_txs(height)
+
+
+def iter_blocks(  # pylint: disable=too-many-arguments
+    client: "LedgerClient",  # type: ignore # noqa: F821
+    start: int,
+    end: Optional[int] = None,
+    concurrency: int = DEFAULT_BLOCK_CONCURRENCY,
+    checkpoint: Optional[BlockCheckpointStore] = None,
+    poll_interval_secs: Optional[float] = None,
+) -> Iterator[Block]:
+    """Stream the blocks of a height range, with their transactions and results.
+
+    Up to `concurrency` heights are fetched at once in a window sliding over the
+    range, while the blocks are yielded in height order. Without an end height, the
+    stream follows the chain tip forever.
+
+    With a checkpoint store, the stream starts after the last processed height, and
+    a block is recorded as processed when the next one is requested. A block whose
+    processing was interrupted is therefore yielded again on resume.
+
+    A block whose transaction responses are not all indexed is queried again, up to
+    `MAX_BLOCK_INDEX_ATTEMPTS` times. If some are still missing (None), the block is
+    yielded anyway, but the checkpoint no longer advances, so that a resumed stream
+    fetches the block again.
+
+    :param client: Ledger client
+    :param start: first height
+    :param end: last height, defaults to following the chain tip
+    :param concurrency: max number of blocks fetched at once
+    :param checkpoint: checkpoint store of the last processed height, defaults to
+        None
+    :param poll_interval_secs: interval between polls of the chain tip, defaults to
+        the query interval of the client
+    :yields: blocks with their transactions and transaction responses
+    """
+    if checkpoint is not None:
+        processed = checkpoint.load()
+        if processed is not None:
+            start = max(start, processed + 1)
+    poll_interval_secs = (
+        poll_interval_secs
+        if poll_interval_secs is not None
+        else client._query_interval_secs  # pylint: disable=protected-access
+    )
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    window: Deque["Future[Block]"] = deque()
+    next_height = start
+    latest_height = client.query_height()
+    # no block is checkpointed after one with missing transaction responses
+    complete = True
+    try:
+        while end is None or next_height <= end or window:
+            # keep the window full with the heights already committed
+            last_height = latest_height if end is None else min(end, latest_height)
+            while len(window) < concurrency and next_height <= last_height:
+                window.append(
+                    executor.submit(
+                        _query_indexed_block, client, next_height, poll_interval_secs
+                    )
+                )
+                next_height += 1
+
+            if not window:
+                time.sleep(poll_interval_secs)
+                latest_height = client.query_height()
+                continue
+
+            block = window.popleft().result()
+            if None in (block.tx_responses or ()):
+                complete = False
+            yield block
+            if checkpoint is not None and complete:
+                checkpoint.save(block.height)
+
+            if next_height > latest_height:
+                latest_height = client.query_height()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
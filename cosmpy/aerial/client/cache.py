@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Cache of rarely changing chain queries and of transaction simulations."""
+
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from cosmpy.aerial.tx import Transaction
+from cosmpy.aerial.tx_helpers import TxResponse
+
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# time to live of the cached queries in seconds, None never expires
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "query_chain_id": None,
+    "query_node_info": 300,
+    "query_params": 60,
+    "query_consensus_params": 60,
+    "query_validators": 60,
+    "query_code_id_by_digest": None,
+}
+
+# queries whose results are dropped when a new block is observed
+DEFAULT_HEIGHT_INVALIDATED = frozenset({"query_validators"})
+
+# time to live of the cached simulations in seconds
+DEFAULT_SIMULATION_TTL = 300.0
+
+# value, expiry time and height of a cached result
+_Entry = Tuple[Any, Optional[float], int]
+
+
+class QueryCache:
+    """LRU cache of query results with a time to live per query method.
+
+    Only the methods listed in the TTLs are cached. Results of the methods which are
+    invalidated by height are dropped as soon as a new block height is observed.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        height_invalidated: Optional[Iterable[str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Init the query cache.
+
+        :param ttls: time to live in seconds by method name (None never expires),
+            defaults to DEFAULT_TTLS
+        :param max_entries: max number of cached results, least recently used first out
+        :param height_invalidated: methods invalidated by new blocks, defaults to
+            DEFAULT_HEIGHT_INVALIDATED
+        :param clock: monotonic clock in seconds
+        """
+        self._ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._max_entries = max_entries
+        self._height_invalidated = frozenset(
+            DEFAULT_HEIGHT_INVALIDATED
+            if height_invalidated is None
+            else height_invalidated
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._height = 0
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def __len__(self) -> int:
+        """Get the number of cached results.
+
+        :return: number of cached results
+        """
+        return len(self._entries)
+
+    def get_or_fetch(self, method: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Get a cached result, or fetch and cache it.
+
+        None results are not cached.
+
+        :param method: query method name
+        :param key: arguments of the query
+        :param fetch: function performing the query
+        :return: query result
+        """
+        if method not in self._ttls or self._ttls[method] == 0:
+            return fetch()
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get((method, key))
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._entries.move_to_end((method, key))
+                self.hits[method] += 1
+                return entry[0]
+            self.misses[method] += 1
+
+        value = fetch()
+        if value is None:
+            return value
+
+        ttl = self._ttls[method]
+        with self._lock:
+            self._entries[(method, key)] = (
+                value,
+                None if ttl is None else now + ttl,
+                self._height,
+            )
+            self._entries.move_to_end((method, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, method: Optional[str] = None):
+        """Drop cached results.
+
+        :param method: drop the results of this method only, defaults to all
+        """
+        with self._lock:
+            if method is None:
+                self._entries.clear()
+                return
+            for cached in [k for k in self._entries if k[0] == method]:
+                del self._entries[cached]
+
+    def observe_height(self, height: int):
+        """Invalidate the height dependent results cached before a new block.
+
+        :param height: latest block height
+        """
+        with self._lock:
+            if height <= self._height:
+                return
+            self._height = height
+            stale = [
+                k
+                for k, entry in self._entries.items()
+                if k[0] in self._height_invalidated and entry[2] < height
+            ]
+            for cached in stale:
+                del self._entries[cached]
+
+
+def _json_skeleton(value: Any) -> Hashable:
+    # the structure of a JSON value, without its scalar values
+    if isinstance(value, dict):
+        return tuple(sorted((key, _json_skeleton(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_json_skeleton(item) for item in value)
+    return type(value).__name__
+
+
+def _message_fingerprint(msg: Any) -> Hashable:
+    fields = msg.DESCRIPTOR.fields_by_name
+    # the number of coins, inputs or outputs changes the gas, their values do not
+    sizes = tuple(
+        (name, len(getattr(msg, name)))
+        for name, field in fields.items()
+        if field.label == field.LABEL_REPEATED
+    )
+    fingerprint: Tuple[Hashable, ...] = (msg.DESCRIPTOR.full_name, sizes)
+    if "contract" in fields and "msg" in fields:
+        try:
+            skeleton = _json_skeleton(json.loads(msg.msg))
+        except ValueError:
+            skeleton = None
+        fingerprint += (msg.contract, skeleton)
+    return fingerprint
+
+
+def tx_fingerprint(tx: Transaction) -> Hashable:
+    """Get the fingerprint of a transaction, equal for structurally identical ones.
+
+    Transactions with the same message types, numbers of coins or outputs, and for
+    contract messages the same contract and JSON keys, share a fingerprint whatever
+    the amounts, addresses and other values.
+
+    :param tx: transaction
+    :return: hashable fingerprint
+    """
+    return tuple(_message_fingerprint(msg) for msg in tx.msgs)
+
+
+class SimulationCache:
+    """LRU cache of the gas estimates of transactions, by fingerprint.
+
+    Structurally identical transactions (see `tx_fingerprint`) share their gas
+    estimate, so that only the first of them is simulated. Estimates expire after a
+    time to live, optionally after a number of blocks, and as soon as a transaction
+    of the same fingerprint runs out of gas.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = DEFAULT_SIMULATION_TTL,
+        max_blocks: Optional[int] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Init the simulation cache.
+
+        :param ttl: time to live of the estimates in seconds, None never expires
+        :param max_blocks: number of blocks after which the estimates are dropped,
+            defaults to None, never
+        :param max_entries: max number of cached estimates, least recently used first out
+        :param clock: monotonic clock in seconds
+        """
+        self._ttl = ttl
+        self._max_blocks = max_blocks
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._height = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached estimates.
+
+        :return: number of cached estimates
+        """
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the share of the estimates served from the cache.
+
+        :return: hit rate between 0 and 1
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, tx: Transaction) -> Optional[int]:
+        """Get the cached gas estimate of a transaction.
+
+        :param tx: transaction
+        :return: gas estimate, or None if not cached
+        """
+        key = tx_fingerprint(tx)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, tx: Transaction, gas_limit: int):
+        """Cache the gas estimate of a transaction.
+
+        :param tx: transaction
+        :param gas_limit: gas estimate
+        """
+        key = tx_fingerprint(tx)
+        expiry = None if self._ttl is None else self._clock() + self._ttl
+        with self._lock:
+            self._entries[key] = (gas_limit, expiry, self._height)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tx: Optional[Transaction] = None):
+        """Drop cached estimates.
+
+        :param tx: drop the estimate of the fingerprint of this transaction only,
+            defaults to all
+        """
+        with self._lock:
+            if tx is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tx_fingerprint(tx), None)
+
+    def observe_height(self, height: int):
+        """Drop the estimates older than the max number of blocks.
+
+        :param height: latest block height
+        """
+        with self._lock:
+            if height <= self._height:
+                return
+            self._height = height
+            if self._max_blocks is None:
+                return
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry[2] + self._max_blocks <= height
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def observe(self, tx: Transaction, response: TxResponse):
+        """Observe the outcome of a transaction.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+        if response.height > 0:
+            self.observe_height(response.height)
+        if response.code != 0 and "out of gas" in response.raw_log:
+            self.invalidate(tx)
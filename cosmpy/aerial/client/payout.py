@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Resumable bulk payouts from a single wallet."""
+
+import hashlib
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from cosmpy.aerial.client.bank import create_bank_send_msg, create_multi_send_msg
+from cosmpy.aerial.client.sequence import SequenceManager
+from cosmpy.aerial.client.tracker import TxConfirmationTracker
+from cosmpy.aerial.client.utils import fit_to_gas_limit, simulate_tx
+from cosmpy.aerial.exceptions import (
+    AccountSequenceMismatchError,
+    BroadcastError,
+    NotFoundError,
+    PayoutError,
+)
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee
+from cosmpy.aerial.tx_helpers import TxResponse
+from cosmpy.aerial.wallet import Wallet
+from cosmpy.crypto.address import Address
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_MAX_OUTPUTS = 500
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_TIMEOUT_BLOCKS = 20
+
+_BROADCAST = "broadcast"
+_CONFIRMED = "confirmed"
+
+
+@dataclass
+class PayoutResult:
+    """Outcome of a payout run."""
+
+    paid: int = 0
+    skipped: int = 0
+    tx_hashes: List[str] = field(default_factory=list)
+
+
+class PayoutEngine:
+    """Pay many recipients from a single wallet, resuming safely after a crash.
+
+    The payouts are split into chunks of at most `max_outputs` recipients, each paid
+    by one `MsgMultiSend` (or one transaction of `MsgSend` messages). The first chunk
+    is simulated once, and shortened until its gas fits the gas budget; the gas of the
+    other chunks is derived from it. Chunks are signed with locally reserved sequences
+    and up to `max_in_flight` transactions wait for confirmation at once, which are
+    followed block by block rather than one query per transaction.
+
+    Every transaction is recorded in the checkpoint file before it is broadcast,
+    together with its hash and timeout height. A resumed run only pays again the
+    chunks whose transaction failed, or which are not in a block past their timeout
+    height and so can never be included.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: "LedgerClient",  # type: ignore # noqa: F821
+        sender: Wallet,
+        denom: str,
+        checkpoint_path: str,
+        max_outputs: int = DEFAULT_MAX_OUTPUTS,
+        gas_budget: Optional[int] = None,
+        multi_send: bool = True,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout_blocks: int = DEFAULT_TIMEOUT_BLOCKS,
+        memo: Optional[str] = None,
+        sequences: Optional[SequenceManager] = None,
+        poll_interval_secs: Optional[float] = None,
+    ):
+        """Init the payout engine.
+
+        :param client: Ledger client
+        :param sender: wallet paying the recipients
+        :param denom: denom of the payouts
+        :param checkpoint_path: path of the checkpoint file
+        :param max_outputs: max number of recipients per transaction
+        :param gas_budget: max gas per transaction, defaults to the block gas limit
+        :param multi_send: whether to pay each chunk with a single `MsgMultiSend`
+            rather than one `MsgSend` per recipient
+        :param max_in_flight: max number of transactions awaiting confirmation
+        :param timeout_blocks: number of blocks after which an unconfirmed
+            transaction expires
+        :param memo: memo of the transactions, defaults to None
+        :param sequences: sequence manager of the sender, defaults to a new one
+        :param poll_interval_secs: interval between confirmation polls, defaults to
+            the query interval of the client
+        """
+        self._client = client
+        self._sender = sender
+        self._denom = denom
+        self._checkpoint_path = checkpoint_path
+        self._max_outputs = max_outputs
+        self._gas_budget = gas_budget
+        self._multi_send = multi_send
+        self._max_in_flight = max(1, max_in_flight)
+        self._timeout_blocks = timeout_blocks
+        self._memo = memo
+        self._sequences = sequences or SequenceManager(client, sender.address())
+        self._poll_interval_secs = (
+            poll_interval_secs
+            if poll_interval_secs is not None
+            else client._query_interval_secs  # pylint: disable=protected-access
+        )
+
+    def run(self, payouts: Sequence[Tuple[Union[Address, str], int]]) -> PayoutResult:
+        """Pay the recipients which are not paid yet according to the checkpoint.
+
+        Runs of the same payouts may be repeated until one completes: payouts
+        confirmed by previous runs are skipped. A `BroadcastError` of a transaction
+        rejected by the node stops the run, and its recipients stay unpaid.
+
+        :param payouts: address and amount of each payout
+        :raises PayoutError: if the checkpoint belongs to other payouts, or if some
+            transactions failed or expired. Run again to pay their recipients
+        :return: payout result
+        """
+        normalised = [
+            (str(Address(address)), int(amount)) for address, amount in payouts
+        ]
+        checkpoint = self._load_checkpoint(normalised)
+        result = PayoutResult()
+
+        self._resolve_broadcast_chunks(checkpoint)
+        if not normalised:
+            return result
+
+        if "chunk_size" not in checkpoint:
+            checkpoint["chunk_size"], checkpoint["gas_limit"] = self._fit_chunk(
+                normalised
+            )
+            self._save_checkpoint(checkpoint)
+        chunk_size = checkpoint["chunk_size"]
+        chunks = checkpoint["chunks"]
+
+        tracker = TxConfirmationTracker(
+            self._client, start_height=self._client.query_height()
+        )
+        in_flight: Dict[str, Tuple[int, int]] = {}
+        failures: List[int] = []
+        for start in range(0, len(normalised), chunk_size):
+            index = start // chunk_size
+            part = normalised[start : start + chunk_size]  # noqa: E203
+            if chunks.get(str(index), {}).get("status") == _CONFIRMED:
+                result.skipped += len(part)
+                continue
+
+            try:
+                tx_hash, timeout_height = self._pay(checkpoint, index, part, tracker)
+            except AccountSequenceMismatchError as error:
+                self._sequences.resync(error.expected_sequence)
+                tx_hash, timeout_height = self._pay(checkpoint, index, part, tracker)
+            in_flight[tx_hash] = (index, timeout_height)
+
+            self._wait(
+                checkpoint,
+                tracker,
+                in_flight,
+                self._max_in_flight - 1,
+                result,
+                failures,
+            )
+            if failures:
+                break
+
+        self._wait(checkpoint, tracker, in_flight, 0, result, failures)
+        if failures:
+            # the sequences reserved after a failed transaction may not be consumed
+            self._sequences.resync()
+            raise PayoutError(
+                f"Payout transactions of chunks {sorted(failures)} failed or expired, "
+                "run again to retry them"
+            )
+        return result
+
+    def _gas_limit(self) -> int:
+        block_limit = self._client.gas_strategy.block_gas_limit()
+        if self._gas_budget is None:
+            return block_limit
+        if block_limit < 0:
+            return self._gas_budget
+        return min(self._gas_budget, block_limit)
+
+    def _build_tx(self, part: Sequence[Tuple[str, int]]) -> Transaction:
+        tx = Transaction()
+        sender = self._sender.address()
+        if self._multi_send:
+            tx.add_message(create_multi_send_msg(sender, part, self._denom))
+        else:
+            for address, amount in part:
+                tx.add_message(
+                    create_bank_send_msg(sender, Address(address), amount, self._denom)
+                )
+        return tx
+
+    def _fit_chunk(self, payouts: Sequence[Tuple[str, int]]) -> Tuple[int, int]:
+        # nothing is in flight yet, so the queried sequence is the next one
+        account = self._client.query_account(self._sender.address())
+
+        def _estimate(count: int) -> Tuple[int, None]:
+            gas, _, _ = simulate_tx(
+                self._client,
+                self._build_tx(payouts[:count]),
+                self._sender,
+                account,
+                self._memo,
+            )
+            return gas, None
+
+        count, gas, _ = fit_to_gas_limit(
+            min(self._max_outputs, len(payouts)),
+            self._gas_limit(),
+            self._client.gas_strategy.block_gas_limit(),
+            _estimate,
+        )
+        return count, gas
+
+    def _pay(
+        self,
+        checkpoint: Dict[str, Any],
+        index: int,
+        part: Sequence[Tuple[str, int]],
+        tracker: TxConfirmationTracker,
+    ) -> Tuple[str, int]:
+        chunk_size = checkpoint["chunk_size"]
+        gas_limit = checkpoint["gas_limit"]
+        if len(part) < chunk_size:
+            gas_limit = math.ceil(gas_limit * len(part) / chunk_size)
+
+        account = self._sequences.reserve()
+        try:
+            timeout_height = self._client.query_height() + self._timeout_blocks
+            tx = self._build_tx(part)
+            tx.seal(
+                SigningCfg.direct(self._sender.public_key(), account.sequence),
+                TxFee(
+                    amount=self._client.estimate_fee_from_gas(gas_limit),
+                    gas_limit=gas_limit,
+                ),
+                self._memo,
+                timeout_height,
+            )
+            tx.sign(
+                self._sender.signer(),
+                self._client.network_config.chain_id,
+                account.number,
+            )
+            tx.complete()
+        except Exception:
+            self._sequences.release(account)
+            raise
+
+        tx_hash = hashlib.sha256(tx.tx_bytes).hexdigest().upper()
+        checkpoint["chunks"][str(index)] = {
+            "status": _BROADCAST,
+            "tx_hash": tx_hash,
+            "timeout_height": timeout_height,
+        }
+        self._save_checkpoint(checkpoint)
+
+        try:
+            submitted = self._client.broadcast_tx(tx)
+        except BroadcastError as error:
+            # rejected by the node, so the transaction can never be included
+            del checkpoint["chunks"][str(index)]
+            self._save_checkpoint(checkpoint)
+            if not isinstance(error, AccountSequenceMismatchError):
+                self._sequences.release(account)
+            raise
+
+        tracker.add(submitted)
+        return tx_hash, timeout_height
+
+    def _wait(  # pylint: disable=too-many-arguments
+        self,
+        checkpoint: Dict[str, Any],
+        tracker: TxConfirmationTracker,
+        in_flight: Dict[str, Tuple[int, int]],
+        limit: int,
+        result: PayoutResult,
+        failures: List[int],
+    ):
+        chunks = checkpoint["chunks"]
+        chunk_size = checkpoint["chunk_size"]
+        total = checkpoint["count"]
+        while len(in_flight) > limit:
+            # blocks up to this height are scanned by the poll
+            height = self._client.query_height()
+            responses: Dict[str, Optional[TxResponse]] = {
+                submitted.tx_hash.upper(): submitted.response
+                for submitted in tracker.poll()
+            }
+            for tx_hash, (index, timeout_height) in list(in_flight.items()):
+                if tx_hash not in responses and height > timeout_height:
+                    # the tracker may not have scanned the block of the transaction
+                    try:
+                        responses[tx_hash] = self._client.query_tx(tx_hash)
+                    except NotFoundError:
+                        responses[tx_hash] = None
+                if tx_hash not in responses:
+                    continue
+
+                del in_flight[tx_hash]
+                response = responses[tx_hash]
+                if response is not None and response.is_successful():
+                    chunks[str(index)]["status"] = _CONFIRMED
+                    result.paid += min(chunk_size, total - index * chunk_size)
+                    result.tx_hashes.append(tx_hash)
+                else:
+                    del chunks[str(index)]
+                    failures.append(index)
+
+            self._save_checkpoint(checkpoint)
+            if len(in_flight) > limit:
+                time.sleep(self._poll_interval_secs)
+
+    def _resolve_broadcast_chunks(self, checkpoint: Dict[str, Any]):
+        # a previous run stopped without knowing the outcome of these transactions
+        chunks = checkpoint["chunks"]
+        for index, chunk in list(chunks.items()):
+            while chunk["status"] == _BROADCAST:
+                try:
+                    response = self._client.query_tx(chunk["tx_hash"])
+                except NotFoundError:
+                    if self._client.query_height() > chunk["timeout_height"]:
+                        del chunks[index]
+                        break
+                    time.sleep(self._poll_interval_secs)
+                    continue
+
+                if response.is_successful():
+                    chunk["status"] = _CONFIRMED
+                else:
+                    del chunks[index]
+        self._save_checkpoint(checkpoint)
+
+    def _digest(self, payouts: Sequence[Tuple[str, int]]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self._sender.address()}:{self._denom}\n".encode())
+        for address, amount in payouts:
+            digest.update(f"{address}:{amount}\n".encode())
+        return digest.hexdigest()
+
+    def _load_checkpoint(self, payouts: Sequence[Tuple[str, int]]) -> Dict[str, Any]:
+        digest = self._digest(payouts)
+        if not os.path.exists(self._checkpoint_path):
+            return {
+                "version": CHECKPOINT_VERSION,
+                "digest": digest,
+                "count": len(payouts),
+                "chunks": {},
+            }
+
+        with open(self._checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise PayoutError(
+                f"Unsupported payout checkpoint version: {checkpoint.get('version')}"
+            )
+        if checkpoint.get("digest") != digest:
+            raise PayoutError(
+                f"Checkpoint {self._checkpoint_path} belongs to other payouts"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        # write then rename, so a crash never leaves a partial checkpoint
+        temporary = f"{self._checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file, indent=2)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary, self._checkpoint_path)
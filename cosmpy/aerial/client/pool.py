@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Pool of ledger endpoints with health checks and routing."""
+
+import re
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import grpc
+import requests
+
+from cosmpy.aerial.client.stubs import close_stubs
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import GetLatestBlockRequest
+
+
+DEFAULT_HEALTH_CHECK_INTERVAL_SECS = 10
+DEFAULT_MAX_HEIGHT_LAG = 5
+LATENCY_SMOOTHING = 0.3
+
+# methods which must never be sent twice
+NON_IDEMPOTENT_METHODS = frozenset({"BroadcastTx"})
+
+RETRYABLE_GRPC_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    }
+)
+_RETRYABLE_REST_RESPONSE = re.compile(r"Response: (429|502|503|504)\b")
+
+
+class RoutingStrategy(Enum):
+    """Routing strategy of the endpoint pool."""
+
+    ROUND_ROBIN = 1
+    LEAST_LATENCY = 2
+
+
+class Endpoint:
+    """Endpoint of the pool and its health."""
+
+    def __init__(self, url: str, stubs: Dict[str, Any]):
+        """Init the endpoint.
+
+        :param url: url of the endpoint
+        :param stubs: query and tx stubs of the endpoint, by service name
+        """
+        self.url = url
+        self.stubs = stubs
+        self.healthy = True
+        self.height: Optional[int] = None
+        self.latency_secs: Optional[float] = None
+
+    def record_latency(self, latency_secs: float):
+        """Update the smoothed latency of the endpoint.
+
+        :param latency_secs: latency of the last request
+        """
+        if self.latency_secs is None:
+            self.latency_secs = latency_secs
+        else:
+            self.latency_secs += LATENCY_SMOOTHING * (latency_secs - self.latency_secs)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether an error is caused by the endpoint rather than by the request.
+
+    :param error: error raised by a stub
+    :return: True if the request can be retried on another endpoint
+    """
+    if isinstance(error, grpc.RpcError):
+        return error.code() in RETRYABLE_GRPC_CODES  # type: ignore # pylint: disable=no-member
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, RuntimeError):
+        return _RETRYABLE_REST_RESPONSE.search(str(error)) is not None
+    return False
+
+
+class PooledStub:
+    """Stub dispatching the calls of a service to the endpoints of a pool."""
+
+    def __init__(self, pool: "EndpointPool", service: str):
+        """Init the pooled stub.
+
+        :param pool: endpoint pool
+        :param service: name of the service
+        """
+        self._pool = pool
+        self._service = service
+
+    def __getattr__(self, method: str) -> Callable:
+        """Get a method of the service.
+
+        :param method: method name
+        :return: method dispatched through the pool
+        """
+
+        def _call(*args, **kwargs):
+            return self._pool.call(self._service, method, *args, **kwargs)
+
+        return _call
+
+
+class EndpointPool:
+    """Pool of endpoints serving the same network.
+
+    Requests are routed to the healthy endpoints, either in turn or to the one with
+    the lowest latency. A background thread checks the latest block of every endpoint:
+    endpoints which are unreachable or lag behind the highest one are ejected until
+    they catch up again. Idempotent requests failing because of the endpoint are
+    retried on the other endpoints.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        stub_factory: Callable[[str], Dict[str, Any]],
+        routing: RoutingStrategy = RoutingStrategy.ROUND_ROBIN,
+        health_check_interval_secs: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECS,
+        max_height_lag: int = DEFAULT_MAX_HEIGHT_LAG,
+    ):
+        """Init the endpoint pool.
+
+        :param urls: urls of the endpoints
+        :param stub_factory: function creating the stubs of an endpoint, by service
+        :param routing: routing strategy
+        :param health_check_interval_secs: interval of the health checks, 0 disables
+            the background checks
+        :param max_height_lag: max number of blocks an endpoint can lag behind
+        :raises ValueError: if no url is provided
+        """
+        if not urls:
+            raise ValueError("At least one endpoint url is required")
+        self._endpoints = [Endpoint(url, stub_factory(url)) for url in urls]
+        self._routing = routing
+        self._max_height_lag = max_height_lag
+        self._lock = threading.Lock()
+        self._next_index = 0
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+        if health_check_interval_secs > 0:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                args=(health_check_interval_secs,),
+                daemon=True,
+            )
+            self._health_thread.start()
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        """Get the endpoints of the pool.
+
+        :return: endpoints
+        """
+        return list(self._endpoints)
+
+    def stub(self, service: str) -> PooledStub:
+        """Get the pooled stub of a service.
+
+        :param service: name of the service
+        :return: pooled stub
+        """
+        return PooledStub(self, service)
+
+    def close(self):
+        """Stop the health checks and close the connections of the endpoints."""
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+        for endpoint in self._endpoints:
+            close_stubs(endpoint.stubs)
+
+    def select(self, exclude: Optional[Set[str]] = None) -> Optional[Endpoint]:
+        """Select the endpoint serving the next request.
+
+        When every endpoint is ejected, the ejected ones are used rather than failing.
+
+        :param exclude: urls of the endpoints not to select
+        :return: selected endpoint, or None if all are excluded
+        """
+        exclude = exclude or set()
+        candidates = [e for e in self._endpoints if e.url not in exclude]
+        healthy = [e for e in candidates if e.healthy]
+        candidates = healthy or candidates
+        if not candidates:
+            return None
+
+        if self._routing == RoutingStrategy.LEAST_LATENCY:
+            # endpoints without a measured latency yet are ranked last
+            return min(
+                candidates,
+                key=lambda e: float("inf")
+                if e.latency_secs is None
+                else e.latency_secs,
+            )
+
+        with self._lock:
+            index = self._next_index
+            self._next_index += 1
+        return candidates[index % len(candidates)]
+
+    def call(self, service: str, method: str, *args, **kwargs) -> Any:
+        """Call a method of a service on the selected endpoint.
+
+        :param service: name of the service
+        :param method: method name
+        :param args: positional arguments of the method
+        :param kwargs: keyword arguments of the method
+        :raises Exception: the error of the last attempt, if it is not transient or no
+            endpoint is left to retry on
+        :return: result of the method
+        """
+        attempts = 1 if method in NON_IDEMPOTENT_METHODS else len(self._endpoints)
+        tried: Set[str] = set()
+        while True:
+            endpoint = self.select(tried)
+            assert endpoint is not None
+            tried.add(endpoint.url)
+
+            start = time.monotonic()
+            try:
+                result = getattr(endpoint.stubs[service], method)(*args, **kwargs)
+            except Exception as e:  # pylint: disable=broad-except
+                transient = is_transient_error(e)
+                if transient:
+                    endpoint.healthy = False
+                if not transient or len(tried) >= attempts:
+                    raise
+                continue
+            endpoint.record_latency(time.monotonic() - start)
+            return result
+
+    def check_health(self):
+        """Check the latest block of every endpoint and eject the stale ones."""
+        for endpoint in self._endpoints:
+            start = time.monotonic()
+            try:
+                resp = endpoint.stubs["tendermint"].GetLatestBlock(
+                    GetLatestBlockRequest()
+                )
+            except Exception:  # pylint: disable=broad-except
+                endpoint.height = None
+                continue
+            endpoint.record_latency(time.monotonic() - start)
+            endpoint.height = int(resp.block.header.height)
+
+        heights = [e.height for e in self._endpoints if e.height is not None]
+        best_height = max(heights, default=0)
+        for endpoint in self._endpoints:
+            endpoint.healthy = (
+                endpoint.height is not None
+                and best_height - endpoint.height <= self._max_height_lag
+            )
+
+    def _health_loop(self, interval_secs: float):
+        while not self._stop.is_set():
+            self.check_health()
+            self._stop.wait(interval_secs)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Local account sequence management."""
+
+import threading
+from typing import Optional
+
+from cosmpy.aerial.client.utils import prepare_and_broadcast_basic_transaction
+from cosmpy.aerial.exceptions import AccountSequenceMismatchError
+from cosmpy.aerial.tx import Transaction, TxFee
+from cosmpy.aerial.tx_helpers import SubmittedTx
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import Wallet
+from cosmpy.crypto.address import Address
+
+
+class SequenceManager:
+    """Hand out account sequence numbers locally for a single sender.
+
+    The account number and the next sequence are queried once and then reserved
+    locally, so several transactions from the same wallet can be broadcast within a
+    single block without querying the account for each of them. The manager resyncs
+    with the chain when a broadcast fails with an account sequence mismatch, and
+    releases the sequence of a transaction failing for any other reason.
+
+    Reservations are guarded by a lock, so a manager can be shared between threads.
+    """
+
+    def __init__(
+        self, client: "LedgerClient", address: Address  # type: ignore # noqa: F821
+    ):
+        """Init the sequence manager.
+
+        :param client: Ledger client
+        :param address: address of the sender
+        """
+        self._client = client
+        self._address = Address(address)
+        self._lock = threading.Lock()
+        self._account: Optional[Account] = None
+
+    @property
+    def address(self) -> Address:
+        """Get the address of the sender.
+
+        :return: address
+        """
+        return self._address
+
+    @property
+    def next_sequence(self) -> Optional[int]:
+        """Get the next sequence to be reserved.
+
+        :return: next sequence, or None if not synchronised yet
+        """
+        account = self._account
+        return None if account is None else account.sequence
+
+    def reset(self, account: Optional[Account] = None):
+        """Reset the local state.
+
+        :param account: account to start from, or None to query it on the next
+            reservation
+        """
+        with self._lock:
+            self._account = account
+
+    def sync(self) -> Account:
+        """Synchronise the local state with the chain.
+
+        :return: queried account
+        """
+        account = self._client.query_account(self._address)
+        self.reset(account)
+        return account
+
+    def resync(self, expected_sequence: Optional[int] = None):
+        """Recover from a sequence mismatch.
+
+        :param expected_sequence: sequence expected by the node, if known. Otherwise
+            the account is queried on the next reservation
+        """
+        with self._lock:
+            if expected_sequence is None or self._account is None:
+                self._account = None
+            else:
+                self._account.sequence = expected_sequence
+
+    def release(self, account: Account):
+        """Release a reserved sequence which was not consumed.
+
+        If no later sequence was reserved, the next reservation gets it again.
+        Otherwise the local state is kept: the later transactions are rejected with a
+        sequence mismatch, and resync with the sequence expected by the node.
+
+        :param account: account with the reserved sequence
+        """
+        with self._lock:
+            if (
+                self._account is not None
+                and self._account.sequence == account.sequence + 1
+            ):
+                self._account.sequence = account.sequence
+
+    def _adopt(self, account: Account):
+        # concurrent reservations may all query the account, only the first one wins
+        with self._lock:
+            if self._account is None:
+                self._account = account
+
+    def _take(self) -> Optional[Account]:
+        with self._lock:
+            if self._account is None:
+                return None
+            account = Account(
+                address=self._address,
+                number=self._account.number,
+                sequence=self._account.sequence,
+            )
+            self._account.sequence += 1
+            return account
+
+    def reserve(self) -> Account:
+        """Reserve the next sequence.
+
+        :return: account with the reserved sequence
+        """
+        account = self._take()
+        while account is None:
+            self._adopt(self._client.query_account(self._address))
+            account = self._take()
+        return account
+
+    def prepare_and_broadcast(
+        self,
+        tx: Transaction,
+        sender: Wallet,
+        fee: Optional[TxFee] = None,
+        memo: Optional[str] = None,
+        timeout_height: Optional[int] = None,
+    ) -> SubmittedTx:
+        """Prepare and broadcast a transaction with the next local sequence.
+
+        A transaction failing with an account sequence mismatch is signed again with
+        the sequence expected by the node and broadcast once more.
+
+        :param tx: The transaction
+        :param sender: The transaction sender
+        :param fee: The tx fee, see `prepare_basic_transaction`
+        :param memo: Transaction memo, defaults to None
+        :param timeout_height: timeout height, defaults to None
+        :return: broadcast transaction
+        """
+        try:
+            return self._prepare_and_broadcast(tx, sender, fee, memo, timeout_height)
+        except AccountSequenceMismatchError as error:
+            self.resync(error.expected_sequence)
+        return self._prepare_and_broadcast(tx, sender, fee, memo, timeout_height)
+
+    def _prepare_and_broadcast(
+        self,
+        tx: Transaction,
+        sender: Wallet,
+        fee: Optional[TxFee],
+        memo: Optional[str],
+        timeout_height: Optional[int],
+    ) -> SubmittedTx:
+        account = self.reserve()
+        try:
+            return prepare_and_broadcast_basic_transaction(
+                self._client, tx, sender, account, fee, memo, timeout_height
+            )
+        except AccountSequenceMismatchError:
+            raise
+        except Exception:
+            # the reserved sequence has not been consumed
+            self.release(account)
+            raise
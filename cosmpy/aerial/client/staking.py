@@ -22,8 +22,9 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
-from typing import List
+from typing import Any, Dict, List, Tuple
 
+from cosmpy.aerial import cast_to_int
 from cosmpy.crypto.address import Address
 from cosmpy.protos.cosmos.base.v1beta1.coin_pb2 import Coin
 from cosmpy.protos.cosmos.staking.v1beta1.tx_pb2 import (
@@ -111,6 +112,71 @@ class StakingSummary:
         return sum(map(lambda p: p.amount, self.unbonding_positions))
 
 
+def build_staking_summary(
+    delegation_pages: List[Any],
+    total_rewards_resp: Any,
+    unbonding_pages: List[Any],
+    staking_denom: str,
+) -> StakingSummary:
+    """Build the staking summary of an address from its query responses.
+
+    :param delegation_pages: pages of delegations of the address
+    :param total_rewards_resp: delegation total rewards of the address
+    :param unbonding_pages: pages of unbonding delegations of the address
+    :param staking_denom: staking denom
+    :return: staking summary
+    """
+    rewards: Dict[str, Tuple[int, Decimal]] = {}
+    for delegation_reward in total_rewards_resp.rewards:
+        for reward in delegation_reward.reward:
+            if reward.denom == staking_denom:
+                rewards[str(delegation_reward.validator_address)] = (
+                    cast_to_int(reward.amount, False),
+                    Decimal(reward.amount),
+                )
+                break
+
+    current_positions: List[StakingPosition] = []
+    for resp in delegation_pages:
+        for item in resp.delegation_responses:
+            validator = str(item.delegation.validator_address)
+            stake_reward, stake_reward_dec = rewards.get(validator, (0, Decimal(0)))
+
+            current_positions.append(
+                StakingPosition(
+                    validator=Address(validator),
+                    amount=cast_to_int(item.balance.amount, False),
+                    reward=stake_reward,
+                    reward_dec=stake_reward_dec,
+                )
+            )
+
+    unbonding_summary: Dict[str, int] = {}
+    for resp in unbonding_pages:
+        for item in resp.unbonding_responses:
+            validator = str(item.validator_address)
+            total_unbonding = unbonding_summary.get(validator, 0)
+
+            for entry in item.entries:
+                total_unbonding += cast_to_int(entry.balance, False)
+
+            unbonding_summary[validator] = total_unbonding
+
+    # build the final list of unbonding positions
+    unbonding_positions: List[UnbondingPositions] = []
+    for validator, total_unbonding in unbonding_summary.items():
+        unbonding_positions.append(
+            UnbondingPositions(
+                validator=Address(validator),
+                amount=total_unbonding,
+            )
+        )
+
+    return StakingSummary(
+        current_positions=current_positions, unbonding_positions=unbonding_positions
+    )
+
+
 def create_delegate_msg(
     delegator: Address, validator: Address, amount: int, denom: str
 ) -> MsgDelegate:
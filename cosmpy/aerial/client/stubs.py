@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Query and transaction stubs of a node."""
+
+from typing import Any, Dict, Optional
+
+import certifi
+import grpc
+
+from cosmpy.aerial.urls import Protocol, parse_url
+from cosmpy.auth.rest_client import AuthRestClient
+from cosmpy.bank.rest_client import BankRestClient
+from cosmpy.common.rest_client import RestClient
+from cosmpy.consensus.rest_client import ConsensusRestClient
+from cosmpy.cosmwasm.rest_client import CosmWasmRestClient
+from cosmpy.distribution.rest_client import DistributionRestClient
+from cosmpy.params.rest_client import ParamsRestClient
+from cosmpy.protos.cosmos.auth.v1beta1.query_pb2_grpc import QueryStub as AuthGrpcClient
+from cosmpy.protos.cosmos.bank.v1beta1.query_pb2_grpc import QueryStub as BankGrpcClient
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2_grpc import (
+    ServiceStub as TendermintQueryGrpcClient,
+)
+from cosmpy.protos.cosmos.consensus.v1.query_pb2_grpc import (
+    QueryStub as QueryConsensusGrpcClient,
+)
+from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2_grpc import (
+    QueryStub as DistributionGrpcClient,
+)
+from cosmpy.protos.cosmos.params.v1beta1.query_pb2_grpc import (
+    QueryStub as QueryParamsGrpcClient,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2_grpc import (
+    QueryStub as StakingGrpcClient,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2_grpc import ServiceStub as TxGrpcClient
+from cosmpy.protos.cosmwasm.wasm.v1.query_pb2_grpc import (
+    QueryStub as CosmWasmGrpcClient,
+)
+from cosmpy.staking.rest_client import StakingRestClient
+from cosmpy.tendermint.rest_client import (
+    CosmosBaseTendermintRestClient as TendermintRestClient,
+)
+from cosmpy.tx.rest_client import TxRestClient
+
+
+SERVICE_NAMES = (
+    "wasm",
+    "auth",
+    "txs",
+    "bank",
+    "staking",
+    "distribution",
+    "params",
+    "consensus",
+    "tendermint",
+)
+CONNECTION_KEY = "connection"
+
+
+def create_stubs(url: str, rest_pool_maxsize: Optional[int] = None) -> Dict[str, Any]:
+    """Create the stubs of the services of a node.
+
+    Besides the stubs, keyed by service name, the returned dict holds the gRPC
+    channel or the REST client under `CONNECTION_KEY`, to be closed once the stubs
+    are no longer used.
+
+    :param url: url of the node
+    :param rest_pool_maxsize: max number of pooled REST connections, defaults to the
+        requests default
+    :return: stubs by service name, and the connection
+    """
+    parsed_url = parse_url(url)
+
+    if parsed_url.protocol == Protocol.GRPC:
+        if parsed_url.secure:
+            with open(certifi.where(), "rb") as f:
+                trusted_certs = f.read()
+            credentials = grpc.ssl_channel_credentials(root_certificates=trusted_certs)
+            grpc_client = grpc.secure_channel(parsed_url.host_and_port, credentials)
+        else:
+            grpc_client = grpc.insecure_channel(parsed_url.host_and_port)
+
+        return {
+            CONNECTION_KEY: grpc_client,
+            "wasm": CosmWasmGrpcClient(grpc_client),
+            "auth": AuthGrpcClient(grpc_client),
+            "txs": TxGrpcClient(grpc_client),
+            "bank": BankGrpcClient(grpc_client),
+            "staking": StakingGrpcClient(grpc_client),
+            "distribution": DistributionGrpcClient(grpc_client),
+            "params": QueryParamsGrpcClient(grpc_client),
+            "consensus": QueryConsensusGrpcClient(grpc_client),
+            "tendermint": TendermintQueryGrpcClient(grpc_client),
+        }
+
+    rest_client = RestClient(parsed_url.rest_url, pool_maxsize=rest_pool_maxsize)
+    return {
+        CONNECTION_KEY: rest_client,
+        "wasm": CosmWasmRestClient(rest_client),
+        "auth": AuthRestClient(rest_client),
+        "txs": TxRestClient(rest_client),
+        "bank": BankRestClient(rest_client),
+        "staking": StakingRestClient(rest_client),
+        "distribution": DistributionRestClient(rest_client),
+        "params": ParamsRestClient(rest_client),
+        "consensus": ConsensusRestClient(rest_client),
+        "tendermint": TendermintRestClient(rest_client),
+    }
+
+
+def close_stubs(stubs: Dict[str, Any]):
+    """Close the connection of the stubs created by `create_stubs`.
+
+    :param stubs: stubs by service name, and the connection
+    """
+    connection = stubs.get(CONNECTION_KEY)
+    if connection is not None:
+        connection.close()
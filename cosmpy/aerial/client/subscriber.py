@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Push based transaction confirmation over the Tendermint websocket."""
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import ssl
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Union
+from urllib.parse import urlparse
+
+
+DEFAULT_CONNECT_TIMEOUT_SECS = 10
+DEFAULT_MAX_RECENT_TXS = 10_000
+TX_EVENT_QUERY = "tm.event='Tx'"
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_CONTINUATION = 0x0
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+
+class WebSocketError(Exception):
+    """Websocket connection error."""
+
+
+class _WebSocketConnection:
+    """Minimal RFC 6455 client, sufficient for the Tendermint JSON-RPC websocket."""
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        secure = parsed.scheme == "wss"
+        host = parsed.hostname or "localhost"
+        port = parsed.port or (443 if secure else 80)
+        path = parsed.path or "/websocket"
+
+        sock: Union[socket.socket, ssl.SSLSocket] = socket.create_connection(
+            (host, port), timeout=timeout
+        )
+        if secure:
+            try:
+                sock = ssl.create_default_context().wrap_socket(
+                    sock, server_hostname=host
+                )
+            except OSError:
+                sock.close()
+                raise
+        self._sock = sock
+        self._buffer = b""
+        self._send_lock = threading.Lock()
+
+        try:
+            self._handshake(host, port, path)
+        except Exception:
+            self.close()
+            raise
+
+    def settimeout(self, timeout: Optional[float]):
+        """Set the timeout of the socket operations.
+
+        :param timeout: timeout in seconds, or None to block
+        """
+        self._sock.settimeout(timeout)
+
+    def _handshake(self, host: str, port: int, path: str):
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self._sock.sendall(request.encode())
+
+        while b"\r\n\r\n" not in self._buffer:
+            self._buffer += self._recv_some()
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        if len(lines[0].split()) < 2 or lines[0].split()[1] != "101":
+            raise WebSocketError(f"Websocket upgrade rejected: {lines[0]}")
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        expected = base64.b64encode(
+            hashlib.sha1((key + _WEBSOCKET_GUID).encode()).digest()  # nosec
+        ).decode()
+        if headers.get("sec-websocket-accept") != expected:
+            raise WebSocketError("Invalid Sec-WebSocket-Accept header")
+
+    def _recv_some(self) -> bytes:
+        data = self._sock.recv(65536)
+        if not data:
+            raise WebSocketError("Connection closed")
+        return data
+
+    def _recv_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            self._buffer += self._recv_some()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            self._sock.sendall(header + mask + masked)
+
+    def _recv_frame(self):
+        first, second = self._recv_exact(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._recv_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._recv_exact(8))
+        mask = self._recv_exact(4) if second & 0x80 else None
+        payload = self._recv_exact(length)
+        if mask is not None:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def send_text(self, text: str):
+        """Send a text message.
+
+        :param text: message text
+        """
+        self._send_frame(_OPCODE_TEXT, text.encode())
+
+    def recv_text(self) -> str:
+        """Receive the next (reassembled) data message, answering pings on the way.
+
+        :raises WebSocketError: when the server closes the connection
+        :return: message text
+        """
+        message = b""
+        while True:
+            fin, opcode, payload = self._recv_frame()
+            if opcode == _OPCODE_PING:
+                self._send_frame(_OPCODE_PONG, payload)
+                continue
+            if opcode == _OPCODE_PONG:
+                continue
+            if opcode == _OPCODE_CLOSE:
+                raise WebSocketError("Connection closed by server")
+            if opcode in (_OPCODE_TEXT, _OPCODE_BINARY, _OPCODE_CONTINUATION):
+                message += payload
+            if fin:
+                return message.decode()
+
+    def close(self):
+        """Close the connection."""
+        try:
+            self._send_frame(_OPCODE_CLOSE, b"")
+        except OSError:
+            pass
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class TxEventSubscriber:
+    """Subscriber to committed transaction events of a Tendermint node.
+
+    The subscriber keeps a single websocket subscription to ``tm.event='Tx'`` open and
+    wakes up waiters as soon as their transaction hash is committed in a block. Hashes
+    seen recently are remembered, so transactions committed before a waiter registers
+    are resolved immediately.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        connect_timeout_secs: float = DEFAULT_CONNECT_TIMEOUT_SECS,
+        max_recent_txs: int = DEFAULT_MAX_RECENT_TXS,
+    ):
+        """Init the transaction event subscriber.
+
+        :param url: Tendermint RPC url, e.g. ``ws://localhost:26657/websocket`` (http(s)
+            urls are converted and the ``/websocket`` path is used by default)
+        :param connect_timeout_secs: timeout of the websocket connection attempt
+        :param max_recent_txs: number of recently committed hashes to remember
+        """
+        parsed = urlparse(url)
+        scheme = {"http": "ws", "https": "wss"}.get(parsed.scheme, parsed.scheme)
+        path = parsed.path if parsed.path not in ("", "/") else "/websocket"
+        self._url = parsed._replace(scheme=scheme, path=path).geturl()
+        self._connect_timeout_secs = connect_timeout_secs
+        self._max_recent_txs = max_recent_txs
+
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._waiters: Dict[str, Set[threading.Event]] = {}
+        self._connection: Optional[_WebSocketConnection] = None
+        self._reader: Optional[threading.Thread] = None
+        self._connected = False
+
+    @property
+    def url(self) -> str:
+        """Get the websocket url.
+
+        :return: websocket url
+        """
+        return self._url
+
+    @property
+    def connected(self) -> bool:
+        """Check whether the subscription is active.
+
+        :return: True if connected
+        """
+        return self._connected
+
+    def start(self) -> bool:
+        """Connect to the node and subscribe to transaction events.
+
+        :return: True if the subscription is active, False if the node is unreachable
+            or rejects the subscription
+        """
+        if self._connected:
+            return True
+        try:
+            connection = _WebSocketConnection(self._url, self._connect_timeout_secs)
+        except (OSError, WebSocketError):
+            return False
+
+        try:
+            connection.send_text(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "subscribe",
+                        "id": 0,
+                        "params": {"query": TX_EVENT_QUERY},
+                    }
+                )
+            )
+            # the node replies to the subscription before sending any event
+            reply: Dict[str, Any] = {}
+            while reply.get("id") != 0:
+                reply = json.loads(connection.recv_text())
+            connection.settimeout(None)
+        except (OSError, WebSocketError, ValueError):
+            # waiters keep polling the node while the subscriber is not connected
+            connection.close()
+            return False
+        if "error" in reply:
+            connection.close()
+            return False
+        self._connection = connection
+        self._connected = True
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        return True
+
+    def stop(self):
+        """Close the subscription."""
+        connection, self._connection = self._connection, None
+        self._connected = False
+        if connection is not None:
+            connection.close()
+        if self._reader is not None:
+            self._reader.join()
+            self._reader = None
+
+    def __enter__(self):
+        """Enter the context, starting the subscription.
+
+        :return: the subscriber
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context, closing the subscription.
+
+        :param args: exception details
+        """
+        self.stop()
+
+    def wait_for_tx(self, tx_hash: str, timeout_secs: float) -> bool:
+        """Block until the transaction is committed.
+
+        :param tx_hash: transaction hash
+        :param timeout_secs: maximum time to wait in seconds
+        :return: True if the transaction was committed, False on timeout or when the
+            subscription is lost
+        """
+        tx_hash = tx_hash.upper()
+        event = threading.Event()
+        with self._lock:
+            if tx_hash in self._recent:
+                return True
+            if not self._connected:
+                return False
+            self._waiters.setdefault(tx_hash, set()).add(event)
+
+        event.wait(timeout_secs)
+
+        with self._lock:
+            waiters = self._waiters.get(tx_hash)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[tx_hash]
+            return tx_hash in self._recent
+
+    def _read_loop(self):
+        connection = self._connection
+        try:
+            while connection is not None:
+                self._handle_message(connection.recv_text())
+        except (OSError, WebSocketError, ValueError):
+            if connection is not None:
+                connection.close()
+        finally:
+            with self._lock:
+                self._connected = False
+                waiters = [e for events in self._waiters.values() for e in events]
+            for event in waiters:
+                event.set()
+
+    def _handle_message(self, message: str):
+        content = json.loads(message)
+        if "error" in content:
+            # the node cancelled the subscription, e.g. of a slow client
+            raise WebSocketError(f"Subscription cancelled: {content['error']}")
+        result = content.get("result") or {}
+        for tx_hash in self._extract_tx_hashes(result):
+            self._mark_committed(tx_hash)
+
+    @staticmethod
+    def _extract_tx_hashes(result: Dict[str, Any]):
+        hashes = (result.get("events") or {}).get("tx.hash")
+        if hashes:
+            return [str(h).upper() for h in hashes]
+
+        tx_result = (result.get("data") or {}).get("value", {}).get("TxResult", {})
+        if "tx" in tx_result:
+            raw_tx = base64.b64decode(tx_result["tx"])
+            return [hashlib.sha256(raw_tx).hexdigest().upper()]
+        return []
+
+    def _mark_committed(self, tx_hash: str):
+        with self._lock:
+            self._recent[tx_hash] = None
+            self._recent.move_to_end(tx_hash)
+            while len(self._recent) > self._max_recent_txs:
+                self._recent.popitem(last=False)
+            waiters = self._waiters.pop(tx_hash, set())
+        for event in waiters:
+            event.set()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Batched confirmation of submitted transactions."""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+from cosmpy.aerial.client.utils import ensure_timedelta
+from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
+from cosmpy.aerial.tx_helpers import SubmittedTx
+
+
+class TxConfirmationTracker:
+    """Confirm many submitted transactions by following the committed blocks.
+
+    Instead of querying every pending transaction on each poll, the tracker fetches
+    each new block once and matches its transaction hashes against all the pending
+    ones. Only the transactions found in a block are then queried, so the number of
+    queries grows with the number of blocks and confirmed transactions rather than
+    with the number of pending transactions times the number of polls.
+    """
+
+    def __init__(
+        self,
+        client: "LedgerClient",  # type: ignore # noqa: F821
+        start_height: Optional[int] = None,
+    ):
+        """Init the confirmation tracker.
+
+        :param client: Ledger client
+        :param start_height: first block height to scan, defaults to the latest block
+            height when the first transaction is added
+        """
+        self._client = client
+        self._next_height = start_height
+        self._pending: Dict[str, SubmittedTx] = {}
+
+    @property
+    def pending(self) -> List[SubmittedTx]:
+        """Get the transactions which are not confirmed yet.
+
+        :return: pending transactions
+        """
+        return list(self._pending.values())
+
+    def add(self, tx: SubmittedTx) -> SubmittedTx:
+        """Track a submitted transaction.
+
+        Transactions should be added right after their broadcast, since blocks below
+        the start height of the tracker are never scanned. Once every transaction is
+        confirmed, the scan restarts from the latest block height when the next one
+        is added, rather than catching up with the blocks committed in between.
+
+        :param tx: submitted transaction
+        :return: the submitted transaction
+        """
+        if self._next_height is None:
+            self._next_height = self._client.query_height()
+        self._pending[tx.tx_hash.upper()] = tx
+        return tx
+
+    def poll(self) -> List[SubmittedTx]:
+        """Scan the blocks committed since the last poll.
+
+        :return: transactions confirmed by this poll
+        """
+        if not self._pending or self._next_height is None:
+            return []
+
+        confirmed: List[SubmittedTx] = []
+        latest_height = self._client.query_height()
+        while self._next_height <= latest_height and self._pending:
+            block = self._client.query_block(self._next_height)
+            for tx_hash in block.tx_hashes:
+                tx = self._pending.get(tx_hash.upper())
+                if tx is None:
+                    continue
+                try:
+                    tx.response = self._client.query_tx(tx.tx_hash)
+                except NotFoundError:
+                    # not indexed yet, so the block is scanned again by the next poll
+                    return confirmed
+                del self._pending[tx_hash.upper()]
+                confirmed.append(tx)
+            self._next_height += 1
+
+        if not self._pending:
+            self._next_height = None
+        return confirmed
+
+    def wait_to_complete(
+        self,
+        timeout: Optional[Union[int, float, timedelta]] = None,
+        poll_period: Optional[Union[int, float, timedelta]] = None,
+    ) -> List[SubmittedTx]:
+        """Wait for all the tracked transactions to be confirmed.
+
+        Unlike `SubmittedTx.wait_to_complete`, failed transactions do not raise: check
+        the response of each returned transaction instead.
+
+        :param timeout: timeout, defaults to the query timeout of the client
+        :param poll_period: poll_period, defaults to the query interval of the client
+        :raises QueryTimeoutError: if some transactions are still pending at timeout
+        :return: the transactions confirmed while waiting
+        """
+        timeout = (
+            ensure_timedelta(timeout)
+            if timeout
+            else timedelta(
+                seconds=self._client._query_timeout_secs  # pylint: disable=protected-access
+            )
+        )
+        poll_period = (
+            ensure_timedelta(poll_period)
+            if poll_period
+            else timedelta(
+                seconds=self._client._query_interval_secs  # pylint: disable=protected-access
+            )
+        )
+
+        start = datetime.now()
+        confirmed: List[SubmittedTx] = []
+        while True:
+            confirmed.extend(self.poll())
+            if not self._pending:
+                return confirmed
+
+            if datetime.now() - start >= timeout:
+                raise QueryTimeoutError()
+
+            time.sleep(poll_period.total_seconds())
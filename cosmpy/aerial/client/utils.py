@@ -17,8 +17,10 @@
 #
 # ------------------------------------------------------------------------------
 """Helper functions."""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import timedelta
-from typing import Any, Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple, Union
 
 from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee
 from cosmpy.aerial.tx_helpers import SubmittedTx
@@ -33,6 +35,7 @@ def simulate_tx(
     sender: Wallet,
     account: Optional[Account] = None,  # type: ignore # noqa: F821
     memo: Optional[str] = None,
+    timeout_height: Optional[int] = None,
 ) -> Tuple[int, str, Account]:  # type: ignore # noqa: F821
     """Estimate transaction fees based on either a provided amount, gas limit, or simulation.
 
@@ -41,6 +44,7 @@ def simulate_tx(
     :param sender: The transaction sender
     :param account: The account
     :param memo: Transaction memo, defaults to None
+    :param timeout_height: timeout height, defaults to None
 
     :return: Estimated gas_limit and fee amount tuple
     """
@@ -48,13 +52,15 @@ def simulate_tx(
     if account is None:
         account = client.query_account(sender.address())
 
-    # we need to build up a representative transaction so that we can accurately simulate it
+    # we need to build up a representative transaction so that we can accurately simulate it,
+    # simulation does not need it to be signed
     tx.seal(
         SigningCfg.direct(sender.public_key(), account.sequence),
         fee=TxFee([], 0),
         memo=memo,
+        timeout_height=timeout_height,
     )
-    tx.sign(sender.signer(), client.network_config.chain_id, account.number)
+    tx.add_simulation_signatures()
     tx.complete()
 
     # simulate the gas and fee for the transaction
@@ -63,6 +69,48 @@ def simulate_tx(
     return gas_limit, fee, account
 
 
+def fit_to_gas_limit(
+    count: int,
+    gas_limit: int,
+    block_gas_limit: int,
+    estimate: Callable[[int], Tuple[int, Any]],
+) -> Tuple[int, int, Any]:
+    """Find the largest number of messages, up to `count`, whose gas fits a limit.
+
+    The gas is assumed to be roughly proportional to the number of messages. Gas
+    strategies clip their estimates to the block gas limit, so an estimate reaching
+    it does not fit, since the gas actually used may be larger. A single message is
+    always accepted.
+
+    :param count: max number of messages
+    :param gas_limit: gas limit, or a negative value for no limit
+    :param block_gas_limit: block gas limit, or a negative value for no limit
+    :param estimate: estimate of the gas of a number of messages, along with any
+        result of the estimation
+    :return: number of messages, their estimated gas and the estimation result
+    """
+    lower, upper = 0, count + 1
+    best: Optional[Tuple[int, int, Any]] = None
+    while True:
+        gas, result = estimate(count)
+        clipped = 0 <= block_gas_limit <= gas
+        if gas_limit < 0 or (gas <= gas_limit and not clipped):
+            lower, best = count, (count, gas, result)
+        elif count == 1:
+            return count, gas, result
+        else:
+            upper = count
+
+        if upper - lower <= 1:
+            assert best is not None
+            return best
+        if clipped:
+            count = (lower + upper) // 2
+        else:
+            count = count * gas_limit // max(gas, 1)
+        count = min(upper - 1, max(lower + 1, count))
+
+
 def prepare_basic_transaction(
     client: "LedgerClient",  # type: ignore # noqa: F821
     tx: Transaction,
@@ -95,10 +143,11 @@ def prepare_basic_transaction(
     if account is None:
         account = client.query_account(sender.address())
 
-    if fee.gas_limit is None:
+    simulated = fee.gas_limit is None
+    if simulated:
         # Simulate transaction to get gas and amount
         fee.gas_limit, estimated_amount, _ = simulate_tx(
-            client, tx, sender, account, memo
+            client, tx, sender, account, memo, timeout_height
         )
         # Use estimated amount if not provided
         fee.amount = fee.amount or estimated_amount  # type: ignore
@@ -106,13 +155,16 @@ def prepare_basic_transaction(
     if fee.amount is None:
         fee.amount = client.estimate_fee_from_gas(fee.gas_limit)
 
-    # Build the final transaction
-    tx.seal(
-        SigningCfg.direct(sender.public_key(), account.sequence),
-        fee=fee,
-        memo=memo,
-        timeout_height=timeout_height,
-    )
+    # Build the final transaction, only the fee of a simulated one changes
+    if simulated:
+        tx.update_fee(fee)
+    else:
+        tx.seal(
+            SigningCfg.direct(sender.public_key(), account.sequence),
+            fee=fee,
+            memo=memo,
+            timeout_height=timeout_height,
+        )
 
     tx.sign(sender.signer(), client.network_config.chain_id, account.number)
     tx.complete()
@@ -163,38 +215,174 @@ def ensure_timedelta(interval: Union[int, float, timedelta]) -> timedelta:
 
 
 DEFAULT_PER_PAGE_LIMIT = None
+DEFAULT_OFFSET_PAGE_LIMIT = 100
 
 
-def get_paginated(
+def _page_request(initial_request: Any, pagination: PageRequest) -> Any:
+    request = initial_request.__class__()
+    request.CopyFrom(initial_request)
+    request.pagination.CopyFrom(pagination)
+    return request
+
+
+def iter_paginated(
     initial_request: Any,
     request_method: Callable,
     pages_limit: int = 0,
     per_page_limit: Optional[int] = DEFAULT_PER_PAGE_LIMIT,
-) -> List[Any]:
+    prefetch: bool = False,
+    concurrency: int = 1,
+    field: Optional[str] = None,
+) -> Iterator[Any]:
     """
-    Get pages for specific request.
+    Iterate over the pages of a request as they are fetched, or over their records.
+
+    Only the pages not consumed yet are held in memory. With `prefetch`, the next
+    page is fetched while the caller processes the current one. With a `concurrency`
+    greater than 1, the total count is requested with the first page and the
+    following pages are fetched by offset, up to `concurrency` at a time; if the
+    server does not report the total count, pages are fetched by key instead.
+    Offset pages of a collection modified while it is being scanned may skip or
+    repeat records.
 
     :param initial_request: request supports pagination
     :param request_method: function to perform request
     :param pages_limit: max number of pages to return. default - 0 unlimited
     :param per_page_limit: Optional int: amount of records per one page. default is None, determined by server
+        (DEFAULT_OFFSET_PAGE_LIMIT when fetching by offset)
+    :param prefetch: fetch the next page while the current one is processed
+    :param concurrency: max number of offset pages fetched concurrently
+    :param field: name of the repeated field of the responses holding the records,
+        to iterate over the records instead of the responses. default - None
 
-    :return: List of responses
+    :return: iterator of responses, or of records when a field is given
     """
-    pages: List[Any] = []
-    pagination = PageRequest(limit=per_page_limit)
+    if concurrency > 1:
+        pages = _iter_paginated_by_offset(
+            initial_request,
+            request_method,
+            pages_limit,
+            per_page_limit or DEFAULT_OFFSET_PAGE_LIMIT,
+            concurrency,
+        )
+    else:
+        pages = _iter_paginated_by_key(
+            initial_request, request_method, pages_limit, per_page_limit, prefetch
+        )
+    if field is None:
+        return pages
+    return (record for page in pages for record in getattr(page, field))
+
 
-    while pagination and (len(pages) < pages_limit or pages_limit == 0):
-        request = initial_request.__class__()
-        request.CopyFrom(initial_request)
-        request.pagination.CopyFrom(pagination)
+def _iter_paginated_by_key(
+    initial_request: Any,
+    request_method: Callable,
+    pages_limit: int,
+    per_page_limit: Optional[int],
+    prefetch: bool,
+    first_page: Optional[Any] = None,
+) -> Iterator[Any]:
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        pages = 0
+        if first_page is None:
+            resp = request_method(
+                _page_request(initial_request, PageRequest(limit=per_page_limit))
+            )
+        else:
+            resp = first_page
+
+        while True:
+            pages += 1
+            next_page: Optional[Future] = None
+            next_request = None
+            if resp.pagination.next_key and (pages < pages_limit or pages_limit == 0):
+                next_request = _page_request(
+                    initial_request,
+                    PageRequest(limit=per_page_limit, key=resp.pagination.next_key),
+                )
+                if executor is not None:
+                    next_page = executor.submit(request_method, next_request)
+
+            yield resp
+
+            if next_request is None:
+                return
+            resp = (
+                next_page.result()
+                if next_page is not None
+                else request_method(next_request)
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _iter_paginated_by_offset(
+    initial_request: Any,
+    request_method: Callable,
+    pages_limit: int,
+    per_page_limit: int,
+    concurrency: int,
+) -> Iterator[Any]:
+    first = request_method(
+        _page_request(
+            initial_request, PageRequest(limit=per_page_limit, count_total=True)
+        )
+    )
+    total = int(first.pagination.total)
+    if total == 0 and first.pagination.next_key:
+        # the server does not count the records: continue by key
+        yield from _iter_paginated_by_key(
+            initial_request, request_method, pages_limit, per_page_limit, True, first
+        )
+        return
+
+    yield first
+
+    offsets = list(range(per_page_limit, total, per_page_limit))
+    if pages_limit:
+        offsets = offsets[: pages_limit - 1]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight: Deque[Future] = deque()
+        for offset in offsets:
+            in_flight.append(
+                executor.submit(
+                    request_method,
+                    _page_request(
+                        initial_request,
+                        PageRequest(limit=per_page_limit, offset=offset),
+                    ),
+                )
+            )
+            if len(in_flight) >= concurrency:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
 
-        resp = request_method(request)
 
-        pages.append(resp)
+def get_paginated(
+    initial_request: Any,
+    request_method: Callable,
+    pages_limit: int = 0,
+    per_page_limit: Optional[int] = DEFAULT_PER_PAGE_LIMIT,
+) -> List[Any]:
+    """
+    Get pages for specific request.
 
-        pagination = None
+    :param initial_request: request supports pagination
+    :param request_method: function to perform request
+    :param pages_limit: max number of pages to return. default - 0 unlimited
+    :param per_page_limit: Optional int: amount of records per one page. default is None, determined by server
 
-        if resp.pagination.next_key:
-            pagination = PageRequest(limit=per_page_limit, key=resp.pagination.next_key)
-    return pages
+    :return: List of responses
+    """
+    return list(
+        iter_paginated(
+            initial_request,
+            request_method,
+            pages_limit=pages_limit,
+            per_page_limit=per_page_limit,
+        )
+    )
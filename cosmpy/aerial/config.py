@@ -20,8 +20,8 @@
 """Network configurations."""
 
 import warnings
-from dataclasses import dataclass
-from typing import Optional, Union
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
 
 
 class NetworkConfigError(RuntimeError):
@@ -53,6 +53,15 @@ class NetworkConfig:
     staking_denomination: str
     url: str
     faucet_url: Optional[str] = None
+    additional_urls: List[str] = field(default_factory=list)
+
+    @property
+    def urls(self) -> List[str]:
+        """Get all the endpoint urls of the network.
+
+        :return: the main url followed by the additional urls
+        """
+        return [self.url] + list(self.additional_urls)
 
     def validate(self):
         """Validate the network configuration.
@@ -63,18 +72,19 @@ class NetworkConfig:
             raise NetworkConfigError("Chain id must be set")
         if self.url == "":
             raise NetworkConfigError("URL must be set")
-        if not any(
-            map(
-                lambda x: self.url.startswith(  # noqa: # pylint: disable=unnecessary-lambda
-                    x
-                ),
-                URL_PREFIXES,
-            )
-        ):
-            prefix_list = ", ".join(map(lambda x: f'"{x}"', URL_PREFIXES))
-            raise NetworkConfigError(
-                f"URL must start with one of the following prefixes: {prefix_list}"
-            )
+        for url in self.urls:
+            if not any(
+                map(
+                    lambda x: url.startswith(  # noqa: # pylint: disable=unnecessary-lambda,cell-var-from-loop
+                        x
+                    ),
+                    URL_PREFIXES,
+                )
+            ):
+                prefix_list = ", ".join(map(lambda x: f'"{x}"', URL_PREFIXES))
+                raise NetworkConfigError(
+                    f"URL must start with one of the following prefixes: {prefix_list}"
+                )
 
     @classmethod
     def fetchai_dorado_testnet(cls) -> "NetworkConfig":
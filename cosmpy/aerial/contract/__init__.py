@@ -477,6 +477,16 @@ class LedgerContract(UserString):
         return json.loads(resp.data)
 
     def _find_contract_id_by_digest(self, digest: bytes) -> Optional[int]:
+        query_cache = getattr(self._client, "query_cache", None)
+        if query_cache is None:
+            return self._scan_contract_id_by_digest(digest)
+        return query_cache.get_or_fetch(
+            "query_code_id_by_digest",
+            digest,
+            lambda: self._scan_contract_id_by_digest(digest),
+        )
+
+    def _scan_contract_id_by_digest(self, digest: bytes) -> Optional[int]:
         code_id = None
 
         pagination = None
@@ -76,3 +76,21 @@ class InsufficientFeesError(BroadcastError):
             tx_hash,
             f"Insufficient Fees (minimum required: {self.minimum_required_fee})",
         )
+
+
+class AccountSequenceMismatchError(BroadcastError):
+    """Account sequence mismatch Error."""
+
+    def __init__(self, tx_hash: str, expected_sequence: int, message: str):
+        """Initialize.
+
+        :param tx_hash: transaction hash
+        :param expected_sequence: sequence expected by the node
+        :param message: message
+        """
+        self.expected_sequence = expected_sequence
+        super().__init__(tx_hash, message)
+
+
+class PayoutError(RuntimeError):
+    """Payout Error."""
@@ -19,10 +19,18 @@
 
 """Transaction gas strategy."""
 
+import json
+import math
+import os
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 from cosmpy.aerial.tx import Transaction
+from cosmpy.aerial.tx_helpers import TxResponse
 
 
 class GasStrategy(ABC):
@@ -43,6 +51,13 @@ class GasStrategy(ABC):
         :return: None
         """
 
+    def observe(self, tx: Transaction, response: TxResponse):  # noqa: B027
+        """Observe the outcome of a transaction, to learn from it.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+
     def _clip_gas(self, value: int) -> int:
         block_limit = self.block_gas_limit()
         if block_limit < 0:
@@ -173,3 +188,206 @@ class OfflineMessageTableStrategy(GasStrategy):
         :return: block gas limit
         """
         return self._block_limit
+
+
+EXECUTE_CONTRACT_MSG = "cosmwasm.wasm.v1.MsgExecuteContract"
+
+
+def _message_key(msg: Any) -> str:
+    name = msg.DESCRIPTOR.full_name
+    # the number of coins, inputs or outputs changes the gas, their values do not
+    sizes = ",".join(
+        f"{field_name}={len(getattr(msg, field_name))}"
+        for field_name, field in msg.DESCRIPTOR.fields_by_name.items()
+        if field.label == field.LABEL_REPEATED and len(getattr(msg, field_name))
+    )
+    if sizes:
+        name = f"{name}({sizes})"
+    if msg.DESCRIPTOR.full_name != EXECUTE_CONTRACT_MSG:
+        return name
+
+    # the gas of a contract execution depends on the contract and its method
+    try:
+        payload = json.loads(msg.msg)
+    except ValueError:
+        payload = None
+    method = next(iter(payload)) if isinstance(payload, dict) and payload else ""
+    return f"{name}:{msg.contract}:{method}"
+
+
+def tx_shape(tx: Transaction) -> str:
+    """Get the shape of a transaction, the key of its learnt gas usage.
+
+    The shape is the sequence of its message types, with the sizes of their
+    non-empty repeated fields, e.g. the number of outputs of a multi send, and with
+    the contract address and the executed method for contract executions.
+
+    :param tx: transaction
+    :return: transaction shape
+    """
+    return " + ".join(_message_key(msg) for msg in tx.msgs)
+
+
+class AdaptiveGasStrategy(SimulationGasStrategy):
+    """Gas strategy learning the gas used by each transaction shape.
+
+    The gas used by confirmed transactions is recorded per transaction shape (see
+    `tx_shape`), and the estimate of a known shape is a quantile of its recent
+    samples, with a safety margin. Transactions are only simulated for unseen
+    shapes, and after a transaction of their shape ran out of gas.
+
+    The strategy learns from the transactions broadcast by its client once their
+    response is known, for example by `SubmittedTx.wait_to_complete`.
+
+    :param SimulationGasStrategy: simulation gas strategy
+    """
+
+    DEFAULT_QUANTILE = 0.95
+    DEFAULT_MARGIN = 1.2
+    DEFAULT_WINDOW = 100
+    DEFAULT_AUTOSAVE_INTERVAL_SECS = 10.0
+    FILE_VERSION = 1
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: "LedgerClient",  # type: ignore # noqa: F821
+        multiplier: Optional[float] = None,
+        quantile: float = DEFAULT_QUANTILE,
+        margin: float = DEFAULT_MARGIN,
+        window: int = DEFAULT_WINDOW,
+        path: Optional[str] = None,
+        autosave_interval_secs: float = DEFAULT_AUTOSAVE_INTERVAL_SECS,
+    ):
+        """Init the adaptive gas strategy.
+
+        :param client: Ledger client
+        :param multiplier: multiplier of simulated gas, defaults to None
+        :param quantile: quantile of the samples used as estimate
+        :param margin: multiplier of the quantile
+        :param window: number of recent samples kept per shape
+        :param path: JSON file the learnt samples are loaded from and saved to,
+            defaults to keeping them in memory only
+        :param autosave_interval_secs: min interval between the automatic saves to
+            the path. Call `save` to write the latest samples, e.g. before exiting
+        """
+        super().__init__(client, multiplier)
+        self._quantile = quantile
+        self._margin = margin
+        self._window = window
+        self._path = path
+        self._autosave_interval_secs = autosave_interval_secs
+        self._last_save_time = float("-inf")
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[int]] = {}
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def estimate_gas(self, tx: Transaction) -> int:
+        """Get estimated transaction gas.
+
+        :param tx: transaction
+        :return: Estimated transaction gas
+        """
+        shape = tx_shape(tx)
+        with self._lock:
+            samples = sorted(self._samples.get(shape, ()))
+        if not samples:
+            gas_used = self._client.simulate_tx(tx)
+            self._add_sample(shape, gas_used)
+            return self._clip_gas(int(gas_used * self._multiplier))
+
+        rank = min(
+            len(samples) - 1, max(0, math.ceil(self._quantile * len(samples)) - 1)
+        )
+        return self._clip_gas(math.ceil(samples[rank] * self._margin))
+
+    def observe(self, tx: Transaction, response: TxResponse):
+        """Learn the gas used by a transaction.
+
+        Running out of gas drops the samples of the transaction shape, so that the
+        next transaction of this shape is simulated. Transactions failing for other
+        reasons may stop early, so their gas is not learnt.
+
+        :param tx: transaction, as broadcast
+        :param response: response of the transaction
+        """
+        shape = tx_shape(tx)
+        if response.code != 0 and "out of gas" in response.raw_log:
+            with self._lock:
+                self._samples.pop(shape, None)
+            self._autosave()
+        elif response.code == 0 and response.gas_used > 0:
+            self._add_sample(shape, response.gas_used)
+
+    def samples(self, tx: Transaction) -> List[int]:
+        """Get the recent gas samples of the shape of a transaction.
+
+        :param tx: transaction
+        :return: gas used by recent transactions of the same shape
+        """
+        with self._lock:
+            return list(self._samples.get(tx_shape(tx), ()))
+
+    def save(self, path: Optional[str] = None):
+        """Save the learnt samples to a JSON file.
+
+        :param path: file path, defaults to the path of the strategy
+        :raises ValueError: if no path is given
+        """
+        path = path or self._path
+        if path is None:
+            raise ValueError("No path to save the gas samples to")
+        with self._lock:
+            content = {
+                "version": self.FILE_VERSION,
+                "samples": {shape: list(s) for shape, s in self._samples.items()},
+            }
+            # replaced atomically, so that a crash never leaves a truncated file,
+            # and under the lock so that an older snapshot never replaces a newer one
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f"{os.path.basename(path)}.",
+                suffix=".tmp",
+                dir=os.path.dirname(os.path.abspath(path)),
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(content, file)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._last_save_time = time.monotonic()
+
+    def load(self, path: str):
+        """Load learnt samples from a JSON file, replacing the current ones.
+
+        :param path: file path
+        :raises ValueError: if the file version is not supported
+        """
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+        if content.get("version") != self.FILE_VERSION:
+            raise ValueError(
+                f"Unsupported gas samples version {content.get('version')}"
+            )
+        with self._lock:
+            self._samples = {
+                shape: deque((int(v) for v in values), maxlen=self._window)
+                for shape, values in content["samples"].items()
+            }
+
+    def _add_sample(self, shape: str, gas_used: int):
+        with self._lock:
+            samples = self._samples.get(shape)
+            if samples is None:
+                samples = self._samples[shape] = deque(maxlen=self._window)
+            samples.append(int(gas_used))
+        self._autosave()
+
+    def _autosave(self):
+        if self._path is None:
+            return
+        with self._lock:
+            elapsed = time.monotonic() - self._last_save_time
+        if elapsed >= self._autosave_interval_secs:
+            self.save()
@@ -21,7 +21,8 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, List, Optional, Union
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 from google.protobuf.any_pb2 import Any as ProtoAny
 
@@ -39,9 +40,13 @@ from cosmpy.protos.cosmos.tx.v1beta1.tx_pb2 import (
     SignerInfo,
     Tx,
     TxBody,
+    TxRaw,
 )
 
 
+SECP256K1_PUBKEY_TYPE_URL = "/cosmos.crypto.secp256k1.PubKey"
+
+
 @dataclass
 class TxFee:
     """Cosmos SDK TxFee abstraction.
@@ -149,15 +154,15 @@ def _wrap_in_proto_any(values: List[Any]) -> List[ProtoAny]:
     return any_values
 
 
-def _create_proto_public_key(public_key: PublicKey) -> ProtoAny:
+@lru_cache(maxsize=1024)
+def _signer_info_template(public_key_bytes: bytes) -> SignerInfo:
+    # shared between transactions, must be copied before being modified
     proto_public_key = ProtoAny()
-    proto_public_key.Pack(
-        ProtoPubKey(
-            key=public_key.public_key_bytes,
-        ),
-        type_url_prefix="/",
+    proto_public_key.Pack(ProtoPubKey(key=public_key_bytes), type_url_prefix="/")
+    return SignerInfo(
+        public_key=proto_public_key,
+        mode_info=ModeInfo(single=ModeInfo.Single(mode=SignMode.SIGN_MODE_DIRECT)),
     )
-    return proto_public_key
 
 
 class SigningMode(Enum):
@@ -202,6 +207,8 @@ class Transaction:
         self._tx_body: Optional[TxBody] = None
         self._tx = None
         self._fee = None
+        self._body_bytes = b""
+        self._auth_info_bytes = b""
 
     @property  # noqa
     def state(self) -> TxState:
@@ -227,6 +234,45 @@ class Transaction:
         """
         return self._fee
 
+    @property
+    def body_bytes(self) -> bytes:
+        """Get the serialized transaction body, as signed.
+
+        :raises RuntimeError: If the transaction has not been sealed.
+        :return: body bytes
+        """
+        if self._state == TxState.Draft:
+            raise RuntimeError("The transaction has not been sealed")
+        return self._body_bytes
+
+    @property
+    def auth_info_bytes(self) -> bytes:
+        """Get the serialized transaction auth info, as signed.
+
+        :raises RuntimeError: If the transaction has not been sealed.
+        :return: auth info bytes
+        """
+        if self._state == TxState.Draft:
+            raise RuntimeError("The transaction has not been sealed")
+        return self._auth_info_bytes
+
+    @property
+    def tx_bytes(self) -> bytes:
+        """Get the serialized transaction, ready for simulation or broadcast.
+
+        The body and auth info serialized when the transaction was sealed are reused.
+
+        :raises RuntimeError: If the transaction has not been completed.
+        :return: serialized TxRaw, identical to the serialized Tx
+        """
+        if self._state != TxState.Final:
+            raise RuntimeError("The transaction has not been completed")
+        return TxRaw(
+            body_bytes=self._body_bytes,
+            auth_info_bytes=self._auth_info_bytes,
+            signatures=self._tx.signatures,
+        ).SerializeToString()
+
     @property
     def tx(self):
         """Initialize.
@@ -277,15 +323,12 @@ class Transaction:
         for signing_cfg in input_signing_cfgs:
             assert signing_cfg.mode == SigningMode.Direct
 
-            signer_infos.append(
-                SignerInfo(
-                    public_key=_create_proto_public_key(signing_cfg.public_key),
-                    mode_info=ModeInfo(
-                        single=ModeInfo.Single(mode=SignMode.SIGN_MODE_DIRECT)
-                    ),
-                    sequence=signing_cfg.sequence_num,
-                )
+            signer_info = SignerInfo()
+            signer_info.CopyFrom(
+                _signer_info_template(signing_cfg.public_key.public_key_bytes)
             )
+            signer_info.sequence = signing_cfg.sequence_num
+            signer_infos.append(signer_info)
 
         self._fee = fee
 
@@ -303,6 +346,66 @@ class Transaction:
         )  # pylint: disable=E1101
 
         self._tx = Tx(body=self._tx_body, auth_info=auth_info)
+        self._body_bytes = self._tx_body.SerializeToString()
+        self._auth_info_bytes = auth_info.SerializeToString()
+        return self
+
+    def update_fee(self, fee: TxFee) -> "Transaction":
+        """Replace the fee of a sealed or simulated transaction.
+
+        Only the auth info is serialized again, the body is kept as sealed. The
+        signatures are dropped, and the transaction must be signed again.
+
+        :param fee: transaction fee class
+        :raises RuntimeError: If the transaction has not been sealed
+        :return: sealed transaction
+        """
+        if self._state == TxState.Draft:
+            raise RuntimeError("The transaction has not been sealed")
+
+        self._state = TxState.Sealed
+        self._fee = fee
+        self._tx.auth_info.fee.CopyFrom(fee.to_proto())
+        del self._tx.signatures[:]
+        self._auth_info_bytes = self._tx.auth_info.SerializeToString()
+        return self
+
+    def add_simulation_signatures(self) -> "Transaction":
+        """Add an empty signature for each signer, instead of signing.
+
+        Simulation does not verify signatures and accounts for the size of the
+        missing ones, so a sealed transaction can be simulated without signing it.
+        Such a transaction is rejected by broadcast.
+
+        :raises RuntimeError: If transaction is not sealed
+        :return: transaction with empty signatures
+        """
+        if self.state != TxState.Sealed:
+            raise RuntimeError(
+                "Transaction is not sealed. It must be sealed before signing is possible."
+            )
+        self._tx.signatures.extend([b""] * len(self._tx.auth_info.signer_infos))
+        return self
+
+    def add_signatures(self, signatures: Sequence[bytes]) -> "Transaction":
+        """Add signatures computed elsewhere, e.g. by a batch signer.
+
+        The signatures must sign the body and auth info bytes of the transaction as
+        sealed, in the order of the signers.
+
+        :param signatures: signatures of the next signers
+        :raises RuntimeError: If transaction is not sealed
+        :raises ValueError: If there are more signatures than signers
+        :return: signed transaction
+        """
+        if self.state != TxState.Sealed:
+            raise RuntimeError(
+                "Transaction is not sealed. It must be sealed before signing is possible."
+            )
+        signers = len(self._tx.auth_info.signer_infos)
+        if len(self._tx.signatures) + len(signatures) > signers:
+            raise ValueError(f"Transaction has only {signers} signers")
+        self._tx.signatures.extend(signatures)
         return self
 
     def sign(
@@ -327,8 +430,8 @@ class Transaction:
             )
 
         sd = SignDoc()
-        sd.body_bytes = self._tx.body.SerializeToString()
-        sd.auth_info_bytes = self._tx.auth_info.SerializeToString()
+        sd.body_bytes = self._body_bytes
+        sd.auth_info_bytes = self._auth_info_bytes
         sd.chain_id = chain_id
         sd.account_number = account_number
 
@@ -350,3 +453,49 @@ class Transaction:
         """
         self._state = TxState.Final
         return self
+
+
+def tx_signature_items(
+    tx_bytes: bytes, chain_id: str, account_numbers: Sequence[int]
+) -> List[Tuple[bytes, bytes, bytes]]:
+    """Rebuild the signed documents of a serialized transaction.
+
+    The body and auth info bytes are used as found in the transaction, so the
+    documents are identical to the ones which were signed.
+
+    :param tx_bytes: serialized transaction, as found in a block
+    :param chain_id: chain id
+    :param account_numbers: account number of each signer, in order
+    :raises ValueError: if a signer does not use a secp256k1 key in direct mode, or
+        the number of signers, signatures and account numbers differ
+    :return: public key bytes, sign doc bytes and signature of each signer, ready for
+        `cosmpy.crypto.batch_verify.verify_batch`
+    """
+    tx_raw = TxRaw.FromString(tx_bytes)
+    auth_info = AuthInfo.FromString(tx_raw.auth_info_bytes)
+    signer_infos = auth_info.signer_infos
+    if not len(signer_infos) == len(tx_raw.signatures) == len(account_numbers):
+        raise ValueError(
+            f"Transaction has {len(signer_infos)} signers and {len(tx_raw.signatures)} signatures, got {len(account_numbers)} account numbers"
+        )
+
+    items = []
+    for signer_info, signature, account_number in zip(
+        signer_infos, tx_raw.signatures, account_numbers
+    ):
+        if (
+            signer_info.public_key.type_url != SECP256K1_PUBKEY_TYPE_URL
+            or signer_info.mode_info.single.mode != SignMode.SIGN_MODE_DIRECT
+        ):
+            raise ValueError("Only secp256k1 signers in direct mode are supported")
+
+        public_key = ProtoPubKey()
+        signer_info.public_key.Unpack(public_key)
+        sign_doc = SignDoc(
+            body_bytes=tx_raw.body_bytes,
+            auth_info_bytes=tx_raw.auth_info_bytes,
+            chain_id=chain_id,
+            account_number=account_number,
+        )
+        items.append((public_key.key, sign_doc.SerializeToString(), signature))
+    return items
@@ -22,13 +22,17 @@
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from dateutil.parser import isoparse
 
 from cosmpy.aerial.exceptions import (
+    AccountSequenceMismatchError,
     BroadcastError,
     InsufficientFeesError,
     OutOfGasError,
 )
+from cosmpy.aerial.tx import Transaction
 from cosmpy.crypto.address import Address
 
 
@@ -72,6 +76,7 @@ class TxResponse:
 
         :raises OutOfGasError: Out of gas error
         :raises InsufficientFeesError: Insufficient fees
+        :raises AccountSequenceMismatchError: Account sequence mismatch
         :raises BroadcastError: Broadcast Exception
         """
         if self.code != 0:
@@ -94,23 +99,321 @@ class TxResponse:
                 else:
                     required_fee = f"more than {self.gas_wanted}"
                 raise InsufficientFeesError(self.hash, required_fee)
+            if "account sequence mismatch" in self.raw_log:
+                match = re.search(r"expected\s*(\d+)", self.raw_log)
+                if match is not None:
+                    raise AccountSequenceMismatchError(
+                        self.hash, int(match.group(1)), self.raw_log
+                    )
             raise BroadcastError(self.hash, self.raw_log)
 
 
+class Event:
+    """Event of a transaction, whose attributes are decoded on first access."""
+
+    __slots__ = ("_proto", "_attributes")
+
+    def __init__(self, proto: Any):
+        """Init the event.
+
+        :param proto: event proto
+        """
+        self._proto = proto
+        self._attributes: Optional[List[Tuple[str, str]]] = None
+
+    @property
+    def type(self) -> str:
+        """Get the event type.
+
+        :return: event type
+        """
+        return str(self._proto.type)
+
+    @property
+    def attributes(self) -> List[Tuple[str, str]]:
+        """Get the attributes of the event, in order.
+
+        :return: keys and values of the attributes
+        """
+        if self._attributes is None:
+            self._attributes = [
+                (safe_decode(attribute.key), safe_decode(attribute.value))
+                for attribute in self._proto.attributes
+            ]
+        return self._attributes
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the value of the first attribute with a key.
+
+        :param key: attribute key
+        :param default: value if the event has no such attribute
+        :return: attribute value
+        """
+        for attribute_key, value in self.attributes:
+            if attribute_key == key:
+                return value
+        return default
+
+    def __repr__(self) -> str:
+        """Get the representation of the event.
+
+        :return: representation
+        """
+        return f"Event(type={self.type!r}, attributes={self.attributes!r})"
+
+
+class EventMultiMap:
+    """Ordered events of a transaction, looked up by type and attribute.
+
+    Unlike the merged dictionary of `TxResponse.events`, repeated events of the
+    same type, such as the transfers of a multi-message transaction, are all kept.
+    The index by type is built on the first lookup.
+    """
+
+    def __init__(self, events: Any):
+        """Init the event multi-map.
+
+        :param events: sequence of event protos, which is not copied
+        """
+        self._protos = events
+        self._events: Optional[List[Event]] = None
+        self._by_type: Optional[Dict[str, List[Event]]] = None
+
+    def _all(self) -> List[Event]:
+        if self._events is None:
+            self._events = [Event(proto) for proto in self._protos]
+        return self._events
+
+    def __len__(self) -> int:
+        """Get the number of events.
+
+        :return: number of events
+        """
+        return len(self._protos)
+
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate over the events, in order.
+
+        :return: iterator of events
+        """
+        return iter(self._all())
+
+    def __getitem__(self, index: int) -> Event:
+        """Get an event by position.
+
+        :param index: position of the event
+        :return: event
+        """
+        return self._all()[index]
+
+    def types(self) -> List[str]:
+        """Get the event types, in order of first occurrence.
+
+        :return: event types
+        """
+        if self._by_type is None:
+            self._index()
+        assert self._by_type is not None
+        return list(self._by_type)
+
+    def by_type(self, event_type: str) -> List[Event]:
+        """Get the events of a type, in order.
+
+        :param event_type: event type
+        :return: events
+        """
+        if self._by_type is None:
+            self._index()
+        assert self._by_type is not None
+        return self._by_type.get(event_type, [])
+
+    def values(self, event_type: str, key: str) -> List[str]:
+        """Get the values of an attribute in all the events of a type.
+
+        :param event_type: event type
+        :param key: attribute key
+        :return: attribute values, in order
+        """
+        return [
+            value
+            for event in self.by_type(event_type)
+            for attribute_key, value in event.attributes
+            if attribute_key == key
+        ]
+
+    def first(
+        self, event_type: str, key: str, default: Optional[str] = None
+    ) -> Optional[str]:
+        """Get the first value of an attribute in the events of a type.
+
+        :param event_type: event type
+        :param key: attribute key
+        :param default: value if no event has such an attribute
+        :return: attribute value
+        """
+        for event in self.by_type(event_type):
+            value = event.get(key)
+            if value is not None:
+                return value
+        return default
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        """Merge the events of each type into one dictionary, later values winning.
+
+        :return: attributes by event type
+        """
+        merged: Dict[str, Dict[str, str]] = {}
+        for event in self._all():
+            merged.setdefault(event.type, {}).update(event.attributes)
+        return merged
+
+    def _index(self):
+        by_type: Dict[str, List[Event]] = {}
+        for event in self._all():
+            by_type.setdefault(event.type, []).append(event)
+        self._by_type = by_type
+
+
+class LazyTxResponse(TxResponse):
+    """Transaction response backed by its proto.
+
+    The scalar fields are read upfront, while the logs, events and timestamp are
+    only parsed when accessed, so that checking the code of many transactions stays
+    cheap.
+    """
+
+    def __init__(self, proto: Any):  # pylint: disable=super-init-not-called
+        """Init the transaction response.
+
+        :param proto: transaction response proto
+        """
+        self.hash = str(proto.txhash)
+        self.height = int(proto.height)
+        self.code = int(proto.code)
+        self.gas_wanted = int(proto.gas_wanted)
+        self.gas_used = int(proto.gas_used)
+        self.raw_log = str(proto.raw_log)
+        self._proto = proto
+        self._logs: Optional[List[MessageLog]] = None
+        self._events: Optional[Dict[str, Dict[str, str]]] = None
+        self._event_map: Optional[EventMultiMap] = None
+        self._timestamp: Optional[datetime] = None
+        self._timestamp_parsed = False
+
+    @property
+    def proto(self) -> Any:
+        """Get the transaction response proto.
+
+        :return: proto
+        """
+        return self._proto
+
+    @property  # type: ignore[override]
+    def logs(self) -> List[MessageLog]:
+        """Get the message logs.
+
+        :return: message logs
+        """
+        if self._logs is None:
+            self._logs = [
+                MessageLog(
+                    index=int(log_data.msg_index),
+                    log=log_data.msg_index,
+                    events={
+                        event.type: {a.key: a.value for a in event.attributes}
+                        for event in log_data.events
+                    },
+                )
+                for log_data in self._proto.logs
+            ]
+        return self._logs
+
+    @logs.setter
+    def logs(self, logs: List[MessageLog]):
+        """Set the message logs.
+
+        :param logs: message logs
+        """
+        self._logs = logs
+
+    @property
+    def event_map(self) -> EventMultiMap:
+        """Get the events, in order and without merging the ones of a type.
+
+        :return: event multi-map
+        """
+        if self._event_map is None:
+            self._event_map = EventMultiMap(self._proto.events)
+        return self._event_map
+
+    @property  # type: ignore[override]
+    def events(self) -> Dict[str, Dict[str, str]]:
+        """Get the attributes of the events, merged by event type.
+
+        :return: attributes by event type
+        """
+        if self._events is None:
+            self._events = self.event_map.to_dict()
+        return self._events
+
+    @events.setter
+    def events(self, events: Dict[str, Dict[str, str]]):
+        """Set the attributes of the events.
+
+        :param events: attributes by event type
+        """
+        self._events = events
+
+    @property  # type: ignore[override]
+    def timestamp(self) -> Optional[datetime]:
+        """Get the block timestamp of the transaction.
+
+        :return: timestamp, if known
+        """
+        if not self._timestamp_parsed:
+            if self._proto.timestamp:
+                self._timestamp = isoparse(self._proto.timestamp)
+            self._timestamp_parsed = True
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: Optional[datetime]):
+        """Set the block timestamp of the transaction.
+
+        :param timestamp: timestamp
+        """
+        self._timestamp = timestamp
+        self._timestamp_parsed = True
+
+
 class SubmittedTx:
     """Submitted transaction."""
 
     def __init__(
-        self, client: "LedgerClient", tx_hash: str  # type: ignore # noqa: F821
+        self,
+        client: "LedgerClient",  # type: ignore # noqa: F821
+        tx_hash: str,
+        tx: Optional[Transaction] = None,
     ):
         """Init the Submitted transaction.
 
         :param client: Ledger client
         :param tx_hash: transaction hash
+        :param tx: broadcast transaction, whose outcome the client learns from,
+            defaults to None
         """
         self._client = client
         self._response: Optional[TxResponse] = None
         self._tx_hash = str(tx_hash)
+        self._tx = tx
+
+    @property
+    def tx(self) -> Optional[Transaction]:
+        """Get the broadcast transaction.
+
+        :return: transaction, if known
+        """
+        return self._tx
 
     @property
     def tx_hash(self) -> str:
@@ -128,6 +431,16 @@ class SubmittedTx:
         """
         return self._response
 
+    @response.setter
+    def response(self, response: TxResponse):
+        """Set the transaction response, once the transaction has been confirmed.
+
+        :param response: response
+        """
+        self._response = response
+        if self._tx is not None:
+            self._client.observe_tx_response(self._tx, response)
+
     @property
     def contract_code_id(self) -> Optional[int]:
         """Get the contract code id.
@@ -172,7 +485,7 @@ class SubmittedTx:
 
         :return: Submitted Transaction
         """
-        self._response = self._client.wait_for_query_tx(
+        self.response = self._client.wait_for_query_tx(
             self.tx_hash, timeout=timeout, poll_period=poll_period
         )
         assert self._response is not None
@@ -22,7 +22,7 @@
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, List
+from typing import Any, List, Optional
 
 from google.protobuf.timestamp_pb2 import Timestamp
 from packaging.version import Version
@@ -57,6 +57,9 @@ class Block:
     time: datetime
     chain_id: str
     tx_hashes: List[str]
+    # only set by `LedgerClient.query_block_with_txs`
+    txs: Optional[List[Any]] = None
+    tx_responses: Optional[List[Any]] = None
 
     @staticmethod
     def from_proto(block: Any) -> "Block":
@@ -129,13 +129,14 @@ class LocalWallet(Wallet):
         self._private_key = private_key
         self._public_key = private_key.public_key
         self._prefix = prefix
+        self._address = Address(self._public_key, self._prefix)
 
     def address(self) -> Address:
         """Get the wallet address.
 
         :return: Wallet address.
         """
-        return Address(self._public_key, self._prefix)
+        return self._address
 
     def public_key(self) -> PublicKey:
         """Get the public key of the wallet.
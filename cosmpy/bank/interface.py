@@ -20,6 +20,7 @@
 """Interface for the Bank functionality of CosmosSDK."""
 
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
 
 from cosmpy.protos.cosmos.bank.v1beta1.query_pb2 import (
     QueryAllBalancesRequest,
@@ -43,21 +44,31 @@ class Bank(ABC):
     """Bank abstract class."""
 
     @abstractmethod
-    def Balance(self, request: QueryBalanceRequest) -> QueryBalanceResponse:
+    def Balance(
+        self,
+        request: QueryBalanceRequest,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> QueryBalanceResponse:
         """
         Query balance of selected denomination from specific account.
 
         :param request: QueryBalanceRequest with address and denomination
+        :param metadata: optional request metadata, e.g. x-cosmos-block-height
 
         :return: QueryBalanceResponse
         """
 
     @abstractmethod
-    def AllBalances(self, request: QueryAllBalancesRequest) -> QueryAllBalancesResponse:
+    def AllBalances(
+        self,
+        request: QueryAllBalancesRequest,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> QueryAllBalancesResponse:
         """
         Query balance of all denominations from specific account.
 
         :param request: QueryAllBalancesRequest with account address
+        :param metadata: optional request metadata, e.g. x-cosmos-block-height
 
         :return: QueryAllBalancesResponse
         """
@@ -19,6 +19,8 @@
 
 """Implementation of Bank interface using REST."""
 
+from typing import Optional, Sequence, Tuple
+
 from google.protobuf.json_format import Parse
 
 from cosmpy.bank.interface import Bank
@@ -54,11 +56,16 @@ class BankRestClient(Bank):
         """
         self._rest_api = rest_api
 
-    def Balance(self, request: QueryBalanceRequest) -> QueryBalanceResponse:
+    def Balance(
+        self,
+        request: QueryBalanceRequest,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> QueryBalanceResponse:
         """
         Query balance of selected denomination from specific account.
 
         :param request: QueryBalanceRequest with address and denomination
+        :param metadata: optional request metadata, e.g. x-cosmos-block-height
 
         :return: QueryBalanceResponse
         """
@@ -66,19 +73,28 @@ class BankRestClient(Bank):
             f"{self.API_URL}/balances/{request.address}/by_denom?denom={request.denom}",
             request,
             ["address", "denom"],
+            headers=dict(metadata) if metadata else None,
         )
         return Parse(response, QueryBalanceResponse())
 
-    def AllBalances(self, request: QueryAllBalancesRequest) -> QueryAllBalancesResponse:
+    def AllBalances(
+        self,
+        request: QueryAllBalancesRequest,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> QueryAllBalancesResponse:
         """
         Query balance of all denominations from specific account.
 
         :param request: QueryAllBalancesRequest with account address
+        :param metadata: optional request metadata, e.g. x-cosmos-block-height
 
         :return: QueryAllBalancesResponse
         """
         response = self._rest_api.get(
-            f"{self.API_URL}/balances/{request.address}", request, ["address"]
+            f"{self.API_URL}/balances/{request.address}",
+            request,
+            ["address"],
+            headers=dict(metadata) if metadata else None,
         )
         return Parse(response, QueryAllBalancesResponse())
 
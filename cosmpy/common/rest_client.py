@@ -20,31 +20,44 @@
 """Implementation of REST api client."""
 import base64
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import urlencode
 
 import requests
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.message import Message
+from requests.adapters import HTTPAdapter
 
 
 class RestClient:
     """REST api client."""
 
-    def __init__(self, rest_address: str):
+    def __init__(self, rest_address: str, pool_maxsize: Optional[int] = None):
         """
         Create REST api client.
 
         :param rest_address: Address of REST node
+        :param pool_maxsize: max number of pooled connections, which should match the
+            number of threads sending requests concurrently, defaults to the
+            requests default of 10
         """
         self._session = requests.session()
+        if pool_maxsize is not None:
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
         self.rest_address = rest_address
 
+    def close(self):
+        """Close the pooled connections."""
+        self._session.close()
+
     def get(
         self,
         url_base_path: str,
         request: Optional[Message] = None,
         used_params: Optional[List[str]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> bytes:
         """
         Send a GET request.
@@ -52,6 +65,7 @@ class RestClient:
         :param url_base_path: URL base path
         :param request: Protobuf coded request
         :param used_params: Parameters to be removed from request after converting it to dict
+        :param headers: Optional HTTP headers, e.g. x-cosmos-block-height
 
         :raises RuntimeError: if response code is not 200
 
@@ -61,7 +75,10 @@ class RestClient:
             url_base_path=url_base_path, request=request, used_params=used_params
         )
 
-        response = self._session.get(url=url)
+        if headers:
+            response = self._session.get(url=url, headers=headers)
+        else:
+            response = self._session.get(url=url)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Error when sending a GET request.\n Response: {response.status_code}, {str(response.content)})"
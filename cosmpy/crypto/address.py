@@ -20,10 +20,9 @@
 """Address of the Crypto package."""
 
 from collections import UserString
-from typing import Optional, Union
-
-import bech32
+from typing import Iterable, List, Optional, Union
 
+from cosmpy.crypto.bech32_codec import decode_cached, encode_cached
 from cosmpy.crypto.hashfuncs import ripemd160, sha256
 from cosmpy.crypto.keypairs import PublicKey
 
@@ -32,14 +31,22 @@ DEFAULT_PREFIX = "fetch"
 
 
 def _to_bech32(prefix: str, data: bytes) -> str:
-    data_base5 = bech32.convertbits(data, 8, 5, True)
-    if data_base5 is None:
-        raise RuntimeError("Unable to parse address")  # pragma: no cover
-    return bech32.bech32_encode(prefix, data_base5)
+    return encode_cached(prefix, data)
+
+
+def _from_bech32(value: str) -> bytes:
+    try:
+        return decode_cached(value)[1]
+    except ValueError as error:
+        raise RuntimeError("Unable to parse address") from error
 
 
 class Address(UserString):
-    """Address class."""
+    """Address class.
+
+    Addresses are immutable, their hash is computed once and equality compares the
+    bech32 strings directly.
+    """
 
     def __init__(
         self,
@@ -59,15 +66,7 @@ class Address(UserString):
             prefix = DEFAULT_PREFIX
 
         if isinstance(value, str):
-            _, data_base5 = bech32.bech32_decode(value)
-            if data_base5 is None:
-                raise RuntimeError("Unable to parse address")
-
-            data_base8 = bech32.convertbits(data_base5, 5, 8, False)
-            if data_base8 is None:
-                raise RuntimeError("Unable to parse address")  # pragma: no cover
-
-            self._address = bytes(data_base8)
+            self._address = _from_bech32(value)
             self._display = value
 
         elif isinstance(value, bytes):
@@ -84,10 +83,41 @@ class Address(UserString):
         elif isinstance(value, Address):
             self._address = value._address
             # prefix might be different from the original Address, so we need to reencode it here.
-            self._display = _to_bech32(prefix, self._address)
+            if value._display.rsplit("1", 1)[0] == prefix:
+                self._display = value._display
+            else:
+                self._display = _to_bech32(prefix, self._address)
         else:
             raise TypeError("Unexpected type of `value` parameter")  # pragma: no cover
 
+        self._hash = hash(self._display)
+
+    @staticmethod
+    def decode_many(addresses: Iterable[Union[str, "Address"]]) -> List[bytes]:
+        """Decode many addresses to their raw bytes.
+
+        Repeated addresses are served from an intern cache.
+
+        :param addresses: bech32 addresses
+        :return: raw bytes of each address, 20 or 32 bytes long
+        """
+        return [
+            bytes(value) if isinstance(value, Address) else _from_bech32(value)
+            for value in addresses
+        ]
+
+    @staticmethod
+    def convert_many(
+        addresses: Iterable[Union[str, "Address"]], prefix: str
+    ) -> List[str]:
+        """Convert many addresses to another prefix.
+
+        :param addresses: bech32 addresses
+        :param prefix: prefix of the converted addresses
+        :return: converted bech32 addresses
+        """
+        return [_to_bech32(prefix, data) for data in Address.decode_many(addresses)]
+
     def __str__(self):
         """String representation of the address."""  # noqa: D401
         return self._display
@@ -96,6 +126,22 @@ class Address(UserString):
         """bytes representation of the address."""
         return self._address
 
+    def __hash__(self):
+        """Hash of the address string."""
+        return self._hash
+
+    def __eq__(self, other):
+        """Compare with another address or string.
+
+        :param other: address or string
+        :return: True if the address strings are equal
+        """
+        if isinstance(other, Address):
+            return self._hash == other._hash and self._display == other._display
+        if isinstance(other, str):
+            return self._display == other
+        return super().__eq__(other)
+
     @property
     def data(self):  # noqa:
         """Return address in string."""
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Verification of many signatures at once."""
+
+import hashlib
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cosmpy.crypto.secp256k1 import Secp256k1Backend, get_backend
+
+
+DEFAULT_CHUNK_SIZE = 256
+PUBLIC_KEY_CACHE_SIZE = 4096
+
+# public key bytes, signed bytes and signature
+SignatureItem = Tuple[bytes, bytes, bytes]
+
+
+@lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _load_public_key(backend: Secp256k1Backend, public_key: bytes) -> Any:
+    try:
+        return backend.load_public_key(public_key)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _verify_chunk(items: Sequence[SignatureItem]) -> List[bool]:
+    backend = get_backend()
+    digests: Dict[bytes, bytes] = {}
+    results = []
+    for public_key, message, signature in items:
+        key = _load_public_key(backend, public_key)
+        if key is None:
+            results.append(False)
+            continue
+        # signers of the same document share its digest
+        digest = digests.get(message)
+        if digest is None:
+            digest = digests[message] = hashlib.sha256(message).digest()
+        results.append(backend.verify_digest(key, digest, signature))
+    return results
+
+
+def verify_batch(
+    items: Sequence[SignatureItem],
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[bool]:
+    """Verify many secp256k1 signatures of SHA256 digests.
+
+    Parsed public keys are cached, so that the keys of recurring signers are only
+    decompressed once. With an executor, for example a `ProcessPoolExecutor` kept
+    for the lifetime of an indexer, batches larger than a chunk are spread over its
+    workers.
+
+    :param items: public key bytes, signed bytes and signature of each signature
+    :param executor: executor verifying the chunks of large batches, defaults to
+        verifying in the calling process
+    :param chunk_size: number of signatures verified per executor task
+    :return: whether each signature is valid, in the order of the items
+    """
+    if executor is None or len(items) <= chunk_size:
+        return _verify_chunk(items)
+
+    chunks = []
+    for start in range(0, len(items), chunk_size):
+        end = start + chunk_size
+        chunks.append(items[start:end])
+
+    results: List[bool] = []
+    for chunk_results in executor.map(_verify_chunk, chunks):
+        results.extend(chunk_results)
+    return results
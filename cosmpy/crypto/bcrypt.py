@@ -17,13 +17,17 @@
 #
 # ------------------------------------------------------------------------------
 
-"""Utilities for importing bcrypt-armored private keys."""
+"""Utilities for importing and exporting bcrypt-armored private keys."""
 
 import base64
 import binascii
 import hashlib
+import os
 import re
-from typing import Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import bcrypt
 from nacl.secret import SecretBox
@@ -32,6 +36,15 @@ from nacl.secret import SecretBox
 BEGIN_RE = re.compile(r"^-{5}BEGIN\s+([A-Z0-9]+)\s+PRIVATE KEY-{5}\s*$")
 END_RE = re.compile(r"^-{5}END\s+([A-Z0-9]+)\s+PRIVATE KEY-{5}\s*$")
 
+DEFAULT_BCRYPT_COST = 12
+# the cost header is not authenticated, so it may not raise the cost of an import
+MIN_HEADER_BCRYPT_COST = 4
+MAX_HEADER_BCRYPT_COST = DEFAULT_BCRYPT_COST
+ARMOR_BLOCK_TYPE = "TENDERMINT PRIVATE KEY"
+# amino prefix and length of a secp256k1 private key
+SECP256K1_AMINO_PREFIX = bytes.fromhex("e1b0f79b20")
+ARMOR_LINE_LENGTH = 64
+
 
 class ArmorError(ValueError):
     """
@@ -107,7 +120,7 @@ def _make_bcrypt_salt_from_hex(
     return b"$" + version + b"$" + cc + b"$" + enc22
 
 
-def _parse_armor_bcrypt(armor_str: str) -> Tuple[str, bytes, str]:
+def _parse_armor_bcrypt(armor_str: str) -> Tuple[str, bytes, str, Dict[str, str]]:
     """
     Parse a bcrypt-armored private key block and extract fields.
 
@@ -115,7 +128,7 @@ def _parse_armor_bcrypt(armor_str: str) -> Tuple[str, bytes, str]:
 
     :raises ArmorError: salt, header, or body is missing or malformed
 
-    :return: tuple (algo: str, ciphertext: bytes, salt_hex: str).
+    :return: tuple (algo: str, ciphertext: bytes, salt_hex: str, headers: dict).
     """
     lines = [ln.rstrip("\r\n") for ln in armor_str.splitlines()]
     if not lines or not BEGIN_RE.match(lines[0].strip()):
@@ -158,7 +171,7 @@ def _parse_armor_bcrypt(armor_str: str) -> Tuple[str, bytes, str]:
     except binascii.Error as e:
         raise ArmorError(f"invalid base64 body: {e}") from e
 
-    return algo, ciphertext, salt_hex
+    return algo, ciphertext, salt_hex, headers
 
 
 def _derive_key32_bcrypt(passphrase: str, salt_hex: str, rounds: int = 12) -> bytes:
@@ -194,27 +207,255 @@ def _secretbox_decrypt_prefixed_nonce(ciphertext: bytes, key32: bytes) -> bytes:
     return SecretBox(key32).decrypt(ct, nonce)
 
 
-def import_cosmos_bcrypt_armored_privkey(
-    armor_str: str, passphrase: str, rounds: int = 12
-):
+def _crc24(data: bytes) -> int:
     """
-    Import a Cosmos/Tendermint bcrypt-armored private key.
+    Compute the OpenPGP CRC-24 checksum of the armor body.
 
-    :param armor_str: str full ASCII armor including headers and body.
-    :param passphrase: str passphrase for bcrypt KDF.
-    :param rounds: int bcrypt cost (log2 work factor).
+    :param data: bytes armored data.
+    :return: int 24-bit checksum.
+    """
+    crc = 0xB704CE
+    for byte in data:
+        crc ^= byte << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= 0x1864CFB
+    return crc & 0xFFFFFF
+
+
+def _armor_rounds(headers: Dict[str, str], rounds: Optional[int]) -> int:
+    """
+    Select the bcrypt cost of an armor.
+
+    :param headers: dict armor headers.
+    :param rounds: Optional[int] explicit bcrypt cost, overriding the headers.
+
+    :raises ArmorError: if the cost header is not a number between
+        MIN_HEADER_BCRYPT_COST and MAX_HEADER_BCRYPT_COST. Higher costs can only be
+        given explicitly.
+
+    :return: int bcrypt cost, from the cost header of low cost exports or the default.
+    """
+    if rounds is not None:
+        return rounds
+    cost = headers.get("cost")
+    if not cost:
+        return DEFAULT_BCRYPT_COST
+    if (
+        not cost.isdigit()
+        or not MIN_HEADER_BCRYPT_COST <= int(cost) <= MAX_HEADER_BCRYPT_COST
+    ):
+        raise ArmorError(f"invalid cost header: {cost!r}")
+    return int(cost)
+
+
+class DerivedKeyCache:
+    """
+    In-process cache of the keys derived by bcrypt.
+
+    Keys are cached by passphrase digest, salt and cost, so that armors sharing them,
+    or imported again, skip the slow key derivation. Only keys which decrypted an
+    armor successfully are cached.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        :param max_entries: int max number of cached keys, least recently used first out.
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._keys: "OrderedDict[Tuple[bytes, str, int], bytes]" = OrderedDict()
+
+    @staticmethod
+    def _cache_key(
+        passphrase: str, salt_hex: str, rounds: int
+    ) -> Tuple[bytes, str, int]:
+        return (
+            hashlib.sha256(passphrase.encode("utf-8")).digest(),
+            salt_hex.upper(),
+            rounds,
+        )
+
+    def get(self, passphrase: str, salt_hex: str, rounds: int) -> Optional[bytes]:
+        """
+        Get a derived key.
+
+        :param passphrase: str passphrase.
+        :param salt_hex: str 32-hex-char salt.
+        :param rounds: int bcrypt cost.
+        :return: bytes 32-byte derived key, or None if not cached.
+        """
+        cache_key = self._cache_key(passphrase, salt_hex, rounds)
+        with self._lock:
+            key32 = self._keys.get(cache_key)
+            if key32 is not None:
+                self._keys.move_to_end(cache_key)
+            return key32
+
+    def put(self, passphrase: str, salt_hex: str, rounds: int, key32: bytes):
+        """
+        Cache a derived key.
+
+        :param passphrase: str passphrase.
+        :param salt_hex: str 32-hex-char salt.
+        :param rounds: int bcrypt cost.
+        :param key32: bytes 32-byte derived key.
+        """
+        cache_key = self._cache_key(passphrase, salt_hex, rounds)
+        with self._lock:
+            self._keys[cache_key] = key32
+            self._keys.move_to_end(cache_key)
+            while len(self._keys) > self._max_entries:
+                self._keys.popitem(last=False)
+
+    def clear(self):
+        """Drop all the cached keys."""
+        with self._lock:
+            self._keys.clear()
+
+
+def _decrypt_privkey(ciphertext: bytes, key32: bytes) -> bytes:
+    """
+    Decrypt the private key of an armor.
+
+    :param ciphertext: bytes nonce||ciphertext.
+    :param key32: bytes 32-byte derived key.
 
     :raises ArmorError: if passphrase is wrong or keyfile is corrupted
 
-    :return: tuple (privkey32: bytes, algo: str) where privkey32 is 32 bytes.
+    :return: bytes 32-byte private key.
     """
-    algo, ciphertext, salt_hex = _parse_armor_bcrypt(armor_str)
-    key32 = _derive_key32_bcrypt(passphrase, salt_hex, rounds=rounds)
     try:
         plaintext = _secretbox_decrypt_prefixed_nonce(ciphertext, key32)
     except Exception as e:
         raise ArmorError(
             "decryption failed (wrong passphrase or corrupted keyfile)"
         ) from e
+    return plaintext[-32:]
+
+
+def import_cosmos_bcrypt_armored_privkey(
+    armor_str: str,
+    passphrase: str,
+    rounds: Optional[int] = None,
+    cache: Optional[DerivedKeyCache] = None,
+):
+    """
+    Import a Cosmos/Tendermint bcrypt-armored private key.
+
+    :param armor_str: str full ASCII armor including headers and body.
+    :param passphrase: str passphrase for bcrypt KDF.
+    :param rounds: Optional[int] bcrypt cost (log2 work factor), defaults to the cost
+        header of the armor or 12.
+    :param cache: Optional[DerivedKeyCache] cache of the derived keys.
+
+    :return: tuple (privkey32: bytes, algo: str) where privkey32 is 32 bytes.
+    """
+    algo, ciphertext, salt_hex, headers = _parse_armor_bcrypt(armor_str)
+    rounds = _armor_rounds(headers, rounds)
+
+    key32 = cache.get(passphrase, salt_hex, rounds) if cache is not None else None
+    if key32 is None:
+        key32 = _derive_key32_bcrypt(passphrase, salt_hex, rounds=rounds)
+    privkey = _decrypt_privkey(ciphertext, key32)
+    if cache is not None:
+        cache.put(passphrase, salt_hex, rounds, key32)
+
+    return privkey, algo
+
+
+def import_cosmos_bcrypt_armored_privkeys(
+    armored_keys: Sequence[Tuple[str, str]],
+    rounds: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[DerivedKeyCache] = None,
+) -> List[Tuple[bytes, str]]:
+    """
+    Import many Cosmos/Tendermint bcrypt-armored private keys.
+
+    Only the key derivations run on the executor, for example a
+    `ProcessPoolExecutor`, each distinct one once. Parsing and decryption are fast
+    and stay in the calling process.
+
+    :param armored_keys: Sequence of (armor_str, passphrase) tuples.
+    :param rounds: Optional[int] bcrypt cost, defaults to the cost header of each
+        armor or 12.
+    :param executor: Optional[Executor] executor running the key derivations,
+        defaults to running them in the calling process.
+    :param cache: Optional[DerivedKeyCache] cache of the derived keys.
+
+    :return: list of (privkey32: bytes, algo: str) tuples, in the order of the armors.
+    """
+    parsed = []
+    for armor_str, passphrase in armored_keys:
+        algo, ciphertext, salt_hex, headers = _parse_armor_bcrypt(armor_str)
+        kdf_input = (passphrase, salt_hex.upper(), _armor_rounds(headers, rounds))
+        parsed.append((algo, ciphertext, kdf_input))
+
+    derived: Dict[Tuple[str, str, int], bytes] = {}
+    for kdf_input in dict.fromkeys(kdf_input for _, _, kdf_input in parsed):
+        key32 = cache.get(*kdf_input) if cache is not None else None
+        if key32 is not None:
+            derived[kdf_input] = key32
+
+    missing = [k for k in dict.fromkeys(k for _, _, k in parsed) if k not in derived]
+    if missing:
+        map_fnc = executor.map if executor is not None else map
+        derived.update(zip(missing, map_fnc(_derive_key32_bcrypt, *zip(*missing))))
+
+    results = []
+    for algo, ciphertext, kdf_input in parsed:
+        results.append((_decrypt_privkey(ciphertext, derived[kdf_input]), algo))
+        if cache is not None:
+            cache.put(*kdf_input, derived[kdf_input])
+    return results
+
+
+def export_cosmos_bcrypt_armored_privkey(
+    privkey: bytes, passphrase: str, rounds: int = DEFAULT_BCRYPT_COST
+) -> str:
+    """
+    Export a secp256k1 private key as a Cosmos/Tendermint bcrypt armor.
+
+    Armors exported with a cost other than 12 carry a cost header. They are meant
+    for ephemeral test environments: the Cosmos SDK ignores the header and only
+    imports armors of cost 12.
 
-    return plaintext[-32:], algo
+    :param privkey: bytes 32-byte private key.
+    :param passphrase: str passphrase for bcrypt KDF.
+    :param rounds: int bcrypt cost (log2 work factor), between 4 and 31.
+
+    :raises ArmorError: if the private key or the cost is invalid
+
+    :return: str full ASCII armor including headers and body.
+    """
+    if len(privkey) != 32:
+        raise ArmorError(f"private key must be 32 bytes, got {len(privkey)}")
+    if not 4 <= rounds <= 31:
+        raise ArmorError(f"bcrypt cost must be between 4 and 31, got {rounds}")
+
+    salt_hex = os.urandom(16).hex().upper()
+    key32 = _derive_key32_bcrypt(passphrase, salt_hex, rounds=rounds)
+    ciphertext = bytes(
+        SecretBox(key32).encrypt(SECP256K1_AMINO_PREFIX + privkey, os.urandom(24))
+    )
+
+    headers = {"kdf": "bcrypt", "salt": salt_hex, "type": "secp256k1"}
+    if rounds != DEFAULT_BCRYPT_COST:
+        headers["cost"] = str(rounds)
+
+    body = base64.b64encode(ciphertext).decode("ascii")
+    lines = [f"-----BEGIN {ARMOR_BLOCK_TYPE}-----"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append("")
+    lines.extend(
+        body[start : start + ARMOR_LINE_LENGTH]  # noqa: E203
+        for start in range(0, len(body), ARMOR_LINE_LENGTH)
+    )
+    crc = _crc24(ciphertext).to_bytes(3, "big")
+    lines.append("=" + base64.b64encode(crc).decode("ascii"))
+    lines.append(f"-----END {ARMOR_BLOCK_TYPE}-----")
+    return "\n".join(lines) + "\n"
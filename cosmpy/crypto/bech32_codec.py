@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Table driven bech32 codec of byte strings."""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+MAX_LENGTH = 90
+CHECKSUM_LENGTH = 6
+INTERN_CACHE_SIZE = 65536
+
+_GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+
+def _polymod_table_entry(top: int) -> int:
+    entry = 0
+    for bit in range(5):
+        if (top >> bit) & 1:
+            entry ^= _GENERATOR[bit]
+    return entry
+
+
+# checksum contribution of the 5 bits shifted out of the polymod state
+_POLYMOD_TABLE = tuple(_polymod_table_entry(top) for top in range(32))
+
+_DECODE_TABLE: Dict[str, int] = {char: value for value, char in enumerate(CHARSET)}
+
+
+def _polymod_step(chk: int, value: int) -> int:
+    return ((chk & 0x1FFFFFF) << 5) ^ value ^ _POLYMOD_TABLE[chk >> 25]
+
+
+@lru_cache(maxsize=256)
+def _prefix_state(prefix: str) -> int:
+    # polymod state after the expanded prefix, shared by all addresses of a prefix
+    chk = 1
+    for char in prefix:
+        chk = _polymod_step(chk, ord(char) >> 5)
+    chk = _polymod_step(chk, 0)
+    for char in prefix:
+        chk = _polymod_step(chk, ord(char) & 31)
+    return chk
+
+
+def _to_words(data: bytes) -> List[int]:
+    bits = len(data) * 8
+    count = (bits + 4) // 5
+    value = int.from_bytes(data, "big") << (count * 5 - bits)
+    return [(value >> shift) & 31 for shift in range(count * 5 - 5, -5, -5)]
+
+
+def _from_words(words: List[int]) -> bytes:
+    value = 0
+    for word in words:
+        value = (value << 5) | word
+    bits = len(words) * 5
+    padding = bits % 8
+    if padding >= 5 or value & ((1 << padding) - 1):
+        raise ValueError("Invalid bech32 padding")
+    return (value >> padding).to_bytes(bits // 8, "big")
+
+
+def encode(prefix: str, data: bytes) -> str:
+    """Encode bytes as a bech32 string.
+
+    :param prefix: human readable prefix
+    :param data: bytes to encode
+    :return: bech32 string
+    """
+    words = _to_words(data)
+    chk = _prefix_state(prefix)
+    for word in words:
+        chk = _polymod_step(chk, word)
+    for _ in range(CHECKSUM_LENGTH):
+        chk = _polymod_step(chk, 0)
+    chk ^= 1
+
+    checksum = [(chk >> shift) & 31 for shift in range(25, -5, -5)]
+    return prefix + "1" + "".join(CHARSET[word] for word in words + checksum)
+
+
+def decode(address: str) -> Tuple[str, bytes]:
+    """Decode a bech32 string.
+
+    :param address: bech32 string
+    :raises ValueError: if the string is not valid bech32
+    :return: human readable prefix and decoded bytes
+    """
+    if len(address) > MAX_LENGTH:
+        raise ValueError("Bech32 string is too long")
+    lowered = address.lower()
+    if lowered != address and address.upper() != address:
+        raise ValueError("Bech32 string has mixed case")
+
+    separator = lowered.rfind("1")
+    if separator < 1 or separator + CHECKSUM_LENGTH + 1 > len(lowered):
+        raise ValueError("Invalid bech32 separator position")
+
+    prefix = lowered[:separator]
+    if any(ord(char) < 33 or ord(char) > 126 for char in prefix):
+        raise ValueError("Invalid bech32 prefix")
+
+    data_start = separator + 1
+    try:
+        words = [_DECODE_TABLE[char] for char in lowered[data_start:]]
+    except KeyError as error:
+        raise ValueError("Invalid bech32 character") from error
+
+    chk = _prefix_state(prefix)
+    for word in words:
+        chk = _polymod_step(chk, word)
+    if chk != 1:
+        raise ValueError("Invalid bech32 checksum")
+
+    return prefix, _from_words(words[:-CHECKSUM_LENGTH])
+
+
+# intern caches of the addresses seen repeatedly
+decode_cached = lru_cache(maxsize=INTERN_CACHE_SIZE)(decode)
+encode_cached = lru_cache(maxsize=INTERN_CACHE_SIZE)(encode)
@@ -21,14 +21,19 @@
 
 import base64
 import hashlib
-from typing import BinaryIO, Callable, Optional, Union
+import secrets
+from typing import Any, BinaryIO, Callable, Optional, Union
 
 import ecdsa
 from ecdsa.curves import Curve
-from ecdsa.util import sigencode_string, sigencode_string_canonize
 
-from cosmpy.crypto.bcrypt import import_cosmos_bcrypt_armored_privkey
+from cosmpy.crypto.bcrypt import (
+    DEFAULT_BCRYPT_COST,
+    export_cosmos_bcrypt_armored_privkey,
+    import_cosmos_bcrypt_armored_privkey,
+)
 from cosmpy.crypto.interface import Signer
+from cosmpy.crypto.secp256k1 import Secp256k1Backend, get_backend
 
 
 def _base64_decode(value: str) -> bytes:
@@ -50,20 +55,32 @@ class PublicKey:
         :param public_key: butes, public key or ecdsa verifying key instance
         :raises RuntimeError: Invalid public key
         """
-        if isinstance(public_key, bytes):
-            self._verifying_key = ecdsa.VerifyingKey.from_string(
-                public_key, curve=self.curve, hashfunc=self.hash_function
-            )
-        elif isinstance(public_key, PublicKey):
-            self._verifying_key = public_key._verifying_key
+        if isinstance(public_key, PublicKey):
+            self._backend: Secp256k1Backend = public_key._backend
+            self._key: Any = public_key._key
+        elif isinstance(public_key, bytes):
+            self._backend = get_backend()
+            self._key = self._backend.load_public_key(public_key)
         elif isinstance(public_key, ecdsa.VerifyingKey):
-            self._verifying_key = public_key
+            self._backend = get_backend()
+            self._key = self._backend.load_public_key(
+                public_key.to_string("compressed")
+            )
         else:
             raise RuntimeError("Invalid public key type")  # noqa
 
-        self._public_key_bytes: bytes = self._verifying_key.to_string("compressed")
+        self._public_key_bytes: bytes = self._backend.public_key_bytes(self._key)
         self._public_key: str = base64.b64encode(self._public_key_bytes).decode()
 
+    @classmethod
+    def _from_backend_key(cls, backend: Secp256k1Backend, key: Any) -> "PublicKey":
+        public_key = cls.__new__(cls)
+        public_key._backend = backend
+        public_key._key = key
+        public_key._public_key_bytes = backend.public_key_bytes(key)
+        public_key._public_key = base64.b64encode(public_key._public_key_bytes).decode()
+        return public_key
+
     @property
     def public_key(self) -> str:
         """
@@ -99,15 +116,7 @@ class PublicKey:
         :param signature: bytes signature.
         :return: bool is message and signature valid.
         """
-        success: bool = False
-
-        try:
-            success = self._verifying_key.verify(signature, message)
-
-        except ecdsa.keys.BadSignatureError:
-            ...
-
-        return success
+        return self.verify_digest(self.hash_function(message).digest(), signature)
 
     def verify_digest(self, digest: bytes, signature: bytes) -> bool:
         """
@@ -117,15 +126,7 @@ class PublicKey:
         :param signature: bytes signature.
         :return: bool is digest valid.
         """
-        success: bool = False
-
-        try:
-            success = self._verifying_key.verify_digest(signature, digest)
-
-        except ecdsa.keys.BadSignatureError:  # pragma: no cover
-            ...
-
-        return success
+        return self._backend.verify_digest(self._key, digest, signature)
 
 
 class PrivateKey(Signer):
@@ -142,24 +143,22 @@ class PrivateKey(Signer):
         :raises RuntimeError: if unable to load private key from input.
         """
         if private_key is None:
-            self._signing_key = ecdsa.SigningKey.generate(
-                curve=self.curve, hashfunc=self.hash_function
+            raw_private_key = (secrets.randbelow(self.curve.order - 1) + 1).to_bytes(
+                32, "big"
             )
         elif isinstance(private_key, bytes):
-            self._signing_key = ecdsa.SigningKey.from_string(
-                private_key, curve=self.curve, hashfunc=self.hash_function
-            )
+            raw_private_key = private_key
         elif isinstance(private_key, str):
             raw_private_key = _base64_decode(private_key)
-            self._signing_key = ecdsa.SigningKey.from_string(
-                raw_private_key, curve=self.curve, hashfunc=self.hash_function
-            )
-
         else:
             raise RuntimeError("Unable to load private key from input")
 
+        self._backend: Secp256k1Backend = get_backend()
+        self._key: Any = self._backend.load_private_key(raw_private_key)
+        self._public_key: Optional[PublicKey] = None
+
         # cache the binary representations of the private key
-        self._private_key_bytes = self._signing_key.to_string()
+        self._private_key_bytes = raw_private_key
         self._private_key = base64.b64encode(self._private_key_bytes).decode()
 
     @classmethod
@@ -178,7 +177,7 @@ class PrivateKey(Signer):
         # decrypt armor (bcrypt + xsalsa20), get raw privkey bytes
         armor_str = raw.decode("utf-8", errors="strict")
         privkey_bytes, algo = import_cosmos_bcrypt_armored_privkey(
-            armor_str, passphrase=passphrase, rounds=12
+            armor_str, passphrase=passphrase
         )
 
         if algo.lower() != "secp256k1":
@@ -186,6 +185,18 @@ class PrivateKey(Signer):
 
         return cls(privkey_bytes)
 
+    def to_bcrypt_key(self, passphrase: str, rounds: int = DEFAULT_BCRYPT_COST) -> str:
+        """
+        Export the key as a bcrypt-armored key file.
+
+        :param passphrase: str passphrase to encrypt the key.
+        :param rounds: int bcrypt cost, only the default is importable by the Cosmos SDK.
+        :return: str armored key.
+        """
+        return export_cosmos_bcrypt_armored_privkey(
+            self.private_key_bytes, passphrase, rounds=rounds
+        )
+
     @property
     def private_key(self) -> str:
         """
@@ -220,7 +231,12 @@ class PrivateKey(Signer):
 
         :return: public key.
         """
-        return PublicKey(self._signing_key.get_verifying_key())
+        if self._public_key is None:
+            from_key = PublicKey._from_backend_key  # pylint: disable=protected-access
+            self._public_key = from_key(
+                self._backend, self._backend.derive_public_key(self._key)
+            )
+        return self._public_key
 
     def sign(
         self, message: bytes, deterministic: bool = True, canonicalise: bool = True
@@ -234,15 +250,10 @@ class PrivateKey(Signer):
 
         :return: bytes signed message.
         """
-        sigencode = sigencode_string_canonize if canonicalise else sigencode_string
-        sign_fnc = (
-            self._signing_key.sign_deterministic
-            if deterministic
-            else self._signing_key.sign
+        return self.sign_digest(
+            self.hash_function(message).digest(), deterministic, canonicalise
         )
 
-        return sign_fnc(message, sigencode=sigencode)
-
     def sign_digest(
         self, digest: bytes, deterministic=True, canonicalise: bool = True
     ) -> bytes:
@@ -255,11 +266,4 @@ class PrivateKey(Signer):
 
         :return: bytes signed digest.
         """
-        sigencode = sigencode_string_canonize if canonicalise else sigencode_string
-        sign_fnc = (
-            self._signing_key.sign_digest_deterministic
-            if deterministic
-            else self._signing_key.sign_digest
-        )
-
-        return sign_fnc(digest, sigencode=sigencode)
+        return self._backend.sign_digest(self._key, digest, deterministic, canonicalise)
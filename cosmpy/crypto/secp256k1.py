@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Backends of the secp256k1 curve operations."""
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import ecdsa
+from ecdsa.util import (
+    sigdecode_string,
+    sigencode_der,
+    sigencode_string,
+    sigencode_string_canonize,
+)
+
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover
+    coincurve = None
+
+CURVE_ORDER: int = ecdsa.SECP256k1.order
+DIGEST_SIZE = 32
+
+
+class Secp256k1Backend(ABC):
+    """Implementation of the secp256k1 key and signature operations.
+
+    Keys are loaded into backend specific objects once, so that they are not parsed
+    again for every operation. Deterministic and canonical signatures are identical
+    across backends: RFC6979 nonces derived with SHA256 and low-S values.
+    """
+
+    name: str
+
+    @abstractmethod
+    def load_private_key(self, private_key: bytes) -> Any:
+        """Load a private key.
+
+        :param private_key: 32 bytes secret
+        """
+
+    @abstractmethod
+    def load_public_key(self, public_key: bytes) -> Any:
+        """Load a public key.
+
+        :param public_key: compressed, uncompressed or raw (x || y) point
+        """
+
+    @abstractmethod
+    def derive_public_key(self, private_key: Any) -> Any:
+        """Derive the public key of a private key.
+
+        :param private_key: loaded private key
+        """
+
+    @abstractmethod
+    def public_key_bytes(self, public_key: Any) -> bytes:
+        """Get the compressed encoding of a public key.
+
+        :param public_key: loaded public key
+        """
+
+    @abstractmethod
+    def sign_digest(
+        self,
+        private_key: Any,
+        digest: bytes,
+        deterministic: bool = True,
+        canonicalise: bool = True,
+    ) -> bytes:
+        """Sign a digest.
+
+        :param private_key: loaded private key
+        :param digest: SHA256 digest of the message
+        :param deterministic: use a RFC6979 nonce rather than a random one
+        :param canonicalise: use the low-S form of the signature
+        """
+
+    @abstractmethod
+    def verify_digest(self, public_key: Any, digest: bytes, signature: bytes) -> bool:
+        """Verify the signature of a digest.
+
+        Both the low-S and high-S forms of a signature are valid.
+
+        :param public_key: loaded public key
+        :param digest: SHA256 digest of the message
+        :param signature: 64 bytes signature (r || s)
+        """
+
+
+class EcdsaBackend(Secp256k1Backend):
+    """Pure Python backend using the `ecdsa` package."""
+
+    name = "ecdsa"
+
+    def load_private_key(self, private_key: bytes) -> ecdsa.SigningKey:
+        """Load a private key.
+
+        :param private_key: 32 bytes secret
+        :return: signing key
+        """
+        return ecdsa.SigningKey.from_string(
+            private_key, curve=ecdsa.SECP256k1, hashfunc=hashlib.sha256
+        )
+
+    def load_public_key(self, public_key: bytes) -> ecdsa.VerifyingKey:
+        """Load a public key.
+
+        :param public_key: compressed, uncompressed or raw (x || y) point
+        :return: verifying key
+        """
+        return ecdsa.VerifyingKey.from_string(
+            public_key, curve=ecdsa.SECP256k1, hashfunc=hashlib.sha256
+        )
+
+    def derive_public_key(self, private_key: ecdsa.SigningKey) -> ecdsa.VerifyingKey:
+        """Derive the public key of a private key.
+
+        :param private_key: signing key
+        :return: verifying key
+        """
+        return private_key.get_verifying_key()
+
+    def public_key_bytes(self, public_key: ecdsa.VerifyingKey) -> bytes:
+        """Get the compressed encoding of a public key.
+
+        :param public_key: verifying key
+        :return: 33 bytes compressed point
+        """
+        return public_key.to_string("compressed")
+
+    def sign_digest(
+        self,
+        private_key: ecdsa.SigningKey,
+        digest: bytes,
+        deterministic: bool = True,
+        canonicalise: bool = True,
+    ) -> bytes:
+        """Sign a digest.
+
+        :param private_key: signing key
+        :param digest: SHA256 digest of the message
+        :param deterministic: use a RFC6979 nonce rather than a random one
+        :param canonicalise: use the low-S form of the signature
+        :return: 64 bytes signature (r || s)
+        """
+        sigencode = sigencode_string_canonize if canonicalise else sigencode_string
+        sign_fnc = (
+            private_key.sign_digest_deterministic
+            if deterministic
+            else private_key.sign_digest
+        )
+        return sign_fnc(digest, sigencode=sigencode)
+
+    def verify_digest(
+        self, public_key: ecdsa.VerifyingKey, digest: bytes, signature: bytes
+    ) -> bool:
+        """Verify the signature of a digest.
+
+        :param public_key: verifying key
+        :param digest: SHA256 digest of the message
+        :param signature: 64 bytes signature (r || s)
+        :return: True if the signature is valid
+        """
+        try:
+            return public_key.verify_digest(signature, digest)
+        except ecdsa.keys.BadSignatureError:
+            return False
+
+
+class CoincurveBackend(Secp256k1Backend):
+    """Native backend using the libsecp256k1 bindings of the `coincurve` package.
+
+    Random or non canonical signatures, which libsecp256k1 does not produce, are
+    delegated to the `ecdsa` backend.
+    """
+
+    name = "coincurve"
+
+    def __init__(self):
+        """Init the backend.
+
+        :raises ImportError: if coincurve is not installed
+        """
+        if coincurve is None:
+            raise ImportError("The coincurve package is not installed")
+        self._fallback = EcdsaBackend()
+
+    def load_private_key(self, private_key: bytes) -> Any:
+        """Load a private key.
+
+        :param private_key: 32 bytes secret
+        :raises ValueError: if the secret is not a valid private key
+        :return: coincurve private key
+        """
+        if len(private_key) != 32:
+            raise ValueError("Private key must be 32 bytes long")
+        return coincurve.PrivateKey(private_key)
+
+    def load_public_key(self, public_key: bytes) -> Any:
+        """Load a public key.
+
+        :param public_key: compressed, uncompressed or raw (x || y) point
+        :return: coincurve public key
+        """
+        if len(public_key) == 64:
+            public_key = b"\x04" + public_key
+        return coincurve.PublicKey(public_key)
+
+    def derive_public_key(self, private_key: Any) -> Any:
+        """Derive the public key of a private key.
+
+        :param private_key: coincurve private key
+        :return: coincurve public key
+        """
+        return private_key.public_key
+
+    def public_key_bytes(self, public_key: Any) -> bytes:
+        """Get the compressed encoding of a public key.
+
+        :param public_key: coincurve public key
+        :return: 33 bytes compressed point
+        """
+        return public_key.format(compressed=True)
+
+    def sign_digest(
+        self,
+        private_key: Any,
+        digest: bytes,
+        deterministic: bool = True,
+        canonicalise: bool = True,
+    ) -> bytes:
+        """Sign a digest.
+
+        :param private_key: coincurve private key
+        :param digest: SHA256 digest of the message
+        :param deterministic: use a RFC6979 nonce rather than a random one
+        :param canonicalise: use the low-S form of the signature
+        :return: 64 bytes signature (r || s)
+        """
+        if not deterministic or not canonicalise or len(digest) != DIGEST_SIZE:
+            return self._fallback.sign_digest(
+                self._fallback.load_private_key(private_key.secret),
+                digest,
+                deterministic,
+                canonicalise,
+            )
+        # compact recoverable signature r || s || v
+        return private_key.sign_recoverable(digest, hasher=None)[:64]
+
+    def verify_digest(self, public_key: Any, digest: bytes, signature: bytes) -> bool:
+        """Verify the signature of a digest.
+
+        :param public_key: coincurve public key
+        :param digest: SHA256 digest of the message
+        :param signature: 64 bytes signature (r || s)
+        :return: True if the signature is valid
+        """
+        if len(digest) != DIGEST_SIZE or len(signature) != 64:
+            return self._fallback.verify_digest(
+                self._fallback.load_public_key(self.public_key_bytes(public_key)),
+                digest,
+                signature,
+            )
+
+        r, s = sigdecode_string(signature, CURVE_ORDER)
+        if not 0 < r < CURVE_ORDER or not 0 < s < CURVE_ORDER:
+            return False
+        # libsecp256k1 only accepts the low-S form
+        s = min(s, CURVE_ORDER - s)
+        return public_key.verify(sigencode_der(r, s, CURVE_ORDER), digest, hasher=None)
+
+
+_BACKENDS: Dict[str, Callable[[], Secp256k1Backend]] = {
+    EcdsaBackend.name: EcdsaBackend,
+    CoincurveBackend.name: CoincurveBackend,
+}
+
+_backend: Optional[Secp256k1Backend] = None
+
+
+def available_backends() -> List[str]:
+    """Get the names of the backends which can be used.
+
+    :return: backend names, fastest first
+    """
+    names = [EcdsaBackend.name]
+    if coincurve is not None:
+        names.insert(0, CoincurveBackend.name)
+    return names
+
+
+def get_backend() -> Secp256k1Backend:
+    """Get the backend used by new keys.
+
+    Defaults to the fastest available backend.
+
+    :return: backend
+    """
+    global _backend  # pylint: disable=global-statement
+    if _backend is None:
+        _backend = create_backend(available_backends()[0])
+    return _backend
+
+
+def create_backend(name: str) -> Secp256k1Backend:
+    """Create a backend by name.
+
+    :param name: backend name
+    :raises ValueError: if the backend is not available
+    :return: backend
+    """
+    if name not in available_backends():
+        raise ValueError(
+            f"Unknown or unavailable secp256k1 backend '{name}', expected one of {available_backends()}"
+        )
+    return _BACKENDS[name]()
+
+
+def set_backend(backend: Union[str, Secp256k1Backend]):
+    """Set the backend used by new keys.
+
+    Keys created before keep using the backend they were loaded with.
+
+    :param backend: backend, or name of an available backend
+    """
+    global _backend  # pylint: disable=global-statement
+    _backend = create_backend(backend) if isinstance(backend, str) else backend
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Multi-core search of vanity addresses.
+
+Run ``cosmpy-vanity --prefix fet`` (or ``python -m cosmpy.crypto.vanity --prefix fet``)
+to search from the command line.
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import queue
+import secrets
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import ecdsa
+
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.bech32_codec import CHARSET, encode
+from cosmpy.crypto.hashfuncs import ripemd160
+from cosmpy.crypto.keypairs import PrivateKey
+from cosmpy.crypto.secp256k1 import CURVE_ORDER
+
+
+DEFAULT_PREFIX = "fetch"
+DEFAULT_BATCH_SIZE = 1024
+ADDRESS_WORDS = 32
+
+# prime of the field of the secp256k1 curve
+_FIELD_PRIME = ecdsa.SECP256k1.curve.p()
+_GENERATOR = ecdsa.SECP256k1.generator
+
+Point = Tuple[int, int]
+
+
+@dataclass
+class VanityProgress:
+    """Progress of a vanity address search."""
+
+    attempts: int
+    elapsed: float
+    difficulty: int
+
+    @property
+    def keys_per_second(self) -> float:
+        """Get the number of keys tried per second.
+
+        :return: keys per second
+        """
+        return self.attempts / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def expected_seconds(self) -> float:
+        """Get the expected time to a match, from the start of the search.
+
+        :return: expected seconds, infinite before the first keys are tried
+        """
+        rate = self.keys_per_second
+        return self.difficulty / rate if rate > 0 else float("inf")
+
+
+@dataclass
+class VanityMatch:
+    """Key of a vanity address."""
+
+    private_key: PrivateKey
+    address: Address
+    attempts: int
+    elapsed: float
+
+
+def difficulty(prefix: str = "", suffix: str = "") -> int:
+    """Get the expected number of keys tried to match a pattern.
+
+    :param prefix: start of the address data, after the bech32 separator
+    :param suffix: end of the address
+    :return: expected number of keys
+    """
+    return len(CHARSET) ** (len(prefix) + len(suffix))
+
+
+def _validate_pattern(prefix: str, suffix: str):
+    for part in (prefix, suffix):
+        invalid = sorted(set(part) - set(CHARSET))
+        if invalid:
+            raise ValueError(
+                f"Invalid bech32 characters {''.join(invalid)!r}, use {CHARSET!r}"
+            )
+    if len(prefix) > ADDRESS_WORDS:
+        raise ValueError(f"Prefix is longer than {ADDRESS_WORDS} characters")
+    if not prefix and not suffix:
+        raise ValueError("Empty pattern")
+
+
+def _add(first: Point, second: Point) -> Point:
+    x1, y1 = first
+    x2, y2 = second
+    if first == second:
+        lam = 3 * x1 * x1 * pow(2 * y1, -1, _FIELD_PRIME) % _FIELD_PRIME
+    else:
+        lam = (y2 - y1) * pow(x2 - x1, -1, _FIELD_PRIME) % _FIELD_PRIME
+    x3 = (lam * lam - x1 - x2) % _FIELD_PRIME
+    return x3, (lam * (x1 - x3) - y1) % _FIELD_PRIME
+
+
+def _multiples(count: int) -> List[Point]:
+    # G, 2G, ... countG, added to the start point of every batch
+    generator = (_GENERATOR.x(), _GENERATOR.y())
+    points = [generator]
+    while len(points) < count:
+        points.append(_add(points[-1], generator))
+    return points
+
+
+def _batch_points(start: Point, multiples: Sequence[Point]) -> List[Point]:
+    """Add the start point to every multiple of the generator.
+
+    The slopes of all additions share a single modular inversion (Montgomery's
+    trick), which is what makes the batch cheaper than one scalar multiplication
+    per key.
+
+    :param start: start point of the batch
+    :param multiples: points G to nG
+    :return: points start + G to start + nG
+    """
+    x1, y1 = start
+    prefix_products = []
+    product = 1
+    for x2, _ in multiples:
+        prefix_products.append(product)
+        product = product * (x2 - x1) % _FIELD_PRIME
+    inverse = pow(product, -1, _FIELD_PRIME)
+
+    points: List[Point] = [(0, 0)] * len(multiples)
+    for index in range(len(multiples) - 1, -1, -1):
+        x2, y2 = multiples[index]
+        lam = (y2 - y1) * inverse * prefix_products[index] % _FIELD_PRIME
+        inverse = inverse * (x2 - x1) % _FIELD_PRIME
+        x3 = (lam * lam - x1 - x2) % _FIELD_PRIME
+        points[index] = (x3, (lam * (x1 - x3) - y1) % _FIELD_PRIME)
+    return points
+
+
+def _address_hash_function() -> Callable[[bytes], bytes]:
+    # the OpenSSL RIPEMD160 is several times faster, when the build provides it
+    try:
+        hashlib.new("ripemd160")
+    except ValueError:
+        return lambda public_key: ripemd160(hashlib.sha256(public_key).digest())
+    return lambda public_key: hashlib.new(
+        "ripemd160", hashlib.sha256(public_key).digest()
+    ).digest()
+
+
+def _make_matcher(hrp: str, prefix: str, suffix: str) -> Callable[[bytes], bool]:
+    # the prefix is compared on the bits of the hash, only candidates matching it
+    # are encoded to compare the suffix, which includes the checksum
+    prefix_bits = 5 * len(prefix)
+    prefix_value = 0
+    for char in prefix:
+        prefix_value = (prefix_value << 5) | CHARSET.index(char)
+    shift = 8 * 20 - prefix_bits
+
+    def matches(address: bytes) -> bool:
+        if int.from_bytes(address, "big") >> shift != prefix_value:
+            return False
+        return not suffix or encode(hrp, address).endswith(suffix)
+
+    return matches
+
+
+def _search_worker(
+    hrp: str,
+    prefix: str,
+    suffix: str,
+    batch_size: int,
+    stop,
+    attempts,
+    results,
+):  # pragma: no cover
+    matches = _make_matcher(hrp, prefix, suffix)
+    address_hash = _address_hash_function()
+    multiples = _multiples(batch_size)
+
+    # keys are consecutive from a random start, far enough from the curve order
+    # to never wrap around
+    key = secrets.randbelow(CURVE_ORDER - 2**64) + 1
+    point = _GENERATOR * key
+    start = (point.x(), point.y())
+
+    while not stop.is_set():
+        points = _batch_points(start, multiples)
+        for offset, (x, y) in enumerate(points, 1):
+            public_key = bytes([2 + (y & 1)]) + x.to_bytes(32, "big")
+            if matches(address_hash(public_key)):
+                results.put((key + offset).to_bytes(32, "big"))
+        with attempts.get_lock():
+            attempts.value += len(points)
+        key += len(points)
+        start = points[-1]
+
+
+def search(
+    prefix: str = "",
+    suffix: str = "",
+    hrp: str = DEFAULT_PREFIX,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    progress: Optional[Callable[[VanityProgress], None]] = None,
+    progress_interval: float = 1.0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Optional[VanityMatch]:
+    """Search a key whose address matches a pattern, on all cores.
+
+    Each worker process walks consecutive keys from a random start, deriving every
+    public key from the previous one by a point addition instead of a scalar
+    multiplication.
+
+    :param prefix: start of the address data, after the bech32 separator
+    :param suffix: end of the address
+    :param hrp: human readable prefix of the address
+    :param workers: number of worker processes, defaults to the number of cores
+    :param timeout: seconds after which the search is abandoned, defaults to none
+    :param progress: called with the search progress every interval
+    :param progress_interval: seconds between progress calls
+    :param batch_size: number of keys sharing one modular inversion
+    :raises RuntimeError: if the workers stop, or report a key that does not match
+    :return: matching key, or None if the search timed out
+    """
+    prefix, suffix = prefix.lower(), suffix.lower()
+    _validate_pattern(prefix, suffix)
+    expected = difficulty(prefix, suffix)
+
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    attempts = context.Value("Q", 0)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_search_worker,
+            args=(hrp, prefix, suffix, batch_size, stop, attempts, results),
+            daemon=True,
+        )
+        for _ in range(workers or os.cpu_count() or 1)
+    ]
+
+    start_time = time.perf_counter()
+    for process in processes:
+        process.start()
+    try:
+        while True:
+            elapsed = time.perf_counter() - start_time
+            if timeout is not None and elapsed >= timeout:
+                return None
+            wait = progress_interval
+            if timeout is not None:
+                wait = min(wait, timeout - elapsed)
+            try:
+                private_key_bytes = results.get(timeout=wait)
+                break
+            except queue.Empty:
+                pass
+            if not any(process.is_alive() for process in processes):
+                raise RuntimeError("All the search workers stopped")
+            if progress is not None:
+                progress(
+                    VanityProgress(
+                        attempts.value, time.perf_counter() - start_time, expected
+                    )
+                )
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    private_key = PrivateKey(private_key_bytes)
+    address = Address(private_key.public_key, hrp)
+    data = str(address)[len(hrp) + 1 :]  # noqa: E203
+    if not data.startswith(prefix) or not data.endswith(suffix):
+        raise RuntimeError(f"Worker reported non matching address {address}")
+    return VanityMatch(
+        private_key, address, attempts.value, time.perf_counter() - start_time
+    )
+
+
+def _print_progress(status: VanityProgress):
+    print(
+        f"{status.attempts} keys, {status.keys_per_second:.0f} keys/s, "
+        f"expected {status.expected_seconds:.0f} s to match",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Search a vanity address from the command line.
+
+    :param argv: command line arguments, defaults to the process arguments
+    """
+    parser = argparse.ArgumentParser(description="Search a vanity address.")
+    parser.add_argument("--prefix", default="", help="start of the address data")
+    parser.add_argument("--suffix", default="", help="end of the address")
+    parser.add_argument("--hrp", default=DEFAULT_PREFIX, help="address prefix")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--timeout", type=float, help="seconds before giving up")
+    args = parser.parse_args(argv)
+
+    try:
+        expected = difficulty(args.prefix, args.suffix)
+        print(f"Expected {expected} keys to match", file=sys.stderr)
+        match = search(
+            args.prefix,
+            args.suffix,
+            hrp=args.hrp,
+            workers=args.workers,
+            timeout=args.timeout,
+            progress=_print_progress,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    if match is None:
+        print("No match before the timeout", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Address:     {match.address}")
+    print(f"Private key: {match.private_key.private_key_hex}")
+    print(
+        f"Found after {match.attempts} keys in {match.elapsed:.1f} s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
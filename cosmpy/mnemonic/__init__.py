@@ -23,9 +23,11 @@ import hashlib
 import hmac
 import os
 import re
-from typing import List, Optional, Tuple
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional, Tuple
 
-from cosmpy.crypto.hashfuncs import sha256
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.hashfuncs import ripemd160, sha256
 from cosmpy.crypto.keypairs import PrivateKey
 from cosmpy.mnemonic.words import ENGLISH_MNEMONIC_WORDS, ENGLISH_MNEMONIC_WORDS_LIST
 
@@ -36,6 +38,9 @@ HMAC_HALF_LEN = HMAC_LEN // 2
 MNEMONIC_SALT = "mnemonic"
 MNEMONIC_ROUNDS = 2048
 COSMOS_HD_PATH = "m/44'/118'/0'/0/0"
+COSMOS_COIN_TYPE = 118
+HARDENED_INDEX = 1 << 31
+DEFAULT_CHUNK_SIZE = 256
 
 
 def split_hmac(data: bytes) -> Tuple[bytes, bytes]:
@@ -127,12 +132,17 @@ def derive_child_key_from_index(
     :param index: int
     :return: Tuple[bytes, bytes]
     """
-    parsed_private_key = PrivateKey(private_key)
-    public_key = parsed_private_key.public_key.public_key_bytes
+    if index & HARDENED_INDEX:
+        return _derive_child(private_key, b"", chain_code, index)
+    public_key = PrivateKey(private_key).public_key.public_key_bytes
+    return _derive_child(private_key, public_key, chain_code, index)
 
-    is_hardened = index & (1 << 31)
 
-    if is_hardened:
+def _derive_child(
+    private_key: bytes, public_key: bytes, chain_code: bytes, index: int
+) -> Tuple[bytes, bytes]:
+    # the public key of the parent is only needed for non hardened indexes
+    if index & HARDENED_INDEX:
         data_bytes = b"\x00" + private_key + index.to_bytes(4, "big")
     else:
         data_bytes = public_key + index.to_bytes(4, "big")
@@ -143,7 +153,7 @@ def derive_child_key_from_index(
     il_int = int.from_bytes(il_bytes, byteorder="big", signed=False)
     private_key_int = int.from_bytes(private_key, byteorder="big", signed=False)
 
-    new_private_key_int = (il_int + private_key_int) % parsed_private_key.curve.order
+    new_private_key_int = (il_int + private_key_int) % PrivateKey.curve.order
     new_private_key_bytes = new_private_key_int.to_bytes(32, "big")
 
     return new_private_key_bytes, ir_bytes
@@ -287,3 +297,117 @@ def generate_mnemonic(num_bits=256):
     """
     entropy = generate_entropy(num_bits)
     return entropy_to_mnemonic(entropy)
+
+
+def _derive_raw_addresses(
+    parent: Tuple[bytes, bytes, bytes], indexes: List[int]
+) -> List[bytes]:
+    addresses = []
+    for index in indexes:
+        child_private_key, _ = _derive_child(*parent, index)
+        public_key = PrivateKey(child_private_key).public_key.public_key_bytes
+        addresses.append(ripemd160(sha256(public_key)))
+    return addresses
+
+
+class HDWallet:
+    """Derive many accounts of a mnemonic.
+
+    The seed, the master key and the parent node m/44'/118'/account'/0 are computed
+    once, so deriving each account only takes its last, non hardened, step.
+    """
+
+    def __init__(
+        self,
+        mnemonic: str,
+        passphrase: Optional[str] = None,
+        account: int = 0,
+    ):
+        """
+        Initialize the HD wallet.
+
+        :param mnemonic: str The mnemonic phrase.
+        :param passphrase: Optional[str] An optional passphrase.
+        :param account: int The hardened account index of the parent node.
+        """
+        seed_bytes = derive_seed_from_mnemonic(mnemonic, passphrase=passphrase)
+        self._master_key, self._master_chain_code = derive_master_key(seed_bytes)
+
+        private_key, chain_code = self._master_key, self._master_chain_code
+        for index in (
+            44 | HARDENED_INDEX,
+            COSMOS_COIN_TYPE | HARDENED_INDEX,
+            account | HARDENED_INDEX,
+            0,
+        ):
+            private_key, chain_code = derive_child_key_from_index(
+                private_key, chain_code, index
+            )
+
+        self._parent = (
+            private_key,
+            PrivateKey(private_key).public_key.public_key_bytes,
+            chain_code,
+        )
+
+    def derive_path(self, path: str) -> bytes:
+        """
+        Derive the private key of any path from the cached master key.
+
+        :param path: str The derivation path.
+        :return: bytes The derived private key.
+        """
+        return derive_child_key(self._master_key, self._master_chain_code, path)
+
+    def derive_key(self, index: int) -> bytes:
+        """
+        Derive the private key of an account index.
+
+        :param index: int The last, non hardened, index of the path.
+        :return: bytes The derived private key.
+        """
+        return _derive_child(*self._parent, index)[0]
+
+    def derive_keys(self, indexes: Iterable[int]) -> List[bytes]:
+        """
+        Derive the private keys of many account indexes.
+
+        :param indexes: Iterable[int] The last, non hardened, indexes of the paths.
+        :return: List[bytes] The derived private keys.
+        """
+        return [self.derive_key(index) for index in indexes]
+
+    def derive_addresses(
+        self,
+        indexes: Iterable[int],
+        prefix: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Address]:
+        """
+        Derive the addresses of many account indexes.
+
+        Deriving public keys dominates, so large batches can be spread over the
+        workers of an executor, for example a `ProcessPoolExecutor`.
+
+        :param indexes: Iterable[int] The last, non hardened, indexes of the paths.
+        :param prefix: Optional[str] The address prefix.
+        :param executor: Optional[Executor] executor deriving the chunks of indexes.
+        :param chunk_size: int The number of indexes derived per executor task.
+        :return: List[Address] The derived addresses.
+        """
+        indexes = list(indexes)
+        if executor is None or len(indexes) <= chunk_size:
+            raw_addresses = _derive_raw_addresses(self._parent, indexes)
+        else:
+            chunks = [
+                indexes[start : start + chunk_size]  # noqa: E203
+                for start in range(0, len(indexes), chunk_size)
+            ]
+            raw_addresses = []
+            for chunk_addresses in executor.map(
+                _derive_raw_addresses, [self._parent] * len(chunks), chunks
+            ):
+                raw_addresses.extend(chunk_addresses)
+
+        return [Address(raw_address, prefix) for raw_address in raw_addresses]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2022 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This tool compares the bech32 address codec with the reference bech32 package."""
+import argparse
+import hashlib
+import time
+from typing import Callable, List
+
+import bech32
+
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.bech32_codec import decode, encode
+
+
+def _reference_convert(address: str, prefix: str) -> str:
+    _, words = bech32.bech32_decode(address)
+    assert words is not None
+    data = bech32.convertbits(words, 5, 8, False)
+    assert data is not None
+    words = bech32.convertbits(bytes(data), 8, 5, True)
+    assert words is not None
+    return bech32.bech32_encode(prefix, words)
+
+
+def _codec_convert(address: str, prefix: str) -> str:
+    return encode(prefix, decode(address)[1])
+
+
+def _rate(convert: Callable[[List[str]], object], addresses: List[str]) -> float:
+    start = time.perf_counter()
+    convert(addresses)
+    return len(addresses) / (time.perf_counter() - start)
+
+
+def main():
+    """Convert fetch addresses to the cosmos prefix with each implementation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--count", type=int, default=100000, help="number of addresses to convert"
+    )
+    parser.add_argument(
+        "--distinct",
+        type=int,
+        default=1000,
+        help="number of distinct addresses among them",
+    )
+    args = parser.parse_args()
+
+    addresses = [
+        str(Address(hashlib.sha256(index.to_bytes(4, "big")).digest()[:20]))
+        for index in range(args.distinct)
+    ]
+    addresses = [addresses[index % args.distinct] for index in range(args.count)]
+
+    implementations = {
+        "bech32 package": lambda values: [
+            _reference_convert(value, "cosmos") for value in values
+        ],
+        "table driven codec": lambda values: [
+            _codec_convert(value, "cosmos") for value in values
+        ],
+        "Address.convert_many": lambda values: Address.convert_many(values, "cosmos"),
+    }
+    for name, convert in implementations.items():
+        print(f"{name:<24}{_rate(convert, addresses):>12.0f} addresses/s")
+
+
+if __name__ == "__main__":
+    main()
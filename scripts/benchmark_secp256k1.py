@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2022 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This tool compares the throughput of the available secp256k1 backends."""
+import argparse
+import hashlib
+import time
+from typing import Callable, Dict, List
+
+from cosmpy.crypto.secp256k1 import Secp256k1Backend, available_backends, create_backend
+
+
+def _rate(operation: Callable[[int], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for index in range(iterations):
+        operation(index)
+    return iterations / (time.perf_counter() - start)
+
+
+def benchmark(backend: Secp256k1Backend, iterations: int) -> Dict[str, float]:
+    """Measure the operations per second of a backend.
+
+    :param backend: backend to measure
+    :param iterations: number of times each operation is run
+    :return: operations per second, by operation
+    """
+    secrets = [
+        hashlib.sha256(index.to_bytes(4, "big")).digest() for index in range(iterations)
+    ]
+    digests = [hashlib.sha256(secret).digest() for secret in secrets]
+    private_keys = [backend.load_private_key(secret) for secret in secrets]
+    public_keys = [backend.derive_public_key(key) for key in private_keys]
+    encoded = [backend.public_key_bytes(key) for key in public_keys]
+    signatures = [
+        backend.sign_digest(key, digest) for key, digest in zip(private_keys, digests)
+    ]
+
+    return {
+        "load private key": _rate(
+            lambda i: backend.load_private_key(secrets[i]), iterations
+        ),
+        "parse public key": _rate(
+            lambda i: backend.load_public_key(encoded[i]), iterations
+        ),
+        "sign": _rate(
+            lambda i: backend.sign_digest(private_keys[i], digests[i]), iterations
+        ),
+        "verify": _rate(
+            lambda i: backend.verify_digest(public_keys[i], digests[i], signatures[i]),
+            iterations,
+        ),
+    }
+
+
+def main():
+    """Run the benchmark of every available backend."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=1000,
+        help="number of times each operation is run",
+    )
+    args = parser.parse_args()
+
+    names: List[str] = available_backends()
+    results = {name: benchmark(create_backend(name), args.iterations) for name in names}
+
+    print(f"{'operation (ops/s)':<20}" + "".join(f"{name:>12}" for name in names))
+    for operation in results[names[0]]:
+        print(
+            f"{operation:<20}"
+            + "".join(f"{results[name][operation]:>12.0f}" for name in names)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@
 
 """Helpers methods and classes for testing."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from google.protobuf.descriptor import Descriptor
 
@@ -39,6 +39,7 @@ class MockRestClient(RestClient):
         self.last_base_url: Optional[str] = None
         self.last_request: Optional[Descriptor] = None
         self.last_used_params: Optional[List[str]] = None
+        self.last_headers: Optional[Dict[str, str]] = None
 
         super().__init__("")
 
@@ -47,6 +48,7 @@ class MockRestClient(RestClient):
         url_base_path: str,
         request: Optional[Descriptor] = None,
         used_params: Optional[List[str]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> bytes:
         """
         Handle GET request.
@@ -54,12 +56,14 @@ class MockRestClient(RestClient):
         :param url_base_path: url base path
         :param request:  optional request descriptor instance
         :param used_params: optional list of params name used in path
+        :param headers: optional HTTP headers
 
         :return: bytes
         """
         self.last_base_url = url_base_path
         self.last_request = request
         self.last_used_params = used_params
+        self.last_headers = headers
 
         return self.content
 
@@ -18,18 +18,25 @@
 #   limitations under the License.
 #
 # ------------------------------------------------------------------------------
+import json
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
+from cosmpy.aerial.client import LedgerClient
+from cosmpy.aerial.config import NetworkConfig
 from cosmpy.aerial.gas import (
+    AdaptiveGasStrategy,
     GasStrategy,
     OfflineMessageTableStrategy,
     SimulationGasStrategy,
+    tx_shape,
 )
 from cosmpy.aerial.tx import Transaction
-from cosmpy.protos.cosmos.bank.v1beta1.tx_pb2 import MsgSend
+from cosmpy.aerial.tx_helpers import SubmittedTx, TxResponse
+from cosmpy.protos.cosmos.bank.v1beta1.bank_pb2 import Output
+from cosmpy.protos.cosmos.bank.v1beta1.tx_pb2 import MsgMultiSend, MsgSend
 from cosmpy.protos.cosmwasm.wasm.v1.tx_pb2 import (
     MsgExecuteContract,
     MsgInstantiateContract,
@@ -71,9 +78,11 @@ class MockLedger:
         """Initiate Mock Ledger with table."""
         self._table = OfflineMessageTableStrategy.default_table()
         self.legacy = legacy
+        self.simulations = 0
 
     def simulate_tx(self, tx: Transaction) -> int:
         """Simulate tx."""
+        self.simulations += 1
         return self._table.estimate_gas(tx)
 
     def query_consensus_params(self) -> Any:  # pylint: disable=unused-argument
@@ -131,3 +140,113 @@ def test_simulated_estimation(input_msgs, expected_gas_estimate):
     gas_estimate = strategy.estimate_gas(tx)
 
     assert gas_estimate == expected_gas_estimate
+
+
+def _tx(*msgs) -> Transaction:
+    tx = Transaction()
+    for msg in msgs:
+        tx.add_message(msg)
+    return tx
+
+
+def _response(gas_used: int, raw_log: str = "") -> TxResponse:
+    return TxResponse(
+        "hash", 1, 11 if raw_log else 0, 0, gas_used, raw_log, [], {}, None
+    )
+
+
+def test_adaptive_estimation():
+    """Test the adaptive strategy only simulates unseen shapes."""
+    ledger = MockLedger()
+    strategy = AdaptiveGasStrategy(ledger, 1.0, quantile=0.5, margin=1.5)
+
+    assert strategy.estimate_gas(_tx(MsgSend())) == 100_000
+    assert ledger.simulations == 1
+    for gas_used in (60_000, 70_000, 80_000, 90_000):
+        strategy.observe(_tx(MsgSend()), _response(gas_used))
+
+    # median of 100k, 60k, 70k, 80k and 90k
+    assert strategy.estimate_gas(_tx(MsgSend())) == 120_000
+    assert strategy.estimate_gas(_tx(MsgSend(), MsgSend())) == 200_000
+    assert ledger.simulations == 2
+
+    strategy.observe(_tx(MsgSend()), _response(120_000, "out of gas in location"))
+    assert not strategy.samples(_tx(MsgSend()))
+    assert strategy.estimate_gas(_tx(MsgSend())) == 100_000
+    assert ledger.simulations == 3
+
+
+def test_adaptive_contract_shapes():
+    """Test contract executions are keyed by contract and method."""
+    transfer = MsgExecuteContract(contract="fetch1c", msg=b'{"transfer": {}}')
+    mint = MsgExecuteContract(contract="fetch1c", msg=b'{"mint": {}}')
+
+    assert (
+        tx_shape(_tx(transfer))
+        == "cosmwasm.wasm.v1.MsgExecuteContract:fetch1c:transfer"
+    )
+    assert tx_shape(_tx(mint)) != tx_shape(_tx(transfer))
+    assert tx_shape(_tx(MsgExecuteContract(msg=b"not json"), MsgSend())) == (
+        "cosmwasm.wasm.v1.MsgExecuteContract::" + " + cosmos.bank.v1beta1.MsgSend"
+    )
+
+
+def test_adaptive_shapes_count_outputs():
+    """Test the gas learnt for a number of outputs is not used for another one."""
+
+    def _multi_send(outputs):
+        return _tx(MsgMultiSend(outputs=[Output() for _ in range(outputs)]))
+
+    assert tx_shape(_multi_send(1)) == "cosmos.bank.v1beta1.MsgMultiSend(outputs=1)"
+    assert tx_shape(_multi_send(1)) != tx_shape(_multi_send(500))
+
+    ledger = MockLedger()
+    strategy = AdaptiveGasStrategy(ledger, 1.0, margin=1.0)
+    strategy.observe(_multi_send(1), _response(50_000))
+    assert strategy.estimate_gas(_multi_send(1)) == 50_000
+    assert not strategy.samples(_multi_send(500))
+
+
+def test_adaptive_persistence(tmp_path):
+    """Test the samples are saved after each observation and loaded back."""
+    path = str(tmp_path / "gas.json")
+    strategy = AdaptiveGasStrategy(MockLedger(), 1.0, path=path)
+    strategy.observe(_tx(MsgSend()), _response(50_000))
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["samples"] == {"cosmos.bank.v1beta1.MsgSend": [50_000]}
+
+    ledger = MockLedger()
+    restored = AdaptiveGasStrategy(ledger, 1.0, margin=2.0, path=path)
+    assert restored.estimate_gas(_tx(MsgSend())) == 100_000
+    assert ledger.simulations == 0
+
+
+def test_submitted_tx_feeds_gas_strategy():
+    """Test the response of a submitted transaction is observed."""
+    strategy = AdaptiveGasStrategy(MockLedger(), 1.0)
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.gas_strategy = strategy
+    submitted = SubmittedTx(client, "hash", _tx(MsgSend()))
+
+    submitted.response = _response(42_000)
+    assert strategy.samples(_tx(MsgSend())) == [42_000]
+
+
+def test_adaptive_autosave_is_throttled(tmp_path):
+    """Test the samples are saved at most once per interval, skipping failed txs."""
+    path = tmp_path / "gas.json"
+    strategy = AdaptiveGasStrategy(
+        MockLedger(), 1.0, path=str(path), autosave_interval_secs=3600
+    )
+    strategy.observe(_tx(MsgSend()), _response(50_000))
+    strategy.observe(_tx(MsgSend()), _response(60_000))
+    strategy.observe(_tx(MsgSend()), _response(10_000, "insufficient funds"))
+    assert json.loads(path.read_text())["samples"] == {
+        "cosmos.bank.v1beta1.MsgSend": [50_000]
+    }
+
+    strategy.save()
+    assert json.loads(path.read_text())["samples"] == {
+        "cosmos.bank.v1beta1.MsgSend": [50_000, 60_000]
+    }
+    assert [p.name for p in tmp_path.iterdir()] == ["gas.json"]
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test aerial asyncio ledger client."""
+
+import asyncio
+import hashlib
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cosmpy.aerial.client import DEFAULT_QUERY_INTERVAL_SECS, DEFAULT_QUERY_TIMEOUT_SECS
+from cosmpy.aerial.client.aio import AsyncLedgerClient, AsyncRestStub
+from cosmpy.aerial.client.aio.gas import AsyncSimulationGasStrategy
+from cosmpy.aerial.client.aio.tx_helpers import AsyncSubmittedTx
+from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
+from cosmpy.aerial.gas import OfflineMessageTableStrategy
+from cosmpy.aerial.tx import Transaction
+from cosmpy.bank.rest_client import BankRestClient
+from cosmpy.protos.cosmos.bank.v1beta1.query_pb2 import QueryAllBalancesResponse
+from cosmpy.protos.cosmos.bank.v1beta1.tx_pb2 import MsgSend
+from cosmpy.protos.cosmos.base.v1beta1.coin_pb2 import Coin
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import (
+    BroadcastMode,
+    BroadcastTxResponse,
+)
+
+from tests.helpers import MockRestClient
+
+
+def _rest_config() -> NetworkConfig:
+    cfg = NetworkConfig.fetchai_stable_testnet()
+    cfg.url = "rest+http://localhost:1317"
+    return cfg
+
+
+def test_async_ledger_client_timeouts():
+    """Test async ledger client query_interval_secs and query_timeout_secs options."""
+
+    async def _run():
+        async with AsyncLedgerClient(NetworkConfig.fetchai_stable_testnet()) as client:
+            assert (
+                client._query_interval_secs  # pylint: disable=protected-access
+                == DEFAULT_QUERY_INTERVAL_SECS
+            )
+            assert (
+                client._query_timeout_secs  # pylint: disable=protected-access
+                == DEFAULT_QUERY_TIMEOUT_SECS
+            )
+
+    asyncio.run(_run())
+
+
+def test_async_wait_to_complete_timeouts():
+    """Test AsyncSubmittedTx.wait_to_complete gives up after the timeout."""
+
+    async def _run():
+        client = AsyncLedgerClient(_rest_config())
+        tx = AsyncSubmittedTx(client, "hash")
+
+        with patch.object(
+            client, "query_tx", AsyncMock(side_effect=NotFoundError)
+        ), patch("asyncio.sleep", AsyncMock()) as sleep:
+            with pytest.raises(QueryTimeoutError):
+                await tx.wait_to_complete(timeout=0.1, poll_period=0.1)
+        sleep.assert_awaited_with(0.1)
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def test_async_wait_for_query_tx_polls_between_events():
+    """Test a missed commit event only delays the query of the tx."""
+
+    async def _run():
+        subscriber = MagicMock(connected=True)
+        subscriber.wait_for_tx.return_value = False
+        client = AsyncLedgerClient(_rest_config(), tx_subscriber=subscriber)
+        response = MagicMock()
+        with patch.object(
+            client,
+            "query_tx",
+            AsyncMock(side_effect=[NotFoundError(), NotFoundError(), response]),
+        ):
+            assert (
+                await client.wait_for_query_tx("EEFF", timeout=60, poll_period=1)
+                is response
+            )
+        assert [c.args[1] for c in subscriber.wait_for_tx.call_args_list] == [1.0, 1.0]
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def test_async_rest_query_bank_balance():
+    """Test REST requests are awaited through the thread pool."""
+    content = json.dumps({"balance": {"denom": "atestfet", "amount": "1234"}})
+
+    async def _run():
+        client = AsyncLedgerClient(_rest_config())
+        rest_client = MockRestClient(content.encode())
+        client.bank = AsyncRestStub(  # type: ignore
+            BankRestClient(rest_client),
+            client._executor,  # type: ignore # pylint: disable=protected-access
+        )
+
+        balance = await asyncio.gather(
+            *[client.query_bank_balance("fetch1address") for _ in range(4)]  # type: ignore
+        )
+        assert balance == [1234] * 4
+        assert rest_client.last_base_url is not None
+        assert "by_denom?denom=atestfet" in rest_client.last_base_url
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def test_async_gas_strategies():
+    """Test both blocking and asyncio gas strategies can be used."""
+
+    async def _run():
+        client = AsyncLedgerClient(_rest_config())
+        tx = Transaction()
+        tx.add_message(MsgSend())
+
+        client.gas_strategy = OfflineMessageTableStrategy.default_table()
+        assert await client.estimate_gas_for_tx(tx) == 100_000
+
+        client.gas_strategy = AsyncSimulationGasStrategy(client, 2.0)
+        with patch.object(
+            client, "simulate_tx", AsyncMock(return_value=100_000)
+        ), patch.object(
+            client,
+            "query_consensus_params",
+            AsyncMock(
+                return_value=SimpleNamespace(
+                    params=SimpleNamespace(block=SimpleNamespace(max_gas=150_000))
+                )
+            ),
+        ):
+            assert await client.estimate_gas_for_tx(tx) == 150_000
+
+        with pytest.raises(RuntimeError):
+            client.gas_strategy = object()  # type: ignore
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def test_async_query_balances_bulk():
+    """Test the asyncio balance snapshot pins every query to the same height."""
+
+    async def _run():
+        client = AsyncLedgerClient(_rest_config())
+        client.bank = MagicMock()
+        client.bank.AllBalances = AsyncMock(
+            return_value=QueryAllBalancesResponse(
+                balances=[Coin(denom="atestfet", amount="5")]
+            )
+        )
+        snapshot = await client.query_balances_bulk(["a", "b", "c"], height=8)
+        assert snapshot.balances == {k: {"atestfet": 5} for k in "abc"}
+        assert client.bank.AllBalances.await_args.kwargs["metadata"] == [
+            ("x-cosmos-block-height", "8")
+        ]
+        await client.close()
+
+    asyncio.run(_run())
+
+
+def test_async_broadcast_many():
+    """Test asyncio broadcasts of serialized transactions in async mode."""
+
+    async def _run():
+        client = AsyncLedgerClient(_rest_config())
+        client.txs = MagicMock()
+        client.txs.BroadcastTx = AsyncMock(return_value=BroadcastTxResponse())
+        raws = [bytes([index]) * 8 for index in range(10)]
+
+        submitted = await client.broadcast_many(
+            raws, BroadcastMode.BROADCAST_MODE_ASYNC, max_in_flight=3
+        )
+
+        assert [s.tx_hash for s in submitted] == [
+            hashlib.sha256(raw).hexdigest().upper() for raw in raws
+        ]
+        assert client.txs.BroadcastTx.await_count == 10
+        assert await client.broadcast_many([]) == []
+        await client.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test offline signing of many transactions."""
+
+import pytest
+
+from cosmpy.aerial.batch_signer import BatchSigner
+from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee, TxState
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+PRIVATE_KEY = PrivateKey(b"\x01" * 32)
+SENDER = Address(PRIVATE_KEY.public_key)
+RECIPIENT = Address(PrivateKey(b"\x02" * 32).public_key)
+FEE = TxFee(amount="1000atestfet", gas_limit=100000)
+
+
+def _msgs(count):
+    return [
+        [create_bank_send_msg(SENDER, RECIPIENT, amount + 1, "atestfet")]
+        for amount in range(count)
+    ]
+
+
+def _expected(msg_lists, start_sequence):
+    expected = []
+    for offset, msgs in enumerate(msg_lists):
+        tx = Transaction()
+        for msg in msgs:
+            tx.add_message(msg)
+        tx.seal(SigningCfg.direct(PRIVATE_KEY.public_key, start_sequence + offset), FEE)
+        tx.sign(PRIVATE_KEY, "test-chain", 7, deterministic=True)
+        tx.complete()
+        expected.append(tx.tx.SerializeToString())
+    return expected
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sign_messages_matches_transaction_sign(max_workers):
+    """Test batch signatures are identical to the ones of Transaction.sign."""
+    msg_lists = _msgs(5)
+    with BatchSigner(
+        PRIVATE_KEY, "test-chain", 7, max_workers=max_workers, chunk_size=2
+    ) as signer:
+        signed = signer.sign_messages(msg_lists, start_sequence=10, fee=FEE)
+
+    assert signed == _expected(msg_lists, 10)
+
+
+def test_sign_transactions_completes_them():
+    """Test sealed transactions are signed in place and unsealed ones rejected."""
+    tx = Transaction()
+    tx.add_message(create_bank_send_msg(SENDER, RECIPIENT, 1, "atestfet"))
+    signer = BatchSigner(PRIVATE_KEY, "test-chain", 7)
+
+    with pytest.raises(RuntimeError):
+        signer.sign_transactions([tx])
+
+    tx.seal(SigningCfg.direct(PRIVATE_KEY.public_key, 3), FEE)
+    [signed] = signer.sign_transactions([tx])
+
+    assert tx.state == TxState.Final
+    assert tx.tx.SerializeToString() == signed
+    assert PRIVATE_KEY.public_key.verify(
+        signer._sign_doc(  # pylint: disable=protected-access
+            tx.tx.body.SerializeToString(), tx.tx.auth_info.SerializeToString()
+        ),
+        tx.tx.signatures[0],
+    )
+
+
+def test_add_signatures_checks_the_signers():
+    """Test precomputed signatures are only added to sealed transactions."""
+    tx = Transaction()
+    tx.add_message(create_bank_send_msg(SENDER, RECIPIENT, 1, "atestfet"))
+    with pytest.raises(RuntimeError):
+        tx.add_signatures([b"sig"])
+
+    tx.seal(SigningCfg.direct(PRIVATE_KEY.public_key, 3), FEE)
+    with pytest.raises(ValueError):
+        tx.add_signatures([b"sig", b"other"])
+
+    tx.add_signatures([b"sig"]).complete()
+    assert list(tx.tx.signatures) == [b"sig"]
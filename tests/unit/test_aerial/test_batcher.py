@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the coalescing of messages into multi-message transactions."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.client.batcher import TxBatcher
+from cosmpy.aerial.exceptions import BroadcastError
+from cosmpy.aerial.gas import SimulationGasStrategy
+from cosmpy.aerial.tx_helpers import MessageLog
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import LocalWallet
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+WALLET = LocalWallet(PrivateKey(b"\x01" * 32))
+GAS_PER_MESSAGE = 100_000
+
+
+def _client(fail_broadcast: bool = False):
+    client = MagicMock()
+    client.network_config.chain_id = "test-chain"
+    client.query_account.side_effect = lambda address: Account(address, 42, 5)
+    client.gas_strategy.block_gas_limit.return_value = -1
+    client.estimate_gas_and_fee_for_tx.side_effect = lambda tx: (
+        GAS_PER_MESSAGE * len(tx.msgs),
+        "1atestfet",
+    )
+    client.broadcasts = []
+
+    def _broadcast(tx):
+        if fail_broadcast:
+            raise BroadcastError("hash", "rejected")
+        client.broadcasts.append(tx)
+        submitted = MagicMock()
+        submitted.response.logs = [
+            MessageLog(index, f"log {index}", {}) for index in range(len(tx.msgs))
+        ]
+        return submitted
+
+    client.broadcast_tx.side_effect = _broadcast
+    return client
+
+
+def _msg(amount: int):
+    return create_bank_send_msg(WALLET.address(), WALLET.address(), amount, "atestfet")
+
+
+def test_messages_are_packed_by_count():
+    """Test messages of many callers share transactions and get their own log."""
+    client = _client()
+    with TxBatcher(client, WALLET, max_messages=10, flush_interval_secs=60) as batcher:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = list(
+                executor.map(lambda i: batcher.submit(_msg(i + 1)), range(25))
+            )
+
+    assert [len(tx.msgs) for tx in client.broadcasts] == [10, 10, 5]
+    assert [tx.tx.auth_info.signer_infos[0].sequence for tx in client.broadcasts] == [
+        5,
+        6,
+        7,
+    ]
+    assert all(len(tx.tx.signatures[0]) == 64 for tx in client.broadcasts)
+    sent = {
+        (id(tx), index): msg.amount[0].amount
+        for tx in client.broadcasts
+        for index, msg in enumerate(tx.msgs)
+    }
+    assert sorted(int(amount) for amount in sent.values()) == list(range(1, 26))
+    assert all(isinstance(future.result(), MessageLog) for future in futures)
+
+
+def test_gas_budget_splits_transactions():
+    """Test transactions over the gas budget are split, keeping message order."""
+    client = _client()
+    batcher = TxBatcher(
+        client, WALLET, max_messages=8, gas_budget=300_000, flush_interval_secs=60
+    )
+    futures = [batcher.submit(_msg(i + 1)) for i in range(8)]
+    batcher.close()
+
+    assert [len(tx.msgs) for tx in client.broadcasts] == [3, 3, 2]
+    assert [
+        int(msg.amount[0].amount) for tx in client.broadcasts for msg in tx.msgs
+    ] == list(range(1, 9))
+    assert [tx.fee.gas_limit for tx in client.broadcasts] == [300_000, 300_000, 200_000]
+    assert [future.result().log for future in futures] == [
+        "log 0",
+        "log 1",
+        "log 2",
+    ] * 2 + ["log 0", "log 1"]
+
+
+def test_clipped_gas_estimates_split_transactions():
+    """Test transactions are split when the gas strategy clips the estimates."""
+    client = _client()
+    client.simulate_tx.side_effect = lambda tx: GAS_PER_MESSAGE * len(tx.msgs)
+    client.query_consensus_params.return_value.params.block.max_gas = 300_000
+    client.gas_strategy = SimulationGasStrategy(client, multiplier=1.0)
+    client.estimate_gas_and_fee_for_tx.side_effect = lambda tx: (
+        client.gas_strategy.estimate_gas(tx),
+        "1atestfet",
+    )
+    batcher = TxBatcher(client, WALLET, max_messages=8, flush_interval_secs=60)
+    for i in range(8):
+        batcher.submit(_msg(i + 1))
+    batcher.close()
+
+    assert [len(tx.msgs) for tx in client.broadcasts] == [2, 2, 2, 2]
+    assert [tx.fee.gas_limit for tx in client.broadcasts] == [200_000] * 4
+
+
+def test_failing_messages_only_fail_their_future():
+    """Test a message failing simulation is bisected out of its transaction."""
+    client = _client()
+
+    def _estimate(tx):
+        if any(msg.amount[0].amount in ("4", "7") for msg in tx.msgs):
+            raise RuntimeError("insufficient funds")
+        return GAS_PER_MESSAGE * len(tx.msgs), "1atestfet"
+
+    client.estimate_gas_and_fee_for_tx.side_effect = _estimate
+    batcher = TxBatcher(client, WALLET, max_messages=8, flush_interval_secs=60)
+    futures = [batcher.submit(_msg(i + 1)) for i in range(8)]
+    batcher.close()
+
+    assert [
+        [int(msg.amount[0].amount) for msg in tx.msgs] for tx in client.broadcasts
+    ] == [[1, 2, 3], [5, 6], [8]]
+    assert [tx.tx.auth_info.signer_infos[0].sequence for tx in client.broadcasts] == [
+        5,
+        6,
+        7,
+    ]
+    for index in (3, 6):
+        with pytest.raises(RuntimeError, match="insufficient funds"):
+            futures[index].result()
+    assert all(
+        isinstance(future.result(), MessageLog)
+        for index, future in enumerate(futures)
+        if index not in (3, 6)
+    )
+
+
+def test_flush_on_time_and_failures():
+    """Test messages are flushed after the interval, and failures reach futures."""
+    client = _client(fail_broadcast=True)
+    batcher = TxBatcher(client, WALLET, flush_interval_secs=0.05)
+    future = batcher.submit(_msg(1))
+
+    with pytest.raises(BroadcastError):
+        future.result(timeout=5)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(_msg(2))
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the concurrent streaming of block ranges."""
+
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from cosmpy.aerial.client import LedgerClient
+from cosmpy.aerial.client.blocks import (
+    FileBlockCheckpointStore,
+    MAX_BLOCK_INDEX_ATTEMPTS,
+    MemoryBlockCheckpointStore,
+    iter_blocks,
+)
+from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.types import Block
+from cosmpy.protos.cosmos.base.abci.v1beta1.abci_pb2 import TxResponse as PbTxResponse
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import (
+    GetBlockByHeightResponse,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import GetTxsEventResponse
+from cosmpy.protos.cosmos.tx.v1beta1.tx_pb2 import Tx, TxBody
+from cosmpy.protos.tendermint.types.block_pb2 import Block as PbBlock
+from cosmpy.protos.tendermint.types.types_pb2 import Data, Header
+
+
+class MockChain:
+    """Chain growing by one block per height query, with slow block queries."""
+
+    _query_interval_secs = 0
+
+    def __init__(self, height, max_height):
+        """Init the mock chain.
+
+        :param height: initial height
+        :param max_height: height at which the chain stops growing
+        """
+        self.height = height
+        self.max_height = max_height
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def query_height(self):
+        """Query the height, committing the next block.
+
+        :return: height
+        """
+        self.height = min(self.height + 1, self.max_height)
+        return self.height
+
+    def query_block_with_txs(self, height):
+        """Query the block, taking a random time.
+
+        :param height: height
+        :return: block
+        """
+        assert height <= self.height
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(random.uniform(0, 0.005))  # nosec
+        with self.lock:
+            self.in_flight -= 1
+        return Block(height, datetime.now(), "test-chain", [])
+
+
+def test_blocks_are_yielded_in_order():
+    """Test concurrently fetched blocks come out in height order."""
+    chain = MockChain(height=150, max_height=150)
+
+    heights = [block.height for block in iter_blocks(chain, 1, 100, concurrency=8)]
+
+    assert heights == list(range(1, 101))
+    assert 1 < chain.max_in_flight <= 8
+
+
+def test_follow_tip_and_resume(tmp_path):
+    """Test the stream waits for new blocks and resumes after its checkpoint."""
+    chain = MockChain(height=5, max_height=30)
+    checkpoint = FileBlockCheckpointStore(str(tmp_path / "blocks"))
+
+    stream = iter_blocks(chain, 1, checkpoint=checkpoint, concurrency=4)
+    heights = [next(stream).height for _ in range(20)]
+    stream.close()
+
+    assert heights == list(range(1, 21))
+    # the last block was not processed, since the next one was not requested
+    assert checkpoint.load() == 19
+
+    resumed = iter_blocks(chain, 1, 25, checkpoint=checkpoint)
+    assert [block.height for block in resumed] == list(range(20, 26))
+    assert checkpoint.load() == 25
+
+    memory = MemoryBlockCheckpointStore(24)
+    assert [block.height for block in iter_blocks(chain, 1, 25, 2, memory)] == [25]
+
+
+def test_unindexed_blocks_are_retried_and_not_checkpointed():
+    """Test blocks missing responses are queried again and never checkpointed."""
+    chain = MockChain(height=10, max_height=10)
+    attempts = {3: 2, 5: MAX_BLOCK_INDEX_ATTEMPTS}
+    query_block = chain.query_block_with_txs
+
+    def _query_block_with_txs(height):
+        block = query_block(height)
+        indexed = attempts.get(height, 0) == 0
+        attempts[height] = max(0, attempts.get(height, 0) - 1)
+        block.tx_responses = [MagicMock() if indexed else None]
+        return block
+
+    chain.query_block_with_txs = _query_block_with_txs
+    checkpoint = MemoryBlockCheckpointStore()
+
+    blocks = list(iter_blocks(chain, 1, 8, checkpoint=checkpoint, poll_interval_secs=0))
+
+    assert [block.height for block in blocks] == list(range(1, 9))
+    assert blocks[2].tx_responses[0] is not None
+    assert blocks[4].tx_responses == [None]
+    assert checkpoint.load() == 4
+
+
+def test_query_block_with_txs():
+    """Test the transactions and responses of a block are returned in order."""
+    raws = [
+        Tx(body=TxBody(memo=f"tx {index}")).SerializeToString() for index in range(3)
+    ]
+    hashes = [hashlib.sha256(raw).hexdigest().upper() for raw in raws]
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.tendermint = MagicMock()
+    client.tendermint.GetBlockByHeight.return_value = GetBlockByHeightResponse(
+        block=PbBlock(
+            header=Header(height=7, chain_id="test-chain"), data=Data(txs=raws)
+        )
+    )
+    # the node returns the responses out of order, two per page
+    pages = [[hashes[2], hashes[0]], [hashes[1]]]
+    client.txs = MagicMock()
+    client.txs.GetTxsEvent.side_effect = lambda req: GetTxsEventResponse(
+        tx_responses=[
+            PbTxResponse(txhash=tx_hash, height=7) for tx_hash in pages[req.page - 1]
+        ]
+    )
+
+    block = client.query_block_with_txs(7)
+
+    assert [tx.body.memo for tx in block.txs] == ["tx 0", "tx 1", "tx 2"]
+    assert [response.hash for response in block.tx_responses] == hashes
+    assert client.txs.GetTxsEvent.call_count == 2
+    assert client.txs.GetTxsEvent.call_args.args[0].query == "tx.height=7"
+
+
+def test_query_block_with_missing_tx_responses():
+    """Test a node repeating the same page gives a partial result."""
+    raws = [
+        Tx(body=TxBody(memo=f"tx {index}")).SerializeToString() for index in range(3)
+    ]
+    hashes = [hashlib.sha256(raw).hexdigest().upper() for raw in raws]
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.tendermint = MagicMock()
+    client.tendermint.GetBlockByHeight.return_value = GetBlockByHeightResponse(
+        block=PbBlock(
+            header=Header(height=7, chain_id="test-chain"), data=Data(txs=raws)
+        )
+    )
+    # the node ignores the page number, and lacks the last response
+    client.txs = MagicMock()
+    client.txs.GetTxsEvent.return_value = GetTxsEventResponse(
+        tx_responses=[PbTxResponse(txhash=tx_hash, height=7) for tx_hash in hashes[:2]]
+    )
+
+    block = client.query_block_with_txs(7)
+
+    assert [response.hash for response in block.tx_responses[:2]] == hashes[:2]
+    assert block.tx_responses[2] is None
+    assert client.txs.GetTxsEvent.call_count == 2
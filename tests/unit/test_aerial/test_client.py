@@ -22,7 +22,11 @@
 
 
 import datetime
+import hashlib
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
 
+import pytest
 from google.protobuf.timestamp_pb2 import Timestamp
 
 from cosmpy.aerial.client import (
@@ -31,8 +35,45 @@ from cosmpy.aerial.client import (
     DEFAULT_QUERY_TIMEOUT_SECS,
     LedgerClient,
 )
+from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.client.utils import prepare_basic_transaction
 from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.exceptions import BroadcastError
+from cosmpy.aerial.gas import SimulationGasStrategy
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee, TxState
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import LocalWallet
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.keypairs import PrivateKey
+from cosmpy.protos.cosmos.bank.v1beta1.query_pb2 import (
+    QueryAllBalancesResponse,
+    QueryBalanceResponse,
+)
+from cosmpy.protos.cosmos.base.abci.v1beta1.abci_pb2 import GasInfo
 from cosmpy.protos.cosmos.base.abci.v1beta1.abci_pb2 import TxResponse as PbTxResponse
+from cosmpy.protos.cosmos.base.v1beta1.coin_pb2 import Coin, DecCoin
+from cosmpy.protos.cosmos.distribution.v1beta1.distribution_pb2 import (
+    DelegationDelegatorReward,
+)
+from cosmpy.protos.cosmos.distribution.v1beta1.query_pb2 import (
+    QueryDelegationTotalRewardsResponse,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2 import (
+    QueryDelegatorDelegationsResponse,
+    QueryDelegatorUnbondingDelegationsResponse,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.staking_pb2 import (
+    Delegation,
+    DelegationResponse,
+    UnbondingDelegation,
+    UnbondingDelegationEntry,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.service_pb2 import (
+    BroadcastMode,
+    BroadcastTxResponse,
+    SimulateResponse,
+)
+from cosmpy.protos.cosmos.tx.v1beta1.tx_pb2 import SignDoc, TxRaw
 from cosmpy.protos.tendermint.types.block_pb2 import Block as PbBlock
 from cosmpy.protos.tendermint.types.types_pb2 import Data, Header
 
@@ -124,3 +165,198 @@ def test_parse_block():
         "27CA64C092A959C7EDC525ED45E845B1DE6A7590D173FD2FAD9133C8A779A1E3",
     ]
     assert block.chain_id == chain_id
+
+
+def test_query_staking_summary():
+    """Test staking summary is built from a constant number of queries."""
+    validators = [
+        "fetchvaloper10xcqpzrky6eff2g52qdye53xkk9jxkvrhevm3n",
+        "fetchvaloper1a0qwuze2h85zw7nqpsj3ga0z9geyrgwppx34t7",
+    ]
+    delegator = "fetch1g975h6gdx5mryeac72h6lj2nzygugxhyemp022"
+
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.staking = MagicMock()
+    client.distribution = MagicMock()
+
+    client.staking.DelegatorDelegations.return_value = (
+        QueryDelegatorDelegationsResponse(
+            delegation_responses=[
+                DelegationResponse(
+                    delegation=Delegation(validator_address=validator),
+                    balance=Coin(denom="atestfet", amount="1000"),
+                )
+                for validator in validators
+            ]
+        )
+    )
+    client.distribution.DelegationTotalRewards.return_value = (
+        QueryDelegationTotalRewardsResponse(
+            rewards=[
+                DelegationDelegatorReward(
+                    validator_address=validators[0],
+                    reward=[
+                        DecCoin(denom="nanomobx", amount="7"),
+                        DecCoin(denom="atestfet", amount="12.5"),
+                    ],
+                )
+            ]
+        )
+    )
+    client.staking.DelegatorUnbondingDelegations.return_value = (
+        QueryDelegatorUnbondingDelegationsResponse(
+            unbonding_responses=[
+                UnbondingDelegation(
+                    validator_address=validators[1],
+                    entries=[
+                        UnbondingDelegationEntry(balance="10"),
+                        UnbondingDelegationEntry(balance="20"),
+                    ],
+                )
+            ]
+        )
+    )
+
+    summary = client.query_staking_summary(Address(delegator))
+
+    assert [p.validator for p in summary.current_positions] == [
+        Address(v) for v in validators
+    ]
+    assert [p.amount for p in summary.current_positions] == [1000, 1000]
+    assert [p.reward for p in summary.current_positions] == [12, 0]
+    assert summary.current_positions[0].reward_dec == Decimal("12.5")
+    assert summary.current_positions[1].reward_dec == Decimal(0)
+    assert summary.unbonding_positions[0].validator == Address(validators[1])
+    assert summary.unbonding_positions[0].amount == 30
+
+    client.distribution.DelegationRewards.assert_not_called()
+    assert client.distribution.DelegationTotalRewards.call_count == 1
+    assert client.staking.DelegatorDelegations.call_count == 1
+    assert client.staking.DelegatorUnbondingDelegations.call_count == 1
+
+
+def test_query_balances_bulk():
+    """Test the balance snapshot pins every query to the same height."""
+    addresses = [Address(PrivateKey(bytes([i + 1]) * 32).public_key) for i in range(20)]
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.bank = MagicMock()
+    client.bank.AllBalances.side_effect = lambda req, metadata: (
+        QueryAllBalancesResponse(
+            balances=[Coin(denom="atestfet", amount=str(len(req.address)))]
+        )
+    )
+    client.bank.Balance.side_effect = lambda req, metadata: QueryBalanceResponse(
+        balance=Coin(denom=req.denom, amount="7" if req.denom == "afet" else "")
+    )
+
+    with patch.object(client, "query_height", return_value=123):
+        snapshot = client.query_balances_bulk(addresses, max_in_flight=4)
+    assert snapshot.height == 123
+    assert snapshot.balances == {str(a): {"atestfet": 44} for a in addresses}
+    assert snapshot.balance(addresses[0], "atestfet") == 44
+    assert snapshot.balance(addresses[0], "afet") == 0
+    assert client.bank.AllBalances.call_count == 20
+    assert {
+        tuple(call.kwargs["metadata"])
+        for call in client.bank.AllBalances.call_args_list
+    } == {(("x-cosmos-block-height", "123"),)}
+
+    snapshot = client.query_balances_bulk(
+        addresses[:2], denoms=["afet", "atestfet"], height=99
+    )
+    assert snapshot.height == 99
+    assert snapshot.balances[str(addresses[1])] == {"afet": 7, "atestfet": 0}
+    assert client.bank.Balance.call_args.kwargs["metadata"] == [
+        ("x-cosmos-block-height", "99")
+    ]
+
+
+def test_prepare_basic_transaction_signs_once():
+    """Test auto-gas transactions are simulated unsigned, then signed once."""
+    wallet = LocalWallet(PrivateKey(bytes([1]) * 32))
+    signer = MagicMock(wraps=wallet.signer())
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.gas_strategy = SimulationGasStrategy(client, 1.5)
+    client.txs = MagicMock()
+    client.txs.Simulate.return_value = SimulateResponse(
+        gas_info=GasInfo(gas_used=100_000)
+    )
+
+    tx = Transaction()
+    tx.add_message(create_bank_send_msg(wallet.address(), wallet.address(), 1, "afet"))
+    with patch.object(wallet, "signer", return_value=signer), patch.object(
+        client, "query_consensus_params", side_effect=RuntimeError
+    ), patch.object(client, "query_params", return_value={"max_gas": "-1"}):
+        prepare_basic_transaction(
+            client, tx, wallet, Account(wallet.address(), 3, 7), timeout_height=50
+        )
+
+    simulated = TxRaw.FromString(client.txs.Simulate.call_args.args[0].tx_bytes)
+    assert list(simulated.signatures) == [b""]
+    assert simulated.body_bytes == tx.body_bytes
+    assert signer.sign.call_count == 1
+
+    assert tx.state == TxState.Final
+    assert tx.fee.gas_limit == 150_000
+    assert tx.tx.body.timeout_height == 50
+    assert tx.tx.auth_info.fee.gas_limit == 150_000
+    assert tx.tx_bytes == tx.tx.SerializeToString()
+    assert wallet.public_key().verify(
+        SignDoc(
+            body_bytes=tx.body_bytes,
+            auth_info_bytes=tx.auth_info_bytes,
+            chain_id=client.network_config.chain_id,
+            account_number=3,
+        ).SerializeToString(),
+        tx.tx.signatures[0],
+    )
+
+
+def test_broadcast_tx_bytes():
+    """Test async broadcasts skip CheckTx results, and sync ones check them."""
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.txs = MagicMock()
+    client.txs.BroadcastTx.side_effect = lambda req: BroadcastTxResponse(
+        tx_response=PbTxResponse(
+            txhash=hashlib.sha256(req.tx_bytes).hexdigest().upper(),
+            code=13 if req.tx_bytes == b"cheap" else 0,
+            raw_log="insufficient fee",
+        )
+    )
+
+    submitted = client.broadcast_tx_bytes(b"raw", BroadcastMode.BROADCAST_MODE_ASYNC)
+    assert submitted.tx_hash == hashlib.sha256(b"raw").hexdigest().upper()
+    assert (
+        client.txs.BroadcastTx.call_args.args[0].mode
+        == BroadcastMode.BROADCAST_MODE_ASYNC
+    )
+    assert client.broadcast_tx_bytes(b"raw").tx_hash == submitted.tx_hash
+
+    client.broadcast_tx_bytes(b"cheap", BroadcastMode.BROADCAST_MODE_ASYNC)
+    with pytest.raises(BroadcastError):
+        client.broadcast_tx_bytes(b"cheap")
+
+
+def test_broadcast_many():
+    """Test many transactions are broadcast concurrently, keeping their order."""
+    wallet = LocalWallet(PrivateKey(bytes([1]) * 32))
+    client = LedgerClient(NetworkConfig.fetchai_stable_testnet())
+    client.txs = MagicMock()
+    client.txs.BroadcastTx.return_value = BroadcastTxResponse()
+
+    tx = Transaction()
+    tx.add_message(create_bank_send_msg(wallet.address(), wallet.address(), 1, "afet"))
+    tx.seal(SigningCfg.direct(wallet.public_key(), 0), TxFee("1afet", 100))
+    tx.sign(wallet.signer(), "test", 0)
+    tx.complete()
+    raws = [bytes([index]) * 8 for index in range(20)]
+
+    submitted = client.broadcast_many(
+        [tx] + raws, BroadcastMode.BROADCAST_MODE_ASYNC, max_in_flight=4
+    )
+
+    assert submitted[0].tx is tx
+    assert [s.tx_hash for s in submitted] == [
+        hashlib.sha256(raw).hexdigest().upper() for raw in [tx.tx_bytes] + raws
+    ]
+    assert client.txs.BroadcastTx.call_count == 21
@@ -24,7 +24,9 @@ import pytest
 from cosmpy.aerial.client import LedgerClient
 from cosmpy.aerial.config import NetworkConfig
 from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
-from cosmpy.aerial.tx_helpers import SubmittedTx
+from cosmpy.aerial.tx_helpers import LazyTxResponse, SubmittedTx
+from cosmpy.protos.cosmos.base.abci.v1beta1.abci_pb2 import TxResponse as PbTxResponse
+from cosmpy.protos.tendermint.abci.types_pb2 import Event, EventAttribute
 
 
 def test_broadcast_tx_timeouts():
@@ -45,3 +47,49 @@ def test_broadcast_tx_timeouts():
     ):
         with pytest.raises(QueryTimeoutError):
             tx.wait_to_complete(timeout=0.1, poll_period=0.2)
+
+
+def _event(event_type, **attributes):
+    return Event(
+        type=event_type,
+        attributes=[EventAttribute(key=k, value=v) for k, v in attributes.items()],
+    )
+
+
+def test_lazy_tx_response_events():
+    """Test repeated events are kept in order and looked up by type."""
+    proto = PbTxResponse(
+        txhash="HASH",
+        code=0,
+        gas_used=10,
+        events=[
+            _event("message", action="send"),
+            _event("transfer", recipient="a", amount="1afet"),
+            _event("transfer", recipient="b", amount="2afet"),
+            _event("store_code", code_id="7"),
+        ],
+        timestamp="2023-05-09T08:21:03Z",
+    )
+
+    response = LazyTxResponse(proto)
+    assert response.is_successful()
+    assert response.proto is proto
+    assert response.timestamp.year == 2023
+
+    events = response.event_map
+    assert len(events) == 4
+    assert events.types() == ["message", "transfer", "store_code"]
+    assert [event.get("recipient") for event in events.by_type("transfer")] == [
+        "a",
+        "b",
+    ]
+    assert events.values("transfer", "amount") == ["1afet", "2afet"]
+    assert events.first("transfer", "recipient") == "a"
+    assert events.first("burn", "amount", "none") == "none"
+    assert events[0].attributes == [("action", "send")]
+
+    assert response.events["transfer"] == {"recipient": "b", "amount": "2afet"}
+    assert SubmittedTx(Mock(), "HASH").contract_code_id is None
+    submitted = SubmittedTx(Mock(), "HASH")
+    submitted.response = response
+    assert submitted.contract_code_id == 7
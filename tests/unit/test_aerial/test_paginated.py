@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the paginated requests."""
+
+import asyncio
+import threading
+
+import pytest
+
+from cosmpy.aerial.client.aio.utils import get_paginated as async_get_paginated
+from cosmpy.aerial.client.aio.utils import iter_paginated as async_iter_paginated
+from cosmpy.aerial.client.utils import get_paginated, iter_paginated
+from cosmpy.protos.cosmos.base.query.v1beta1.pagination_pb2 import PageResponse
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2 import (
+    QueryValidatorsRequest,
+    QueryValidatorsResponse,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.staking_pb2 import Validator
+
+
+class MockValidators:
+    """Validators endpoint paginated by key and by offset."""
+
+    def __init__(self, count, count_total=True):
+        """Init the endpoint.
+
+        :param count: number of validators
+        :param count_total: whether the endpoint reports the total count
+        """
+        self.operators = [f"validator-{i:03}" for i in range(count)]
+        self.count_total = count_total
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        """Serve a page.
+
+        :param request: validators request
+        :return: validators response
+        """
+        with self._lock:
+            self.requests.append(request)
+        limit = request.pagination.limit or 10
+        start = int(request.pagination.key or request.pagination.offset or 0)
+        end = start + limit
+        return QueryValidatorsResponse(
+            validators=[
+                Validator(operator_address=o) for o in self.operators[start:end]
+            ],
+            pagination=PageResponse(
+                next_key=str(end).encode() if end < len(self.operators) else b"",
+                total=len(self.operators)
+                if request.pagination.count_total and self.count_total
+                else 0,
+            ),
+        )
+
+
+def _operators(pages):
+    return [v.operator_address for page in pages for v in page.validators]
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_paginated_by_key(prefetch):
+    """Test pages are streamed by key, with and without prefetching."""
+    endpoint = MockValidators(35)
+    pages = iter_paginated(
+        QueryValidatorsRequest(status="BOND_STATUS_BONDED"),
+        endpoint,
+        prefetch=prefetch,
+    )
+    first = next(pages)
+    assert len(first.validators) == 10
+    assert len(endpoint.requests) == (2 if prefetch else 1)
+
+    assert _operators([first, *pages]) == endpoint.operators
+    assert {r.status for r in endpoint.requests} == {"BOND_STATUS_BONDED"}
+
+    pages_limited = get_paginated(QueryValidatorsRequest(), endpoint, pages_limit=2)
+    assert _operators(pages_limited) == endpoint.operators[:20]
+
+    validators = iter_paginated(
+        QueryValidatorsRequest(), endpoint, prefetch=prefetch, field="validators"
+    )
+    assert [v.operator_address for v in validators] == endpoint.operators
+
+
+@pytest.mark.parametrize("count_total", [False, True])
+def test_iter_paginated_by_offset(count_total):
+    """Test offset pages are fetched concurrently and yielded in order."""
+    endpoint = MockValidators(95, count_total=count_total)
+    pages = list(
+        iter_paginated(
+            QueryValidatorsRequest(), endpoint, per_page_limit=10, concurrency=4
+        )
+    )
+    assert _operators(pages) == endpoint.operators
+    assert len(endpoint.requests) == 10
+    if count_total:
+        assert sorted(r.pagination.offset for r in endpoint.requests) == list(
+            range(0, 95, 10)
+        )
+
+    pages = list(
+        iter_paginated(
+            QueryValidatorsRequest(),
+            endpoint,
+            pages_limit=3,
+            per_page_limit=10,
+            concurrency=4,
+        )
+    )
+    assert _operators(pages) == endpoint.operators[:30]
+
+    validators = iter_paginated(
+        QueryValidatorsRequest(), endpoint, concurrency=4, field="validators"
+    )
+    assert [v.operator_address for v in validators] == endpoint.operators
+
+
+def test_async_iter_paginated():
+    """Test the asyncio paginated requests."""
+    endpoint = MockValidators(25)
+
+    async def _request(request):
+        return endpoint(request)
+
+    async def _run():
+        pages = [
+            p
+            async for p in async_iter_paginated(
+                QueryValidatorsRequest(), _request, prefetch=True
+            )
+        ]
+        assert _operators(pages) == endpoint.operators
+        pages = await async_get_paginated(QueryValidatorsRequest(), _request, 2)
+        assert _operators(pages) == endpoint.operators[:20]
+        operators = [
+            v.operator_address
+            async for v in async_iter_paginated(
+                QueryValidatorsRequest(), _request, field="validators"
+            )
+        ]
+        assert operators == endpoint.operators
+
+    asyncio.run(_run())
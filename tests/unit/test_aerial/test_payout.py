@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test resumable bulk payouts."""
+
+import hashlib
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cosmpy.aerial.client.bank import create_multi_send_msg
+from cosmpy.aerial.client.payout import PayoutEngine
+from cosmpy.aerial.exceptions import NotFoundError, PayoutError
+from cosmpy.aerial.gas import SimulationGasStrategy
+from cosmpy.aerial.tx_helpers import SubmittedTx
+from cosmpy.aerial.types import Account
+from cosmpy.aerial.wallet import LocalWallet
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+WALLET = LocalWallet(PrivateKey(b"\x01" * 32))
+GAS_PER_OUTPUT = 10_000
+PAYOUTS = [
+    (Address(PrivateKey(bytes([index + 2]) * 32).public_key), index + 1)
+    for index in range(25)
+]
+
+
+class MockChain:
+    """Chain committing one block, with the broadcast transactions, per height query."""
+
+    _query_interval_secs = 0
+
+    def __init__(self, block_gas_limit=-1):
+        """Init the mock chain.
+
+        :param block_gas_limit: block gas limit
+        """
+        self.height = 100
+        self.sequence = 5
+        self.mempool = []
+        self.blocks = {}
+        self.txs = {}
+        self.broadcasts = 0
+        self.crash_after_broadcast = None
+        self.network_config = MagicMock(chain_id="test-chain")
+        self.gas_strategy = MagicMock()
+        self.gas_strategy.block_gas_limit.return_value = block_gas_limit
+
+    def query_account(self, address):
+        """Query the account.
+
+        :param address: address
+        :return: account
+        """
+        return Account(address, 42, self.sequence)
+
+    def query_height(self):
+        """Query the height, committing the next block.
+
+        :return: height
+        """
+        self.height += 1
+        self.blocks[self.height] = []
+        for tx in self.mempool:
+            if tx.tx.body.timeout_height >= self.height:
+                tx_hash = hashlib.sha256(tx.tx_bytes).hexdigest().upper()
+                self.blocks[self.height].append(tx_hash)
+                self.txs[tx_hash] = tx
+        self.mempool = []
+        return self.height
+
+    def query_block(self, height):
+        """Query the block.
+
+        :param height: height
+        :return: block
+        """
+        return MagicMock(tx_hashes=self.blocks[height])
+
+    def query_tx(self, tx_hash):
+        """Query the tx.
+
+        :param tx_hash: tx hash
+        :raises NotFoundError: if the tx is not in a block
+        :return: tx response
+        """
+        if tx_hash.upper() not in self.txs:
+            raise NotFoundError()
+        return MagicMock(hash=tx_hash, is_successful=MagicMock(return_value=True))
+
+    @staticmethod
+    def estimate_gas_and_fee_for_tx(tx):
+        """Estimate the gas of a multi send transaction.
+
+        :param tx: transaction
+        :return: gas and fee
+        """
+        gas = GAS_PER_OUTPUT * len(tx.msgs[0].outputs)
+        return gas, f"{gas}atestfet"
+
+    @staticmethod
+    def estimate_fee_from_gas(gas_limit):
+        """Estimate the fee.
+
+        :param gas_limit: gas limit
+        :return: fee
+        """
+        return f"{gas_limit}atestfet"
+
+    def broadcast_tx(self, tx):
+        """Broadcast the tx, crashing after the configured number of broadcasts.
+
+        :param tx: transaction
+        :raises ConnectionError: if the client crashes
+        :return: submitted transaction
+        """
+        assert tx.tx.auth_info.signer_infos[0].sequence == self.sequence
+        self.sequence += 1
+        self.mempool.append(tx)
+        self.broadcasts += 1
+        if self.broadcasts == self.crash_after_broadcast:
+            raise ConnectionError("connection lost")
+        return SubmittedTx(self, hashlib.sha256(tx.tx_bytes).hexdigest())
+
+    def paid(self):
+        """Count the payments of each recipient in the committed transactions.
+
+        :return: number of payments by address
+        """
+        return Counter(
+            output.address
+            for tx in self.txs.values()
+            for msg in tx.msgs
+            for output in msg.outputs
+        )
+
+
+class ClippingChain(MockChain):
+    """Chain estimating the gas with a simulation strategy clipping to the block limit."""
+
+    def __init__(self):
+        """Init the mock chain."""
+        super().__init__()
+        self.gas_strategy = SimulationGasStrategy(self, multiplier=1.0)
+
+    @staticmethod
+    def query_consensus_params():
+        """Query the consensus params.
+
+        :return: consensus params
+        """
+        params = MagicMock()
+        params.params.block.max_gas = 100_000
+        return params
+
+    @staticmethod
+    def simulate_tx(tx):
+        """Simulate a multi send transaction.
+
+        :param tx: transaction
+        :return: gas used
+        """
+        return GAS_PER_OUTPUT * len(tx.msgs[0].outputs)
+
+    def estimate_gas_and_fee_for_tx(self, tx):  # pylint: disable=arguments-differ
+        """Estimate the gas of a transaction with the gas strategy.
+
+        :param tx: transaction
+        :return: gas and fee
+        """
+        gas = self.gas_strategy.estimate_gas(tx)
+        return gas, f"{gas}atestfet"
+
+
+def test_create_multi_send_msg():
+    """Test a single input funds all the outputs."""
+    msg = create_multi_send_msg(WALLET.address(), PAYOUTS[:3], "atestfet")
+
+    assert msg.inputs[0].address == str(WALLET.address())
+    assert msg.inputs[0].coins[0].amount == "6"
+    assert [(o.address, o.coins[0].amount) for o in msg.outputs] == [
+        (str(address), str(amount)) for address, amount in PAYOUTS[:3]
+    ]
+
+
+def test_payouts_are_chunked_to_the_gas_budget(tmp_path):
+    """Test payouts are split to fit the gas budget and paid exactly once."""
+    chain = MockChain(block_gas_limit=100_000)
+    engine = PayoutEngine(
+        chain, WALLET, "atestfet", str(tmp_path / "payout.json"), max_outputs=20
+    )
+
+    result = engine.run(PAYOUTS)
+
+    assert result.paid == len(PAYOUTS)
+    assert len(result.tx_hashes) == 3
+    assert chain.paid() == Counter(str(address) for address, _ in PAYOUTS)
+    # an estimate reaching the block gas limit may have been clipped
+    assert sorted(len(tx.msgs[0].outputs) for tx in chain.txs.values()) == [7, 9, 9]
+    assert sorted(tx.fee.gas_limit for tx in chain.txs.values()) == [
+        70_000,
+        90_000,
+        90_000,
+    ]
+
+    again = engine.run(PAYOUTS)
+    assert (again.paid, again.skipped) == (0, len(PAYOUTS))
+    assert chain.broadcasts == 3
+
+
+def test_chunks_fit_clipped_gas_estimates(tmp_path):
+    """Test chunks are shrunk when the gas strategy clips the estimates."""
+    chain = ClippingChain()
+    engine = PayoutEngine(
+        chain, WALLET, "atestfet", str(tmp_path / "payout.json"), max_outputs=30
+    )
+
+    result = engine.run(PAYOUTS)
+
+    assert result.paid == len(PAYOUTS)
+    assert sorted(len(tx.msgs[0].outputs) for tx in chain.txs.values()) == [7, 9, 9]
+
+
+def test_resume_after_crash_never_pays_twice(tmp_path):
+    """Test a run resumed after a crash skips the transactions in flight."""
+    chain = MockChain()
+    checkpoint = str(tmp_path / "payout.json")
+    chain.crash_after_broadcast = 2
+
+    with pytest.raises(ConnectionError):
+        PayoutEngine(chain, WALLET, "atestfet", checkpoint, max_outputs=10).run(PAYOUTS)
+
+    result = PayoutEngine(chain, WALLET, "atestfet", checkpoint, max_outputs=10).run(
+        PAYOUTS
+    )
+
+    assert (result.paid, result.skipped) == (5, 20)
+    assert chain.paid() == Counter(str(address) for address, _ in PAYOUTS)
+
+
+def test_resume_pays_expired_transactions(tmp_path):
+    """Test a transaction which never reached a block is paid again once expired."""
+    chain = MockChain()
+    checkpoint = str(tmp_path / "payout.json")
+    chain.crash_after_broadcast = 1
+    dropped = []
+    broadcast = chain.broadcast_tx
+
+    def _drop(tx):
+        try:
+            return broadcast(tx)
+        finally:
+            if not dropped:
+                dropped.append(chain.mempool.pop())
+
+    with patch.object(chain, "broadcast_tx", _drop), pytest.raises(ConnectionError):
+        PayoutEngine(
+            chain, WALLET, "atestfet", checkpoint, max_outputs=30, timeout_blocks=3
+        ).run(PAYOUTS)
+    chain.sequence -= 1
+
+    result = PayoutEngine(chain, WALLET, "atestfet", checkpoint, max_outputs=30).run(
+        PAYOUTS
+    )
+
+    assert result.paid == len(PAYOUTS)
+    assert chain.paid() == Counter(str(address) for address, _ in PAYOUTS)
+
+
+def test_expired_chunks_are_checked_on_chain(tmp_path):
+    """Test a chunk the tracker missed is confirmed, not dropped, once expired."""
+    chain = MockChain()
+    engine = PayoutEngine(
+        chain, WALLET, "atestfet", str(tmp_path / "payout.json"), timeout_blocks=2
+    )
+
+    with patch.object(chain, "query_block", return_value=MagicMock(tx_hashes=[])):
+        result = engine.run(PAYOUTS)
+
+    assert result.paid == len(PAYOUTS)
+    assert chain.broadcasts == 1
+
+
+def test_checkpoint_of_other_payouts_is_rejected(tmp_path):
+    """Test a checkpoint cannot be resumed with different payouts."""
+    chain = MockChain()
+    checkpoint = str(tmp_path / "payout.json")
+    PayoutEngine(chain, WALLET, "atestfet", checkpoint).run(PAYOUTS[:5])
+
+    with pytest.raises(PayoutError):
+        PayoutEngine(chain, WALLET, "atestfet", checkpoint).run(PAYOUTS[:6])
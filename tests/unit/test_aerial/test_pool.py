@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the endpoint pool."""
+
+from unittest.mock import MagicMock
+
+import grpc
+import pytest
+
+from cosmpy.aerial.client import LedgerClient
+from cosmpy.aerial.client.pool import EndpointPool, PooledStub, RoutingStrategy
+from cosmpy.aerial.config import NetworkConfig, NetworkConfigError
+
+
+URLS = ["grpc+http://node-a:9090", "grpc+http://node-b:9090", "grpc+http://node-c:9090"]
+
+
+class UnavailableError(grpc.RpcError):
+    """Error of an unreachable node."""
+
+    def code(self):
+        """Get the status code.
+
+        :return: status code
+        """
+        return grpc.StatusCode.UNAVAILABLE
+
+
+def _stub_factory(url):
+    stubs = {"bank": MagicMock(), "txs": MagicMock(), "tendermint": MagicMock()}
+    stubs["bank"].Balance.return_value = url
+    return stubs
+
+
+def _pool(routing=RoutingStrategy.ROUND_ROBIN):
+    return EndpointPool(
+        URLS, _stub_factory, routing=routing, health_check_interval_secs=0
+    )
+
+
+def test_round_robin_and_retry():
+    """Test requests are spread over the endpoints and retried on transient errors."""
+    pool = _pool()
+    bank = pool.stub("bank")
+    assert [bank.Balance("req") for _ in range(4)] == URLS + URLS[:1]
+
+    a, b, c = pool.endpoints
+    b.stubs["bank"].Balance.side_effect = UnavailableError()
+    results = {bank.Balance("req") for _ in range(4)}
+    assert results == {a.url, c.url}
+    assert not b.healthy
+    assert b.stubs["bank"].Balance.call_count == 2
+
+    for endpoint in pool.endpoints:
+        endpoint.stubs["bank"].Balance.side_effect = UnavailableError()
+    with pytest.raises(UnavailableError):
+        bank.Balance("req")
+
+    a.stubs["bank"].Balance.side_effect = ValueError()
+    c.healthy = a.healthy = True
+    with pytest.raises(ValueError):
+        pool.call("bank", "Balance", "req")
+
+
+def test_broadcast_is_not_retried():
+    """Test non idempotent requests are sent to a single endpoint."""
+    pool = _pool()
+    for endpoint in pool.endpoints:
+        endpoint.stubs["txs"].BroadcastTx.side_effect = UnavailableError()
+
+    with pytest.raises(UnavailableError):
+        pool.stub("txs").BroadcastTx("req")
+    assert sum(e.stubs["txs"].BroadcastTx.call_count for e in pool.endpoints) == 1
+
+
+def test_health_check_and_least_latency():
+    """Test lagging nodes are ejected and the fastest node is preferred."""
+    pool = _pool(RoutingStrategy.LEAST_LATENCY)
+    a, b, c = pool.endpoints
+    for endpoint, height in zip(pool.endpoints, (100, 90, 99)):
+        endpoint.stubs[
+            "tendermint"
+        ].GetLatestBlock.return_value.block.header.height = height
+
+    pool.check_health()
+    assert (a.healthy, b.healthy, c.healthy) == (True, False, True)
+    assert (a.height, b.height, c.height) == (100, 90, 99)
+
+    a.latency_secs, b.latency_secs, c.latency_secs = 0.5, 0.01, 0.1
+    assert pool.stub("bank").Balance("req") == c.url
+    c.latency_secs = None
+    assert pool.select() is a
+    c.latency_secs = 0.1
+
+    c.stubs["tendermint"].GetLatestBlock.side_effect = UnavailableError()
+    pool.check_health()
+    assert not c.healthy
+    assert pool.stub("bank").Balance("req") == a.url
+
+
+def test_ledger_client_with_several_urls():
+    """Test the ledger client pools the urls of the network."""
+    cfg = NetworkConfig.fetchai_stable_testnet()
+    cfg.url = URLS[0]
+    cfg.additional_urls = URLS[1:]
+    client = LedgerClient(cfg, health_check_interval_secs=0)
+    assert isinstance(client.bank, PooledStub)
+    assert client.endpoint_pool is not None
+    assert [e.url for e in client.endpoint_pool.endpoints] == URLS
+
+    cfg.additional_urls = ["http://node-d"]
+    with pytest.raises(NetworkConfigError):
+        cfg.validate()
+
+
+def test_close_stops_health_checks_and_connections():
+    """Test closing the ledger client stops the health thread and the channels."""
+    cfg = NetworkConfig.fetchai_stable_testnet()
+    cfg.url = URLS[0]
+    cfg.additional_urls = URLS[1:]
+    with LedgerClient(cfg, health_check_interval_secs=3600) as client:
+        pool = client.endpoint_pool
+        channels = [e.stubs["connection"] for e in pool.endpoints]
+        for channel in channels:
+            channel.close = MagicMock(wraps=channel.close)
+        health_thread = pool._health_thread  # pylint: disable=protected-access
+        assert health_thread.is_alive()
+
+    assert not health_thread.is_alive()
+    for channel in channels:
+        channel.close.assert_called_once_with()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the query and simulation caches."""
+
+import json
+from unittest.mock import MagicMock
+
+from cosmpy.aerial.client import LedgerClient
+from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.client.cache import QueryCache, SimulationCache, tx_fingerprint
+from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.gas import GasStrategy
+from cosmpy.aerial.tx import Transaction
+from cosmpy.aerial.tx_helpers import TxResponse
+from cosmpy.crypto.address import Address
+from cosmpy.protos.cosmos.base.tendermint.v1beta1.query_pb2 import (
+    GetLatestBlockResponse,
+)
+from cosmpy.protos.cosmos.staking.v1beta1.query_pb2 import QueryValidatorsResponse
+from cosmpy.protos.cosmos.staking.v1beta1.staking_pb2 import Validator as PbValidator
+from cosmpy.protos.cosmwasm.wasm.v1.tx_pb2 import MsgExecuteContract
+from cosmpy.protos.tendermint.types.block_pb2 import Block as PbBlock
+from cosmpy.protos.tendermint.types.types_pb2 import Header
+
+
+class Clock:
+    """Manual clock."""
+
+    def __init__(self):
+        """Init the clock."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Get the time.
+
+        :return: time
+        """
+        return self.now
+
+
+def test_ttl_and_counters():
+    """Test results expire after their time to live and hits are counted."""
+    clock = Clock()
+    cache = QueryCache(ttls={"a": 10, "b": None, "c": 0}, clock=clock)
+    fetch = MagicMock(side_effect=range(100))
+
+    assert cache.get_or_fetch("a", 1, fetch) == 0
+    assert cache.get_or_fetch("a", 1, fetch) == 0
+    assert cache.get_or_fetch("a", 2, fetch) == 1
+    clock.now = 10
+    assert cache.get_or_fetch("a", 1, fetch) == 2
+    clock.now = 1e9
+    assert cache.get_or_fetch("b", 1, fetch) == 3
+    assert cache.get_or_fetch("b", 1, fetch) == 3
+
+    # disabled and unknown methods are not cached
+    assert cache.get_or_fetch("c", 1, fetch) == 4
+    assert cache.get_or_fetch("d", 1, fetch) == 5
+    assert cache.get_or_fetch("d", 1, fetch) == 6
+
+    assert cache.hits == {"a": 1, "b": 1}
+    assert cache.misses == {"a": 3, "b": 1}
+
+    cache.invalidate("b")
+    assert cache.get_or_fetch("b", 1, fetch) == 7
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_lru_and_height_invalidation():
+    """Test least recently used results are evicted and blocks invalidate results."""
+    cache = QueryCache(
+        ttls={"a": None, "v": None}, max_entries=2, height_invalidated=["v"]
+    )
+    cache.get_or_fetch("a", 1, lambda: 1)
+    cache.get_or_fetch("a", 2, lambda: 2)
+    cache.get_or_fetch("a", 1, lambda: 0)
+    cache.get_or_fetch("a", 3, lambda: 3)
+    assert cache.get_or_fetch("a", 1, lambda: 0) == 1
+    assert cache.get_or_fetch("a", 2, lambda: 4) == 4
+
+    cache = QueryCache(ttls={"a": None, "v": None}, height_invalidated=["v"])
+    cache.observe_height(10)
+    cache.get_or_fetch("a", None, lambda: "a")
+    cache.get_or_fetch("v", None, lambda: "v")
+    cache.observe_height(10)
+    assert cache.get_or_fetch("v", None, lambda: "new") == "v"
+    cache.observe_height(11)
+    assert cache.get_or_fetch("v", None, lambda: "new") == "new"
+    assert cache.get_or_fetch("a", None, lambda: "new") == "a"
+
+    assert cache.get_or_fetch("a", 1, lambda: None) is None
+    assert cache.get_or_fetch("a", 1, lambda: "found") == "found"
+
+
+def test_ledger_client_cached_queries():
+    """Test the ledger client serves rarely changing queries from the cache."""
+    client = LedgerClient(
+        NetworkConfig.fetchai_stable_testnet(), query_cache=QueryCache()
+    )
+    client.tendermint = MagicMock()
+    client.tendermint.GetLatestBlock.return_value = GetLatestBlockResponse(
+        block=PbBlock(header=Header(chain_id="test-1", height=5))
+    )
+    client.consensus = MagicMock()
+    client.params = MagicMock()
+    client.params.Params.return_value.param.value = '{"max_gas": "100"}'
+
+    assert client.query_chain_id() == "test-1"
+    assert client.query_chain_id() == "test-1"
+    assert client.tendermint.GetLatestBlock.call_count == 1
+
+    assert client.query_consensus_params() is client.query_consensus_params()
+    assert client.consensus.Params.call_count == 1
+
+    assert client.query_params("baseapp", "BlockParams") == {"max_gas": "100"}
+    client.query_params("baseapp", "BlockParams")
+    client.query_params("baseapp", "ABCIParams")
+    assert client.params.Params.call_count == 2
+
+    assert client.query_height() == 5
+    assert client.tendermint.GetLatestBlock.call_count == 2
+
+    validator = Address(b"\x01" * 20, prefix="fetchvaloper")
+    client.staking = MagicMock()
+    client.staking.Validators.return_value = QueryValidatorsResponse(
+        validators=[PbValidator(operator_address=str(validator), tokens="1")]
+    )
+    validators = client.query_validators()
+    validators.clear()
+    assert [v.address for v in client.query_validators()] == [validator]
+    assert client.staking.Validators.call_count == 1
+
+
+def _tx(*msgs) -> Transaction:
+    tx = Transaction()
+    for msg in msgs:
+        tx.add_message(msg)
+    return tx
+
+
+def _execute(payload: dict, contract: str = "fetch1contract") -> MsgExecuteContract:
+    return MsgExecuteContract(contract=contract, msg=json.dumps(payload).encode())
+
+
+def test_tx_fingerprint():
+    """Test only the structure of the messages makes the fingerprint."""
+    send = _tx(create_bank_send_msg("fetch1a", "fetch1b", 1, "atestfet"))
+    other_send = _tx(create_bank_send_msg("fetch1c", "fetch1d", 999, "afet"))
+    swap = _tx(_execute({"swap": {"amount": "1", "to": "fetch1a"}}))
+
+    assert tx_fingerprint(send) == tx_fingerprint(other_send)
+    assert tx_fingerprint(swap) == tx_fingerprint(
+        _tx(_execute({"swap": {"to": "fetch1b", "amount": "250"}}))
+    )
+    assert tx_fingerprint(swap) != tx_fingerprint(_tx(_execute({"swap": {}})))
+    assert tx_fingerprint(swap) != tx_fingerprint(
+        _tx(_execute({"swap": {"amount": "1", "to": "fetch1a"}}, "fetch1other"))
+    )
+    assert tx_fingerprint(send) != tx_fingerprint(_tx(send.msgs[0], send.msgs[0]))
+    two_coins = create_bank_send_msg("fetch1a", "fetch1b", 1, "atestfet")
+    two_coins.amount.add(denom="afet", amount="1")
+    assert tx_fingerprint(send) != tx_fingerprint(_tx(two_coins))
+
+
+def test_simulation_cache_expiry():
+    """Test estimates expire with time, blocks and out of gas transactions."""
+    clock = Clock()
+    cache = SimulationCache(ttl=10, max_blocks=5, clock=clock)
+    tx = _tx(create_bank_send_msg("fetch1a", "fetch1b", 1, "atestfet"))
+
+    assert cache.get(tx) is None
+    cache.put(tx, 100_000)
+    assert cache.get(tx) == 100_000
+    clock.now = 10
+    assert cache.get(tx) is None
+
+    cache.observe_height(100)
+    cache.put(tx, 100_000)
+    cache.observe_height(104)
+    assert cache.get(tx) == 100_000
+    cache.observe_height(105)
+    assert cache.get(tx) is None
+
+    cache.put(tx, 100_000)
+    cache.observe(tx, TxResponse("h", 106, 0, 0, 1, "", [], {}, None))
+    assert cache.get(tx) == 100_000
+    cache.observe(tx, TxResponse("h", 106, 11, 0, 1, "out of gas", [], {}, None))
+    assert cache.get(tx) is None
+    assert (cache.hits, cache.misses) == (3, 4)
+
+
+def test_ledger_client_simulation_cache():
+    """Test steady load of identical transactions is simulated once."""
+    strategy = MagicMock(spec=GasStrategy)
+    strategy.estimate_gas.return_value = 150_000
+    client = LedgerClient(
+        NetworkConfig.fetchai_stable_testnet(), simulation_cache=SimulationCache()
+    )
+    client.gas_strategy = strategy
+
+    for amount in range(1, 101):
+        tx = _tx(_execute({"transfer": {"amount": str(amount)}}))
+        assert client.estimate_gas_for_tx(tx) == 150_000
+
+    assert strategy.estimate_gas.call_count == 1
+    assert client.simulation_cache is not None
+    assert client.simulation_cache.hit_rate == 0.99
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test local account sequence management."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cosmpy.aerial.client.aio.sequence import AsyncSequenceManager
+from cosmpy.aerial.client.sequence import SequenceManager
+from cosmpy.aerial.exceptions import AccountSequenceMismatchError, BroadcastError
+from cosmpy.aerial.tx_helpers import TxResponse
+from cosmpy.aerial.types import Account
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+ADDRESS = Address(PrivateKey(b"\x01" * 32).public_key)
+
+
+def _client(sequence=5):
+    client = MagicMock()
+    client.query_account.side_effect = lambda address: Account(address, 42, sequence)
+    return client
+
+
+def _mismatch(expected):
+    return AccountSequenceMismatchError(
+        "hash",
+        expected,
+        f"account sequence mismatch, expected {expected}, got 5: incorrect account sequence",
+    )
+
+
+def test_reserve_is_thread_safe():
+    """Test concurrent reservations get distinct sequences with a single query."""
+    client = _client()
+    manager = SequenceManager(client, ADDRESS)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        accounts = list(executor.map(lambda _: manager.reserve(), range(100)))
+
+    assert sorted(a.sequence for a in accounts) == list(range(5, 105))
+    assert {a.number for a in accounts} == {42}
+    assert manager.next_sequence == 105
+    assert client.query_account.call_count <= 8
+
+
+def test_prepare_and_broadcast_resyncs_on_mismatch():
+    """Test a sequence mismatch is recovered from with the expected sequence."""
+    client = _client()
+    manager = SequenceManager(client, ADDRESS)
+    used = []
+
+    def _broadcast(_client, _tx, _sender, account, *_args):
+        used.append(account.sequence)
+        if account.sequence == 5:
+            raise _mismatch(9)
+        return MagicMock()
+
+    with patch(
+        "cosmpy.aerial.client.sequence.prepare_and_broadcast_basic_transaction",
+        side_effect=_broadcast,
+    ):
+        manager.prepare_and_broadcast(MagicMock(), MagicMock())
+        manager.prepare_and_broadcast(MagicMock(), MagicMock())
+
+    assert used == [5, 9, 10]
+    assert client.query_account.call_count == 1
+
+
+def test_prepare_and_broadcast_releases_on_failure():
+    """Test the sequence of a failed broadcast is reused without querying again."""
+    client = _client()
+    manager = SequenceManager(client, ADDRESS)
+
+    with patch(
+        "cosmpy.aerial.client.sequence.prepare_and_broadcast_basic_transaction",
+        side_effect=BroadcastError("hash", "insufficient funds"),
+    ), pytest.raises(BroadcastError):
+        manager.prepare_and_broadcast(MagicMock(), MagicMock())
+
+    assert manager.next_sequence == 5
+    assert manager.reserve().sequence == 5
+    assert client.query_account.call_count == 1
+
+
+def test_release_keeps_later_reservations():
+    """Test only the latest reservation is rolled back when released."""
+    manager = SequenceManager(_client(), ADDRESS)
+    first, second, third = (manager.reserve() for _ in range(3))
+
+    manager.release(second)
+    assert manager.next_sequence == 8
+    manager.release(third)
+    assert manager.next_sequence == 7
+    assert first.sequence == 5
+
+    manager.resync()
+    manager.release(first)
+    assert manager.next_sequence is None
+
+
+def test_async_sequence_manager():
+    """Test the asyncio sequence manager hands out distinct sequences."""
+
+    async def _run():
+        client = MagicMock()
+        client.query_account = AsyncMock(return_value=Account(ADDRESS, 42, 3))
+        manager = AsyncSequenceManager(client, ADDRESS)
+
+        accounts = await asyncio.gather(*[manager.reserve() for _ in range(10)])
+        assert sorted(a.sequence for a in accounts) == list(range(3, 13))
+
+        used = []
+
+        async def _broadcast(_client, _tx, _sender, account, *_args):
+            used.append(account.sequence)
+            if account.sequence == 13:
+                raise _mismatch(20)
+            return MagicMock()
+
+        with patch(
+            "cosmpy.aerial.client.aio.sequence.prepare_and_broadcast_basic_transaction",
+            side_effect=_broadcast,
+        ):
+            await manager.prepare_and_broadcast(MagicMock(), MagicMock())
+        assert used == [13, 20]
+
+    asyncio.run(_run())
+
+
+def test_parse_sequence_mismatch():
+    """Test broadcast responses with a sequence mismatch raise a dedicated error."""
+    response = TxResponse(
+        hash="hash",
+        height=0,
+        code=32,
+        gas_wanted=0,
+        gas_used=0,
+        raw_log="account sequence mismatch, expected 7, got 5: incorrect account sequence",
+        logs=[],
+        events={},
+        timestamp=None,
+    )
+    with pytest.raises(AccountSequenceMismatchError) as error:
+        response.ensure_successful()
+    assert error.value.expected_sequence == 7
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test push based transaction confirmation."""
+
+import base64
+import hashlib
+import json
+import socket
+import threading
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from cosmpy.aerial.client import LedgerClient
+from cosmpy.aerial.client.subscriber import (  # pylint: disable=protected-access
+    TxEventSubscriber,
+    _WebSocketConnection,
+)
+from cosmpy.aerial.config import NetworkConfig
+from cosmpy.aerial.exceptions import NotFoundError
+
+
+class MockWebSocketServer:
+    """Local websocket server replaying Tendermint Tx events."""
+
+    def __init__(self, reply=None):
+        """Init the server on a free local port.
+
+        :param reply: reply to the subscription, defaults to a success
+        """
+        self._reply = reply or {"jsonrpc": "2.0", "id": 0, "result": {}}
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(1)
+        self.port = self._server.getsockname()[1]
+        self.subscribed = threading.Event()
+        self.requests: List[dict] = []
+        self._conn = None
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        self._conn, _ = self._server.accept()
+        head = b""
+        while b"\r\n\r\n" not in head:
+            head += self._conn.recv(1024)
+        key = [
+            line.split(":", 1)[1].strip()
+            for line in head.decode().split("\r\n")
+            if line.lower().startswith("sec-websocket-key")
+        ][0]
+        accept = base64.b64encode(
+            hashlib.sha1(  # nosec
+                (key + "258EAFA5-E914-47DA-95CA-C5AB0DC85B11").encode()
+            ).digest()
+        ).decode()
+        self._conn.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+
+        first = self._conn.recv(2)
+        if len(first) < 2 or first[0] & 0x0F != 0x1:
+            # closed without subscribing
+            return
+        length = first[1] & 0x7F
+        mask = self._conn.recv(4)
+        payload = self._conn.recv(length)
+        self.requests.append(
+            json.loads(bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+        )
+        self.send(self._reply)
+        self.subscribed.set()
+
+    def send(self, message: dict):
+        """Send an unmasked text frame.
+
+        :param message: JSON message
+        """
+        payload = json.dumps(message).encode()
+        assert len(payload) < 1 << 16
+        self._conn.sendall(
+            bytes([0x81, 126]) + len(payload).to_bytes(2, "big") + payload
+        )
+
+    def close(self):
+        """Close the server."""
+        if self._conn is not None:
+            self._conn.close()
+        self._server.close()
+
+
+def _tx_event(tx_hash=None, raw_tx=b"tx"):
+    events = {"tx.hash": [tx_hash]} if tx_hash else {}
+    return {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "result": {
+            "query": "tm.event='Tx'",
+            "data": {
+                "type": "tendermint/event/Tx",
+                "value": {"TxResult": {"tx": base64.b64encode(raw_tx).decode()}},
+            },
+            "events": events,
+        },
+    }
+
+
+def test_subscriber_resolves_waiters():
+    """Test committed hashes wake up waiters, including hashes seen before waiting."""
+    server = MockWebSocketServer()
+    with TxEventSubscriber(f"http://127.0.0.1:{server.port}") as subscriber:
+        assert subscriber.connected
+        assert subscriber.url.endswith("/websocket")
+        assert server.subscribed.wait(5)
+        assert server.requests[0]["params"] == {"query": "tm.event='Tx'"}
+
+        result: List[bool] = []
+        waiter = threading.Thread(
+            target=lambda: result.append(subscriber.wait_for_tx("aabb", 5))
+        )
+        waiter.start()
+        server.send(_tx_event("AABB"))
+        waiter.join()
+        assert result == [True]
+
+        # hash derived from the raw transaction when events are not provided
+        server.send(_tx_event(raw_tx=b"raw"))
+        raw_hash = hashlib.sha256(b"raw").hexdigest()
+        assert subscriber.wait_for_tx(raw_hash, 5)
+        assert not subscriber.wait_for_tx("CCDD", 0.01)
+
+        server.close()
+        assert not subscriber.wait_for_tx("CCDD", 5)
+        assert not subscriber.connected
+
+
+def test_wait_for_query_tx_uses_subscription():
+    """Test the ledger client queries the tx once it is committed instead of polling."""
+    server = MockWebSocketServer()
+    subscriber = TxEventSubscriber(f"ws://127.0.0.1:{server.port}/websocket")
+    assert subscriber.start()
+    assert server.subscribed.wait(5)
+
+    client = LedgerClient(
+        NetworkConfig.fetchai_stable_testnet(), tx_subscriber=subscriber
+    )
+    response = MagicMock()
+    with patch.object(
+        client, "query_tx", side_effect=[NotFoundError(), response]
+    ) as query_tx, patch("time.sleep") as sleep:
+        threading.Timer(0.05, server.send, args=(_tx_event("EEFF"),)).start()
+        assert client.wait_for_query_tx("EEFF") is response
+    assert query_tx.call_count == 2
+    sleep.assert_not_called()
+
+    subscriber.stop()
+    server.close()
+
+
+def test_wait_for_query_tx_falls_back_to_polling():
+    """Test polling is used when the websocket is unavailable."""
+    unused = socket.socket()
+    unused.bind(("127.0.0.1", 0))
+    port = unused.getsockname()[1]
+    unused.close()
+
+    subscriber = TxEventSubscriber(f"ws://127.0.0.1:{port}", connect_timeout_secs=1)
+    assert not subscriber.start()
+
+    client = LedgerClient(
+        NetworkConfig.fetchai_stable_testnet(), tx_subscriber=subscriber
+    )
+    response = MagicMock()
+    with patch.object(
+        client, "query_tx", side_effect=[NotFoundError(), response]
+    ), patch("time.sleep") as sleep:
+        assert client.wait_for_query_tx("EEFF") is response
+    sleep.assert_called_once()
+
+
+def test_start_fails_on_broken_handshake_or_subscription():
+    """Test connection errors during the handshake or subscription are not raised."""
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(1)
+    subscriber = TxEventSubscriber(
+        f"ws://127.0.0.1:{silent.getsockname()[1]}", connect_timeout_secs=0.05
+    )
+    assert not subscriber.start()
+    assert not subscriber.connected
+    silent.close()
+
+    server = MockWebSocketServer()
+    subscriber = TxEventSubscriber(f"ws://127.0.0.1:{server.port}")
+    with patch.object(
+        _WebSocketConnection, "send_text", side_effect=BrokenPipeError()
+    ), patch.object(
+        _WebSocketConnection,
+        "close",
+        autospec=True,
+        side_effect=_WebSocketConnection.close,
+    ) as close:
+        assert not subscriber.start()
+    close.assert_called_once()
+    assert not subscriber.connected
+    assert not subscriber.wait_for_tx("AABB", 0.01)
+    server.close()
+
+
+def test_rejected_and_cancelled_subscriptions():
+    """Test an error reply of the node is not taken for an active subscription."""
+    error = {"jsonrpc": "2.0", "id": 0, "error": {"code": -32603, "message": "max"}}
+    server = MockWebSocketServer(reply=error)
+    subscriber = TxEventSubscriber(f"ws://127.0.0.1:{server.port}")
+    assert not subscriber.start()
+    assert not subscriber.connected
+    server.close()
+
+    server = MockWebSocketServer()
+    with TxEventSubscriber(f"ws://127.0.0.1:{server.port}") as subscriber:
+        assert subscriber.connected
+        result: List[bool] = []
+        waiter = threading.Thread(
+            target=lambda: result.append(subscriber.wait_for_tx("AABB", 5))
+        )
+        waiter.start()
+        # the node cancels the subscription of a slow client
+        server.send({**error, "error": {"code": -32000, "message": "unsubscribed"}})
+        waiter.join()
+        assert result == [False]
+        assert not subscriber.connected
+    server.close()
+
+
+def test_wait_for_query_tx_polls_between_events():
+    """Test a missed commit event only delays the query of the tx."""
+    subscriber = MagicMock(connected=True)
+    subscriber.wait_for_tx.return_value = False
+    client = LedgerClient(
+        NetworkConfig.fetchai_stable_testnet(), tx_subscriber=subscriber
+    )
+    response = MagicMock()
+    with patch.object(
+        client, "query_tx", side_effect=[NotFoundError(), NotFoundError(), response]
+    ):
+        assert client.wait_for_query_tx("EEFF", timeout=60, poll_period=1) is response
+    assert [c.args[1] for c in subscriber.wait_for_tx.call_args_list] == [1.0, 1.0]
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test batched transaction confirmation."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cosmpy.aerial.client.tracker import TxConfirmationTracker
+from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
+from cosmpy.aerial.tx_helpers import SubmittedTx
+
+
+class MockLedger:
+    """Ledger committing one block per height query."""
+
+    _query_timeout_secs = 15
+    _query_interval_secs = 2
+
+    def __init__(self, blocks):
+        """Init the mock ledger.
+
+        :param blocks: transaction hashes of the blocks committed after height 10
+        """
+        self.blocks = {10 + i: hashes for i, hashes in enumerate(blocks)}
+        self.height = 10
+        self.query_block_calls = 0
+        self.query_tx_calls = 0
+
+    def query_height(self):
+        """Query the height, committing the next block.
+
+        :return: height
+        """
+        self.height = min(self.height + 1, max(self.blocks))
+        return self.height
+
+    def query_block(self, height):
+        """Query the block.
+
+        :param height: height
+        :return: block
+        """
+        self.query_block_calls += 1
+        return MagicMock(tx_hashes=self.blocks[height])
+
+    def query_tx(self, tx_hash):
+        """Query the tx.
+
+        :param tx_hash: tx hash
+        :return: tx response
+        """
+        self.query_tx_calls += 1
+        return MagicMock(hash=tx_hash)
+
+
+def test_tracker_confirms_from_blocks():
+    """Test pending transactions are matched in bulk against each new block."""
+    hashes = [f"{i:064X}" for i in range(100)]
+    ledger = MockLedger([[], hashes[:60], ["OTHER"], hashes[60:]])
+    tracker = TxConfirmationTracker(ledger)
+    txs = [tracker.add(SubmittedTx(ledger, h.lower())) for h in hashes]
+
+    with patch("time.sleep"):
+        confirmed = tracker.wait_to_complete()
+
+    assert {tx.tx_hash for tx in confirmed} == {tx.tx_hash for tx in txs}
+    assert all(tx.response.hash == tx.tx_hash for tx in txs)
+    assert not tracker.pending
+    assert ledger.query_tx_calls == len(hashes)
+    assert ledger.query_block_calls == 3
+
+
+def test_tracker_timeout():
+    """Test the tracker gives up on transactions which are never committed."""
+    ledger = MockLedger([[], []])
+    tracker = TxConfirmationTracker(ledger, start_height=10)
+    tx = tracker.add(SubmittedTx(ledger, "AA"))
+
+    with patch("time.sleep"), pytest.raises(QueryTimeoutError):
+        tracker.wait_to_complete(timeout=0.01, poll_period=0.01)
+    assert tracker.pending == [tx]
+    assert tx.response is None
+
+
+def test_tracker_waits_for_indexer_and_skips_idle_blocks():
+    """Test a tx not indexed yet stays pending, and idle blocks are not scanned."""
+    ledger = MockLedger([[], ["AA"], [], [], [], ["BB"]])
+    tracker = TxConfirmationTracker(ledger)
+    tx = tracker.add(SubmittedTx(ledger, "aa"))
+    query_tx = ledger.query_tx
+    ledger.query_tx = MagicMock(side_effect=[NotFoundError(), query_tx("AA")])
+
+    assert not tracker.poll()
+    assert tracker.pending == [tx]
+    assert tracker.poll() == [tx]
+    assert ledger.query_block_calls == 2
+
+    # blocks committed while nothing is pending are not scanned
+    ledger.query_tx = query_tx
+    ledger.height = 14
+    tracker.add(SubmittedTx(ledger, "bb"))
+    assert [confirmed.tx_hash for confirmed in tracker.poll()] == ["bb"]
+    assert ledger.query_block_calls == 3
@@ -20,6 +20,7 @@
 # ------------------------------------------------------------------------------
 
 
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee
 from cosmpy.aerial.wallet import LocalWallet
 from cosmpy.common.utils import json_encode
 
@@ -30,3 +31,23 @@ def test_wallet_behaves_like_address_string():
     assert wallet == wallet.address()
 
     assert json_encode(wallet) == json_encode(wallet.address())
+
+
+def test_wallet_caches_identity():
+    """Test the wallet address is computed once and signer infos are not shared."""
+    wallet = LocalWallet.generate(prefix="cosmos")
+    assert wallet.address() is wallet.address()
+    assert str(wallet.address()).startswith("cosmos1")
+
+    fee = TxFee(amount="1atestfet", gas_limit=1)
+    txs = [
+        Transaction()
+        .seal(SigningCfg.direct(wallet.public_key(), sequence), fee)
+        .complete()
+        .tx
+        for sequence in range(2)
+    ]
+    assert [tx.auth_info.signer_infos[0].sequence for tx in txs] == [0, 1]
+    assert txs[0].auth_info.signer_infos[0].public_key == (
+        txs[1].auth_info.signer_infos[0].public_key
+    )
@@ -89,6 +89,13 @@ class BankRestClientTestCase(unittest.TestCase):
             == expected_response
         )
         assert mock_client.last_base_url == "/cosmos/bank/v1beta1/balances/account"
+        assert mock_client.last_headers is None
+
+        bank.AllBalances(
+            QueryAllBalancesRequest(address="account"),
+            metadata=[("x-cosmos-block-height", "10")],
+        )
+        assert mock_client.last_headers == {"x-cosmos-block-height": "10"}
 
     @staticmethod
     def test_query_total_supply():
@@ -30,6 +30,15 @@ from cosmpy.common.rest_client import RestClient
 class QueryRestClientTestCase(TestCase):
     """Test case of REST client module."""
 
+    @staticmethod
+    def test_pool_maxsize():
+        """Test the connection pool is sized for concurrent requests."""
+        client = RestClient("http://localhost:1317", pool_maxsize=64)
+        adapter = client._session.get_adapter(  # pylint: disable=protected-access
+            "http://localhost:1317"
+        )
+        assert adapter._pool_maxsize == 64  # pylint: disable=protected-access
+
     @staticmethod
     @patch("requests.session", spec=Session)
     @patch("cosmpy.common.rest_client.MessageToDict")
@@ -90,3 +90,37 @@ class AddressTestCase(unittest.TestCase):
         json_data = json_encode({"address": address})
         restored_address = Address(json.loads(json_data)["address"])
         assert restored_address == address
+
+    def test_hash_and_equality(self):
+        """Test addresses hash and compare like their string."""
+        address = Address("fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vn")
+        same = Address(bytes(address))
+        other_prefix = Address(address, prefix="fetchvaloper")
+
+        self.assertEqual(address, same)
+        self.assertEqual(hash(address), hash(str(address)))
+        self.assertNotEqual(address, other_prefix)
+        self.assertEqual({address: 1}[str(same)], 1)
+        self.assertEqual(len({address, same, other_prefix}), 2)
+
+    def test_bulk_conversion(self):
+        """Test decoding and converting many addresses at once."""
+        raw = b"U\xc8\xe7\x88\xe2\xeb\xe1\x82\xb9\xc9\xbd\x9a%\x00x9z\x7f\n\xaa"
+        contract = "fetch1mxz8kn3l5ksaftx8a9pj9a6prpzk2uhxnqdkwuqvuh37tw80xu6qges77l"
+        addresses = [
+            "fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vn",
+            Address(raw, prefix="cosmos"),
+            contract,
+        ]
+
+        decoded = Address.decode_many(addresses)
+        self.assertEqual(decoded[:2], [raw, raw])
+        self.assertEqual(len(decoded[2]), 32)
+
+        converted = Address.convert_many(addresses, "osmo")
+        self.assertEqual(converted[0], str(Address(raw, prefix="osmo")))
+        self.assertEqual(converted[0], converted[1])
+        self.assertEqual(Address.convert_many(converted[2:], "fetch"), [contract])
+
+        with self.assertRaises(RuntimeError):
+            Address.decode_many(["fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vm"])
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test verification of many signatures at once."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from cosmpy.aerial.client.bank import create_bank_send_msg
+from cosmpy.aerial.tx import SigningCfg, Transaction, TxFee, tx_signature_items
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.batch_verify import verify_batch
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+KEYS = [PrivateKey(bytes([index + 1]) * 32) for index in range(3)]
+
+
+def _signed_tx(key: PrivateKey, sequence: int) -> bytes:
+    tx = Transaction()
+    tx.add_message(
+        create_bank_send_msg(
+            Address(key.public_key), Address(KEYS[0].public_key), 1, "atestfet"
+        )
+    )
+    tx.seal(
+        SigningCfg.direct(key.public_key, sequence),
+        TxFee(amount="10atestfet", gas_limit=100000),
+    )
+    tx.sign(key, "test-chain", 4)
+    return tx.complete().tx.SerializeToString()
+
+
+def test_verify_batch():
+    """Test valid, corrupted and malformed signatures in one batch."""
+    items = []
+    for index in range(10):
+        key = KEYS[index % len(KEYS)]
+        message = b"message %d" % index
+        items.append((key.public_key.public_key_bytes, message, key.sign(message)))
+
+    corrupted = (items[1][0], b"another message", items[1][2])
+    bad_key = (b"\x02" + bytes(32), items[2][1], items[2][2])
+    items.extend([corrupted, bad_key])
+
+    expected = [True] * 10 + [False, False]
+    assert verify_batch(items) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert verify_batch(items, executor=executor, chunk_size=3) == expected
+
+
+def test_tx_signature_items():
+    """Test the sign docs of serialized transactions are rebuilt."""
+    txs = [_signed_tx(key, sequence) for sequence, key in enumerate(KEYS)]
+
+    items = [item for tx in txs for item in tx_signature_items(tx, "test-chain", [4])]
+    assert [item[0] for item in items] == [k.public_key.public_key_bytes for k in KEYS]
+    assert verify_batch(items) == [True] * len(KEYS)
+
+    wrong_chain = tx_signature_items(txs[0], "other-chain", [4])
+    assert verify_batch(wrong_chain) == [False]
+
+    with pytest.raises(ValueError):
+        tx_signature_items(txs[0], "test-chain", [4, 5])
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test import and export of bcrypt-armored private keys."""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from cosmpy.crypto.bcrypt import (
+    ArmorError,
+    DerivedKeyCache,
+    export_cosmos_bcrypt_armored_privkey,
+    import_cosmos_bcrypt_armored_privkey,
+    import_cosmos_bcrypt_armored_privkeys,
+)
+from cosmpy.crypto.keypairs import PrivateKey
+
+
+# the lowest bcrypt cost keeps the tests fast
+COST = 4
+KEYS = [bytes([index + 1]) * 32 for index in range(4)]
+
+
+def test_export_import_round_trip():
+    """Test exported armors import back, with their cost header."""
+    armor = export_cosmos_bcrypt_armored_privkey(KEYS[0], "passphrase", rounds=COST)
+
+    assert "cost: 4" in armor
+    assert import_cosmos_bcrypt_armored_privkey(armor, "passphrase") == (
+        KEYS[0],
+        "secp256k1",
+    )
+    with pytest.raises(ArmorError):
+        import_cosmos_bcrypt_armored_privkey(armor, "wrong passphrase")
+    with pytest.raises(ArmorError):
+        export_cosmos_bcrypt_armored_privkey(KEYS[0][:31], "passphrase")
+
+
+def test_cost_header_is_bounded():
+    """Test an armor cannot raise the cost of its import above the default."""
+    armor = export_cosmos_bcrypt_armored_privkey(KEYS[0], "passphrase", rounds=COST)
+
+    for cost in ("31", "13", "3", "x"):
+        with pytest.raises(ArmorError):
+            import_cosmos_bcrypt_armored_privkey(
+                armor.replace("cost: 4", f"cost: {cost}"), "passphrase"
+            )
+    # an explicit cost is trusted
+    assert import_cosmos_bcrypt_armored_privkey(
+        armor.replace("cost: 4", "cost: 31"), "passphrase", rounds=COST
+    ) == (KEYS[0], "secp256k1")
+
+
+def test_private_key_round_trip():
+    """Test private keys export to armors loaded by from_bcrypt_key."""
+    key = PrivateKey(KEYS[1])
+    armor = key.to_bcrypt_key("passphrase", rounds=COST)
+
+    restored = PrivateKey.from_bcrypt_key(io.BytesIO(armor.encode()), "passphrase")
+    assert restored.private_key_bytes == key.private_key_bytes
+
+
+def test_bulk_import_with_cache():
+    """Test bulk import over a process pool, then from the derived key cache."""
+    armors = [
+        (
+            export_cosmos_bcrypt_armored_privkey(key, f"pass {index}", COST),
+            f"pass {index}",
+        )
+        for index, key in enumerate(KEYS)
+    ]
+    expected = [(key, "secp256k1") for key in KEYS]
+    cache = DerivedKeyCache(max_entries=3)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert (
+            import_cosmos_bcrypt_armored_privkeys(
+                armors, executor=executor, cache=cache
+            )
+            == expected
+        )
+
+    armor, passphrase = armors[-1]
+    assert cache.get(passphrase, armor.split("salt: ")[1][:32], COST) is not None
+    assert (
+        import_cosmos_bcrypt_armored_privkeys(armors[1:], cache=cache) == expected[1:]
+    )
+
+    with pytest.raises(ArmorError):
+        import_cosmos_bcrypt_armored_privkeys([(armors[0][0], "wrong")], cache=cache)
+    cache.clear()
+    assert cache.get(passphrase, armor.split("salt: ")[1][:32], COST) is None
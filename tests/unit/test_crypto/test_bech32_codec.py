@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the table driven bech32 codec."""
+
+import hashlib
+
+import bech32
+import pytest
+
+from cosmpy.crypto.bech32_codec import decode, encode
+
+
+@pytest.mark.parametrize("length", [0, 1, 20, 32, 33])
+@pytest.mark.parametrize("prefix", ["fetch", "cosmos", "osmovaloper", "a1b"])
+def test_matches_reference_codec(prefix, length):
+    """Test encoding and decoding match the reference implementation."""
+    for index in range(20):
+        data = hashlib.sha256(bytes([index, length])).digest()[:length]
+        expected = bech32.bech32_encode(prefix, bech32.convertbits(data, 8, 5, True))
+
+        assert encode(prefix, data) == expected
+        assert decode(expected) == (prefix, data)
+        assert decode(expected.upper()) == (prefix, data)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vm",  # checksum
+        "fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vb",  # character
+        "Fetch12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vn",  # mixed case
+        "12hyw0z8za0sc9wwfhkdz2qrc89a87z42py23vn",  # empty prefix
+        "fetch1py23v",  # too short
+        "fetch" + "q" * 90,  # too long
+        "fetch1qpvcvqae",  # non zero padding
+        "fetch1pn9p2p3",  # incomplete byte
+    ],
+)
+def test_rejects_invalid(value):
+    """Test invalid strings are rejected like the reference implementation does."""
+    assert bech32.bech32_decode(value)[1] is None or (
+        bech32.convertbits(bech32.bech32_decode(value)[1], 5, 8, False) is None
+    )
+    with pytest.raises(ValueError):
+        decode(value)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Conformance tests of the secp256k1 backends."""
+
+import hashlib
+
+import pytest
+
+from cosmpy.crypto.keypairs import PrivateKey, PublicKey
+from cosmpy.crypto.secp256k1 import (
+    CURVE_ORDER,
+    available_backends,
+    create_backend,
+    get_backend,
+    set_backend,
+)
+
+
+# private key, message, compressed public key, deterministic low-S signature
+VECTORS = [
+    (
+        "0101010101010101010101010101010101010101010101010101010101010101",
+        b"",
+        "031b84c5567b126440995d3ed5aaba0565d71e1834604819ff9c17f5e9d5dd078f",
+        "279d2c263b2a849a0239c46c99c1282a8b7a81f442ead8f9d07dfece015ef6ab"
+        "79465627cd6f150d63e47f372e4a5f8f589289521720a1324efb2615a54634ae",
+    ),
+    (
+        "ab6e6543eef22ee4c57d9ac093e1c4bfc8c637053b10d114ac66adcd3e906c53",
+        b"The name of the wind",
+        "0257bee208dc8028d2d043bee07b0281a6f959190ed18a2a9984d66507998d9668",
+        "3c780969d4f34535d1a09c432d9074415183a03fa45778c0bfab85c6c8a71b3b"
+        "621ba19534bd7192d5e5396708be2ce6ea70de159158509f45169a6c7d7dc332",
+    ),
+    (
+        "fffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364140",
+        b"cosmos",
+        "0379be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798",
+        "5a171a7f4dd6f75f45c4549eb0f083eaefa4fdff1d5835b68d5c0ce9cabb0609"
+        "7399435895d4fd4842cfa943d8d9b9dd8156c6683110e96b280a43fe6a05884a",
+    ),
+]
+
+
+@pytest.fixture(name="backend", params=["ecdsa", "coincurve"])
+def backend_fixture(request):
+    """Use each available backend for the keys created by the test.
+
+    :param request: pytest request
+    :yields: backend name
+    """
+    if request.param not in available_backends():
+        pytest.skip(f"{request.param} is not installed")
+    previous = get_backend()
+    set_backend(request.param)
+    yield request.param
+    set_backend(previous)
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("private_key,message,public_key,signature", VECTORS)
+def test_vectors(private_key, message, public_key, signature):
+    """Test keys and signatures match the reference vectors."""
+    key = PrivateKey(bytes.fromhex(private_key))
+
+    assert key.public_key.public_key_hex == public_key
+    assert key.sign(message, deterministic=True).hex() == signature
+    assert PublicKey(bytes.fromhex(public_key)).verify(
+        message, bytes.fromhex(signature)
+    )
+
+
+@pytest.mark.usefixtures("backend")
+def test_verify_accepts_high_s_and_rejects_invalid():
+    """Test both signature forms are valid, and malformed ones are not."""
+    private_key, message, public_key, signature = VECTORS[1]
+    key = PublicKey(bytes.fromhex(public_key))
+    r = bytes.fromhex(signature)[:32]
+    s = int.from_bytes(bytes.fromhex(signature)[32:], "big")
+    high_s = r + (CURVE_ORDER - s).to_bytes(32, "big")
+
+    assert key.verify(message, high_s)
+    assert not key.verify(message + b"!", bytes.fromhex(signature))
+    assert not key.verify(message, bytes(64))
+    assert not key.verify(message, bytes.fromhex(signature)[:63])
+    assert PrivateKey(bytes.fromhex(private_key)).sign(
+        message, deterministic=True, canonicalise=False
+    ) in (bytes.fromhex(signature), high_s)
+
+
+@pytest.mark.usefixtures("backend")
+def test_random_signatures():
+    """Test random nonce signatures and generated keys verify."""
+    key = PrivateKey()
+    digest = hashlib.sha256(b"random").digest()
+
+    signature = key.sign_digest(digest, deterministic=False)
+
+    assert key.public_key.verify_digest(digest, signature)
+    assert int.from_bytes(signature[32:], "big") <= CURVE_ORDER // 2
+
+
+@pytest.mark.usefixtures("backend")
+def test_public_key_encodings():
+    """Test uncompressed and raw points load as the same key."""
+    key = PrivateKey(bytes.fromhex(VECTORS[0][0]))
+    ecdsa_key = create_backend("ecdsa").load_private_key(key.private_key_bytes)
+    raw = ecdsa_key.get_verifying_key().to_string("raw")
+
+    assert PublicKey(raw).public_key_bytes == key.public_key.public_key_bytes
+    assert PublicKey(b"\x04" + raw).public_key_bytes == key.public_key.public_key_bytes
+
+
+def test_backends_are_identical():
+    """Test the backends produce byte identical signatures."""
+    if len(available_backends()) < 2:
+        pytest.skip("coincurve is not installed")
+    backends = [create_backend(name) for name in available_backends()]
+    for index in range(50):
+        secret = hashlib.sha256(index.to_bytes(4, "big")).digest()
+        digest = hashlib.sha256(secret).digest()
+        signatures = set()
+        for impl in backends:
+            key = impl.load_private_key(secret)
+            signature = impl.sign_digest(key, digest)
+            signatures.add(signature)
+            assert impl.verify_digest(impl.derive_public_key(key), digest, signature)
+        assert len(signatures) == 1
+
+
+def test_unknown_backend():
+    """Test unknown backends are rejected."""
+    with pytest.raises(ValueError):
+        set_backend("openssl")
+    assert get_backend().name in available_backends()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2021 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the vanity address search."""
+
+import pytest
+
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.vanity import difficulty, main, search
+
+
+def test_search_prefix_and_suffix():
+    """Test the keys found match the pattern."""
+    match = search(prefix="q", suffix="z", hrp="cosmos", workers=2)
+
+    assert match is not None
+    assert str(match.address).startswith("cosmos1q")
+    assert str(match.address).endswith("z")
+    assert Address(match.private_key.public_key, "cosmos") == match.address
+    assert match.attempts > 0
+
+
+def test_search_timeout_and_progress():
+    """Test progress is reported until the search times out."""
+    reports = []
+    match = search(
+        prefix="qqqqqqqqqq",
+        workers=1,
+        timeout=1.0,
+        progress=reports.append,
+        progress_interval=0.2,
+        batch_size=64,
+    )
+
+    assert match is None
+    assert reports
+    assert reports[-1].difficulty == difficulty("qqqqqqqqqq") == 32**10
+    assert reports[-1].keys_per_second > 0
+    assert reports[-1].expected_seconds > 0
+
+
+@pytest.mark.parametrize(
+    "prefix,suffix", [("", ""), ("b", ""), ("", "1"), ("q" * 33, "")]
+)
+def test_invalid_pattern(prefix, suffix):
+    """Test invalid patterns are rejected."""
+    with pytest.raises(ValueError):
+        search(prefix=prefix, suffix=suffix)
+
+
+def test_main(capsys):
+    """Test the command line prints the matching key."""
+    main(["--prefix", "x", "--workers", "1"])
+
+    output = capsys.readouterr().out
+    assert "fetch1x" in output
+    assert "Private key:" in output
@@ -19,8 +19,11 @@
 
 """Test case of Mnemonic module."""
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 
-from cosmpy.mnemonic import derive_child_key_from_mnemonic
+from cosmpy.crypto.address import Address
+from cosmpy.crypto.keypairs import PrivateKey
+from cosmpy.mnemonic import HDWallet, derive_child_key_from_mnemonic
 
 
 COSMOS_HD_PATH = "m/44'/118'/0'/0/0"
@@ -103,3 +106,46 @@ class MnemonicTestCase(unittest.TestCase):
                 mnemonic, passphrase, COSMOS_HD_PATH
             )
             assert mnemonic_key == gt_key
+
+
+class HDWalletTestCase(unittest.TestCase):
+    """Test case of the HD wallet."""
+
+    def test_matches_path_derivation(self):
+        """Test keys and addresses match the ones derived from the full path."""
+        wallet = HDWallet(MNEMONICS[0], PASSPHRASES[0])
+        indexes = [0, 1, 7, 123]
+
+        expected = [
+            derive_child_key_from_mnemonic(
+                MNEMONICS[0], PASSPHRASES[0], path=f"m/44'/118'/0'/0/{index}"
+            )
+            for index in indexes
+        ]
+        self.assertEqual(expected[0], GT_KEYS[0])
+        self.assertEqual(wallet.derive_keys(indexes), expected)
+        self.assertEqual(wallet.derive_path(COSMOS_HD_PATH), GT_KEYS[0])
+
+        addresses = [str(Address(PrivateKey(key).public_key)) for key in expected]
+        self.assertEqual([str(a) for a in wallet.derive_addresses(indexes)], addresses)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                [
+                    str(a)
+                    for a in wallet.derive_addresses(
+                        indexes, executor=executor, chunk_size=1
+                    )
+                ],
+                addresses,
+            )
+
+    def test_other_account(self):
+        """Test the account index selects the hardened parent node."""
+        wallet = HDWallet(MNEMONICS[1], account=2)
+        self.assertEqual(
+            wallet.derive_key(5),
+            derive_child_key_from_mnemonic(MNEMONICS[1], path="m/44'/118'/2'/0/5"),
+        )
+        self.assertTrue(
+            str(wallet.derive_addresses([5], prefix="cosmos")[0]).startswith("cosmos1")
+        )